@@ -10,4 +10,6 @@ from .writer import router as writer_router
 from .blogger import router as blogger_router
 from .youtube import router as youtube_router
 from .recording_requests import router as recording_requests_router
-from .cms import router as cms_router
\ No newline at end of file
+from .cms import router as cms_router
+from .media import router as media_router
+from .metrics import router as metrics_router
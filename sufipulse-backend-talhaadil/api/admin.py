@@ -4,6 +4,7 @@ from db.connection import DBConnection
 from sql.combinedQueries import Queries
 from utils.jwt_handler import get_current_user
 from utils.hashing import hash_password
+from utils.instrumentation import route_latency
 from typing import List, Optional
 from datetime import datetime
 
@@ -591,3 +592,43 @@ def get_all_blog_submissions(
     }
 
 
+@router.get("/route-timings")
+def get_route_timings(
+    reset: bool = False,
+    current_user_id: int = Depends(get_current_user)
+):
+    """Rolling p50/p95/p99 wall time and DB time per route for this worker, slowest first"""
+    conn = DBConnection.get_connection()
+    db = Queries(conn)
+    current_user = db.get_user_by_id(current_user_id)
+    conn.close()
+
+    if not current_user or current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can view route timings")
+
+    routes = route_latency.snapshot()
+    if reset:
+        route_latency.reset()
+
+    return {"routes": routes}
+
+
+@router.get("/slow-queries")
+def get_slow_queries(
+    summary: bool = False,
+    caller: Optional[str] = None,
+    limit: int = 50,
+    current_user_id: int = Depends(get_current_user)
+):
+    """Captured slow statements with their EXPLAIN (ANALYZE, BUFFERS) plans, or a per-statement summary"""
+    conn = DBConnection.get_connection()
+    db = Queries(conn)
+    current_user = db.get_user_by_id(current_user_id)
+
+    if not current_user or current_user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Only admin can view slow queries")
+
+    limit = max(1, min(limit, 200))
+    if summary:
+        return {"statements": db.get_slow_query_summary(limit)}
+    return {"plans": db.get_slow_query_plans(limit, caller)}
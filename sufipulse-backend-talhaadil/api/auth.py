@@ -8,6 +8,7 @@ from utils.otp import generate_otp, send_otp_email, get_otp_expiry
 from utils.conv_to_json import user_to_dict
 from utils.google_auth import google_login_or_signup
 from sql.combinedQueries import Queries
+from sql.queries.authQueries import OTP_RESET_PASSWORD
 from db.connection import DBConnection
 from typing import Optional
 
@@ -164,6 +165,7 @@ def verify_otp(data: OTPVerifyRequest):
 
             access_token = create_access_token({
                 "sub": str(user["id"]),
+                "role": role,
                 "info_submitted": info_submitted
             })
             refresh_token = create_refresh_token({
@@ -220,6 +222,7 @@ def login(data: LoginRequest):
 
             access_token = create_access_token({
                 "sub": str(user["id"]),
+                "role": role,
                 "info_submitted": info_submitted
             })
             refresh_token = create_refresh_token({
@@ -306,7 +309,7 @@ def forgot_password(data: ForgotPasswordRequest):
 
             otp = generate_otp()
             otp_expiry = get_otp_expiry()
-            db.resend_otp(data.email, otp, otp_expiry)  # Reuse resend_otp for storing OTP
+            db.resend_otp(data.email, otp, otp_expiry, purpose=OTP_RESET_PASSWORD)
             
             # Send OTP email, but handle errors gracefully
             try:
@@ -344,7 +347,7 @@ def reset_password(data: ResetPasswordRequest):
             if not user:
                 raise HTTPException(status_code=400, detail="User not found")
 
-            verified_user, msg = db.verify_otp_and_register(data.email, data.otp)
+            verified_user, msg = db.verify_otp_and_register(data.email, data.otp, purpose=OTP_RESET_PASSWORD)
             if not verified_user:
                 raise HTTPException(status_code=400, detail=msg)
 
@@ -382,7 +385,7 @@ def refresh_token(data: RefreshTokenRequest):
             if not user:
                 raise HTTPException(status_code=404, detail="User not found")
 
-            new_access_token = create_access_token({"sub": str(user_id)})
+            new_access_token = create_access_token({"sub": str(user_id), "role": user["role"]})
 
             return {
                 "access_token": new_access_token,
@@ -1,16 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from psycopg2.extras import RealDictCursor
 from db import DBConnection  # adjust your import
 from utils.jwt_handler import get_current_user
 from sql.combinedQueries import Queries
+from utils.metrics import upload_bytes_total
 from datetime import datetime
+import logging
 import uuid
 import os
 
 router = APIRouter(prefix="/bloggers", tags=["Bloggers"])
 
+logger = logging.getLogger(__name__)
+
 class SubmitBloggerProfile(BaseModel):
     author_name: Optional[str] = None
     author_image_url: Optional[str] = None
@@ -40,6 +44,26 @@ class BlogApprovalRequest(BaseModel):
     status: str  # 'approved', 'rejected', 'changes_requested', etc.
     admin_comments: Optional[str] = None
 
+class BulkBlogApprovalRequest(BaseModel):
+    blog_ids: List[int] = Field(..., min_length=1, max_length=500)
+    status: str
+    admin_comments: Optional[str] = None
+
+BLOG_STATUS_MESSAGES = {
+    'pending': 'Your blog is now pending review',
+    'review': 'Your blog is under review',
+    'approved': 'Congratulations! Your blog has been approved',
+    'revision': 'Your blog needs some revisions',
+    'rejected': 'Your blog has been rejected',
+    'posted': 'Your blog has been posted!'
+}
+
+def blog_status_notification_message(status: str, title: str, admin_comments: Optional[str]) -> str:
+    message = f"{BLOG_STATUS_MESSAGES.get(status, 'Blog status updated')}: {title}"
+    if admin_comments:
+        message += f" - Admin comment: {admin_comments}"
+    return message
+
 # ---------------- Routes ---------------- #
 
 @router.post("/submit-profile")
@@ -255,20 +279,9 @@ def approve_or_reject_blog(
 
     # Create a notification for the blogger
     try:
-        status_messages = {
-            'pending': 'Your blog is now pending review',
-            'review': 'Your blog is under review',
-            'approved': 'Congratulations! Your blog has been approved',
-            'revision': 'Your blog needs some revisions',
-            'rejected': 'Your blog has been rejected',
-            'posted': 'Your blog has been posted!'
-        }
-        
         notification_title = "Blog Status Update"
-        notification_message = f"{status_messages.get(data.status, 'Blog status updated')}: {blog['title']}"
-        if data.admin_comments:
-            notification_message += f" - Admin comment: {data.admin_comments}"
-        
+        notification_message = blog_status_notification_message(data.status, blog['title'], data.admin_comments)
+
         # Create notification for the blog owner
         db.create_notification(
             title=notification_title,
@@ -283,6 +296,51 @@ def approve_or_reject_blog(
     return {"message": f"Blog submission status updated to {data.status} successfully", "blog_submission": result}
 
 
+@router.post("/blog/bulk-approval")
+def bulk_approve_or_reject_blogs(
+    data: BulkBlogApprovalRequest,
+    current_user_id: int = Depends(get_current_user)
+):
+    """
+    Apply one status to many blog submissions (Admin only).
+    Transitions are validated per row, the update is a single statement and the
+    owners' notifications are inserted in one batch. Returns an outcome for every id.
+    """
+    if data.status not in BLOG_STATUS_MESSAGES:
+        raise HTTPException(status_code=400, detail=f"Invalid status. Allowed: {', '.join(BLOG_STATUS_MESSAGES)}")
+
+    blog_ids = list(dict.fromkeys(data.blog_ids))
+
+    with DBConnection.get_db_connection() as conn:
+        db = Queries(conn)
+
+        user = db.get_user_by_id(current_user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        if user["role"] not in ["admin", "sub-admin"]:
+            raise HTTPException(status_code=403, detail="Only admins can approve/reject blog submissions")
+
+        updated, outcomes = db.bulk_update_blog_submission_status(blog_ids, data.status, data.admin_comments)
+
+        try:
+            db.create_specific_notifications([
+                ("Blog Status Update",
+                 blog_status_notification_message(data.status, row["title"], data.admin_comments),
+                 row["user_id"])
+                for row in updated
+            ])
+        except Exception as e:
+            # Log the error but don't fail the request
+            logger.warning("Failed to create notifications: %s", e)
+
+    return {
+        "message": f"{len(updated)} of {len(blog_ids)} blog submissions updated to {data.status}",
+        "updated": len(updated),
+        "results": outcomes
+    }
+
+
 @router.post("/upload-image")
 async def upload_blog_image(
     file: UploadFile = File(...),
@@ -317,6 +375,7 @@ async def upload_blog_image(
         # Save file
         with open(file_path, "wb") as f:
             f.write(content)
+        upload_bytes_total.labels("blog_image").inc(file_size)
         
         # Return the full URL with backend address
         # This will be http://localhost:8000/uploads/blog-images/{filename}
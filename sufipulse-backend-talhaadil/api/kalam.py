@@ -4,6 +4,7 @@ from typing import Optional, List
 from psycopg2.extras import RealDictCursor
 from db.connection import DBConnection
 from sql.combinedQueries import Queries
+from sql.queries.kalamWorkflowQueries import ADMIN_STATUS_ACTIONS
 from utils.jwt_handler import get_current_user
 
 router = APIRouter(
@@ -76,9 +77,10 @@ def create_kalam(data: CreateKalam, user_id: int = Depends(get_current_user)):
         raise HTTPException(status_code=500, detail="Failed to create kalam")
 
     # Automatically submit the kalam
-    submission = db.submit_kalam(kalam["id"], data.writer_comments)
+    submission = db.apply_kalam_transition(kalam["id"], "submit", user_id, user["role"], data.writer_comments)
     if not submission:
         raise HTTPException(status_code=500, detail="Failed to submit kalam")
+    submission.pop("kalam", None)
 
     return {
         "message": "Kalam created and submitted successfully",
@@ -152,15 +154,13 @@ def assign_vocalist(id: int, data: AssignVocalist, user_id: int = Depends(get_cu
     if not kalam:
         raise HTTPException(status_code=404, detail="Kalam not found")
 
-    submission = db.get_kalam_submission_by_kalam_id(id)
-    if not submission or submission["status"] != "final_approved":
-        raise HTTPException(status_code=400, detail="Kalam must be in final_approved status to assign vocalist")
-
     vocalist = db.get_vocalist_by_user_id(data.vocalist_id)
     if not vocalist:
         raise HTTPException(status_code=404, detail="Vocalist not found")
 
-    kalam, submission = db.assign_vocalist(id, data.vocalist_id)
+    # Requires final_approved; checked under the workflow row lock
+    submission = db.apply_kalam_transition(id, "assign_vocalist", user_id, user["role"], vocalist_id=data.vocalist_id)
+    kalam = submission.pop("kalam", None) if submission else None
     if not kalam or not submission:
         raise HTTPException(status_code=500, detail="Failed to assign vocalist")
 
@@ -184,11 +184,9 @@ def update_youtube_link(id: int, data: UpdateYouTubeLink, user_id: int = Depends
     if not kalam:
         raise HTTPException(status_code=404, detail="Kalam not found")
 
-    submission = db.get_kalam_submission_by_kalam_id(id)
-    if not submission or submission["status"] != "complete_approved":
-        raise HTTPException(status_code=400, detail="Kalam must be in complete_approved status to add YouTube link")
-
-    kalam, submission = db.update_youtube_link(id, data.youtube_link)
+    # Requires complete_approved; checked under the workflow row lock
+    submission = db.apply_kalam_transition(id, "publish", user_id, user["role"], youtube_link=data.youtube_link)
+    kalam = submission.pop("kalam", None) if submission else None
     if not kalam or not submission:
         raise HTTPException(status_code=500, detail="Failed to update YouTube link")
 
@@ -198,6 +196,24 @@ def update_youtube_link(id: int, data: UpdateYouTubeLink, user_id: int = Depends
         "submission": submission
     }
 
+@router.get("/{id}/workflow-log")
+def get_kalam_workflow_log(id: int, user_id: int = Depends(get_current_user)):
+    conn = DBConnection.get_connection()
+    db = Queries(conn)
+
+    user = db.get_user_by_id(user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    kalam = db.get_kalam_by_id(id)
+    if not kalam:
+        raise HTTPException(status_code=404, detail="Kalam not found")
+
+    if user["role"] not in ["admin", "sub-admin"] and kalam["writer_id"] != int(user_id):
+        raise HTTPException(status_code=403, detail="Not authorized to view this kalam's history")
+
+    return {"kalam_id": id, "transitions": db.get_kalam_workflow_log(id)}
+
 @router.get("/{id}/submissions/{sub_id}")
 def get_kalam_submission(id: int, sub_id: int, user_id: int = Depends(get_current_user)):
     conn = DBConnection.get_connection()
@@ -262,9 +278,14 @@ def update_submission_status(id: int, sub_id: int, data: UpdateSubmissionStatus,
     if data.new_status not in valid_statuses:
         raise HTTPException(status_code=400, detail=f"Invalid status. Must be one of: {valid_statuses}")
 
-    updated_submission = db.update_submission_status(sub_id, data.new_status, data.comments)
+    action = ADMIN_STATUS_ACTIONS.get(data.new_status)
+    if not action:
+        raise HTTPException(status_code=400, detail=f"Status {data.new_status} is set by its own workflow step")
+
+    updated_submission = db.apply_kalam_transition(id, action, user_id, user["role"], data.comments)
     if not updated_submission:
         raise HTTPException(status_code=500, detail="Failed to update submission status")
+    updated_submission.pop("kalam", None)
 
     return {"message": "Submission status updated successfully", "submission": updated_submission}
 
@@ -291,14 +312,12 @@ def writer_response(id: int, sub_id: int, data: WriterResponse, user_id: int = D
     if data.user_approval_status not in ["approved", "rejected"]:
         raise HTTPException(status_code=400, detail="Invalid user approval status")
 
-    updated_submission = db.writer_response(sub_id, data.user_approval_status, data.writer_comments)
+    # Approval finalizes the submission, rejection sends it back for review
+    action = "writer_approve" if data.user_approval_status == "approved" else "writer_reject"
+    updated_submission = db.apply_kalam_transition(id, action, user_id, user["role"], data.writer_comments)
     if not updated_submission:
         raise HTTPException(status_code=500, detail="Failed to process writer response")
-
-    if data.user_approval_status == "approved":
-        updated_submission = db.update_submission_status(sub_id, "final_approved", submission["admin_comments"])
-        if not updated_submission:
-            raise HTTPException(status_code=500, detail="Failed to finalize submission")
+    updated_submission.pop("kalam", None)
 
     return {"message": "Writer response processed successfully", "submission": updated_submission}
 
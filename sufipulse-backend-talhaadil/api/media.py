@@ -0,0 +1,73 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+from utils.media import (
+    RangeFileResponse,
+    get_media_file_info,
+    parse_range_header,
+    IMMUTABLE_CACHE_CONTROL,
+    DEFAULT_CACHE_CONTROL,
+)
+import os
+
+# Registered ahead of the /uploads StaticFiles mount in main.py, so the URLs
+# already stored in reference_upload_url / sample_upload_url are served here.
+router = APIRouter(prefix="/uploads", tags=["Media"])
+
+RECORDING_UPLOAD_ROOT = os.path.join("uploads", "recording_requests")
+RECORDING_REQUEST_TYPES = ("studio", "remote")
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in candidates
+
+
+@router.api_route("/recording_requests/{request_type}/{filename}", methods=["GET", "HEAD"])
+async def serve_recording_reference(request_type: str, filename: str, request: Request):
+    """
+    Serve recording reference audio with byte-range support.
+    Content-addressed upload names are cached as immutable; ETag/Content-Length come
+    from precomputed metadata so repeated scrubbing only costs one stat() per hit.
+    """
+    if request_type not in RECORDING_REQUEST_TYPES:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    if filename != os.path.basename(filename) or filename.startswith("."):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    info = get_media_file_info(os.path.join(RECORDING_UPLOAD_ROOT, request_type, filename))
+    if not info:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    headers = {
+        "accept-ranges": "bytes",
+        "etag": info.etag,
+        "cache-control": IMMUTABLE_CACHE_CONTROL if info.immutable else DEFAULT_CACHE_CONTROL,
+    }
+
+    if _etag_matches(request.headers.get("if-none-match"), info.etag):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    # If-Range with a stale validator means the client must get the full file
+    if_range = request.headers.get("if-range")
+    if if_range and if_range.strip() != info.etag:
+        range_header = None
+
+    try:
+        byte_range = parse_range_header(range_header, info.size)
+    except ValueError:
+        headers["content-range"] = f"bytes */{info.size}"
+        return Response(status_code=416, headers=headers)
+
+    send_body = request.method != "HEAD"
+    if byte_range:
+        start, end = byte_range
+        headers["content-range"] = f"bytes {start}-{end}/{info.size}"
+        return RangeFileResponse(info, status_code=206, byte_range=byte_range, headers=headers, send_body=send_body)
+
+    return RangeFileResponse(info, status_code=200, headers=headers, send_body=send_body)
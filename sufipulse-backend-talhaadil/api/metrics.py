@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import Response
+from typing import Optional
+from utils.metrics import render_metrics
+import os
+
+router = APIRouter(tags=["Metrics"])
+
+# Optional shared secret for the scraper (Authorization: Bearer <token>)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics(authorization: Optional[str] = Header(None)):
+    """Prometheus text exposition, aggregated over all workers when PROMETHEUS_MULTIPROC_DIR is set"""
+    if METRICS_TOKEN and authorization != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
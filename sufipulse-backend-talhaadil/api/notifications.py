@@ -1,9 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import base64
+from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Optional
 from db.connection import DBConnection
 from sql.combinedQueries import Queries
-from utils.jwt_handler import get_current_user
+from utils.jwt_handler import get_current_user, get_current_user_with_role
+from utils.notification_stream import (
+    HEARTBEAT_SECONDS, RESYNC, DeliveredWindow, broker, format_sse, notification_event
+)
 
 router = APIRouter(
     prefix="/notifications",
@@ -39,13 +47,35 @@ def create_notification(
     notification = db.create_notification(data.title, data.message, data.target_type, data.target_user_ids)
     return notification
 
+def encode_notification_cursor(row) -> str:
+    raw = f"{row[5].isoformat()}|{row[0]}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_notification_cursor(cursor: str) -> tuple:
+    try:
+        created_at, notification_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(notification_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 @router.get("/user/")
 def get_user_notifications(
-    current_user_id: int = Depends(get_current_user)
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: tuple = Depends(get_current_user_with_role)
 ):
-    conn = DBConnection.get_connection()
-    db = Queries(conn)
-    raw_notifications = db.get_user_notifications(current_user_id)
+    """
+    The user's notifications, newest first, with keyset pagination.
+    Pass next_cursor from the previous response to fetch the following page.
+    """
+    current_user_id, role = current_user
+    keyset = decode_notification_cursor(cursor) if cursor else None
+    with DBConnection.get_db_connection() as conn:
+        db = Queries(conn)
+        raw_notifications = db.get_user_notifications(current_user_id, role=role, cursor=keyset, limit=limit + 1)
+
+    has_more = len(raw_notifications) > limit
+    raw_notifications = raw_notifications[:limit]
 
     notifications = []
     for notif in raw_notifications:
@@ -59,17 +89,132 @@ def get_user_notifications(
             "read": notif[6]
         })
 
-    return {"notifications": notifications}
+    return {
+        "notifications": notifications,
+        "has_more": has_more,
+        "next_cursor": encode_notification_cursor(raw_notifications[-1]) if has_more else None
+    }
+
+@router.get("/unread-count")
+def get_unread_notification_count(
+    current_user: tuple = Depends(get_current_user_with_role)
+):
+    current_user_id, role = current_user
+    with DBConnection.get_db_connection() as conn:
+        db = Queries(conn)
+        unread = db.get_unread_notification_count(current_user_id, role=role)
+
+    return {"unread_count": unread}
+
+def load_stream_start(user_id, role, after_id):
+    """(audience, id to resume after) for a new stream"""
+    with DBConnection.get_db_connection() as conn:
+        db = Queries(conn)
+        audience = db.get_notification_audience(user_id, role)
+        if after_id is None:
+            after_id = db.get_latest_notification_id()
+    return audience, after_id
+
+def load_missed_notifications(user_id, audience, after_id) -> list:
+    with DBConnection.get_db_connection() as conn:
+        db = Queries(conn)
+        missed = []
+        while True:
+            page = db.get_user_notifications_after(user_id, audience, after_id, limit=100)
+            missed.extend(notification_event(row) for row in page)
+            if len(page) < 100:
+                return missed
+            after_id = page[-1]["id"]
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    after: Optional[int] = Query(None, description="Resume after this notification id"),
+    last_event_id: Optional[int] = Header(None),
+    current_user: tuple = Depends(get_current_user_with_role)
+):
+    """
+    Server-Sent Events push of new notifications, so clients stop polling /user/.
+    Reconnecting with Last-Event-ID (sent automatically by EventSource) or
+    ?after= replays what was missed; the SSE id is the newest notification id
+    delivered, and notifications that commit out of id order are still sent
+    once. A comment line is sent every HEARTBEAT_SECONDS while idle. A client
+    that falls behind is caught up from the database instead of being buffered
+    without bound.
+    """
+    current_user_id, role = current_user
+    user_id = int(current_user_id)
+    resume_after = last_event_id if last_event_id is not None else after
+    audience, last_id = await run_in_threadpool(load_stream_start, user_id, role, resume_after)
+    if audience is None:
+        raise HTTPException(status_code=403, detail="This account does not receive notifications")
+
+    async def events():
+        delivered = DeliveredWindow(last_id)
+        # Subscribe, then replay from the id read before subscribing: whatever
+        # was published in between comes from the database, later events live
+        subscriber = broker.subscribe(user_id, audience)
+        try:
+            pending = await run_in_threadpool(load_missed_notifications, user_id, audience, delivered.replay_after())
+            while True:
+                for notification in pending:
+                    if delivered.add(notification["id"]):
+                        yield format_sse(notification, event_id=delivered.last_id)
+                pending = []
+
+                if await request.is_disconnected():
+                    break
+                if subscriber.lagging:
+                    while not subscriber.queue.empty():
+                        subscriber.queue.get_nowait()
+                    subscriber.lagging = False
+                    pending = await run_in_threadpool(
+                        load_missed_notifications, user_id, audience, delivered.replay_after())
+                    continue
+
+                try:
+                    item = await asyncio.wait_for(subscriber.queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+
+                if item is RESYNC:
+                    pending = await run_in_threadpool(
+                        load_missed_notifications, user_id, audience, delivered.replay_after())
+                else:
+                    pending = [item]
+        finally:
+            broker.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/read-all")
+def mark_all_notifications_as_read(
+    current_user: tuple = Depends(get_current_user_with_role)
+):
+    """Marks every current notification read in one statement by moving the user's read mark"""
+    current_user_id, role = current_user
+    with DBConnection.get_db_connection() as conn:
+        db = Queries(conn)
+        mark = db.mark_all_as_read(current_user_id, role=role)
+    if mark is None:
+        raise HTTPException(status_code=403, detail="This account does not receive notifications")
+
+    return {"message": "All notifications marked as read", "last_read_notification_id": mark}
 
 @router.post("/{notification_id}/read/{user_id}")
 def mark_notification_as_read(
     notification_id: int,
-    current_user_id: int = Depends(get_current_user)
+    current_user: tuple = Depends(get_current_user_with_role)
 ):
-  
-    conn = DBConnection.get_connection()
-    db = Queries(conn)
-    read_entry = db.mark_as_read(notification_id, current_user_id)
+    current_user_id, role = current_user
+    with DBConnection.get_db_connection() as conn:
+        db = Queries(conn)
+        read_entry = db.mark_as_read(notification_id, current_user_id, role=role)
     if not read_entry:
         raise HTTPException(status_code=404, detail="Notification already marked as read or not found")
     
@@ -1,3 +1,4 @@
+import logging
 from fastapi import APIRouter, HTTPException, Query, Request, Depends, Header
 from pydantic import BaseModel
 from typing import List, Optional
@@ -6,9 +7,12 @@ from datetime import datetime
 from sql.combinedQueries import Queries
 from utils.otp import send_template_email
 from utils.jwt_handler import get_current_user_optional
+from utils.engagement_filter import check_engagement, client_ip
 
 router = APIRouter(prefix="/public", tags=["Public"])
 
+logger = logging.getLogger(__name__)
+
 class PartnershipProposalCreate(BaseModel):
     full_name: str
     email: str
@@ -177,19 +181,47 @@ def get_approved_blogs(
     skip: int = Query(0, ge=0),
     limit: int = Query(6, ge=1),
     category: Optional[str] = None,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    sort: str = Query("latest", description="latest, trending or popular")
 ):
+    if sort not in ("latest", "trending", "popular"):
+        raise HTTPException(status_code=400, detail="Invalid sort. Allowed: latest, trending, popular")
+
     conn = DBConnection.get_connection()
     db = Queries(conn)
 
     try:
         # Fetch only approved and posted blogs
-        blogs = db.fetch_approved_blogs(skip, limit, category, search)
+        blogs = db.fetch_approved_blogs(skip, limit, category, search, sort=sort)
         return blogs
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# Most blog ids one /blogs/engagement request may ask for (one list page of cards)
+MAX_ENGAGEMENT_BATCH = 100
+
+
+@router.get("/blogs/engagement")
+def get_blogs_engagement_stats(ids: str = Query(..., description="Comma-separated blog ids")):
+    """Engagement counters for several blog posts at once; unknown or unpublished ids are left out"""
+    try:
+        blog_ids = [int(part) for part in ids.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    if not blog_ids:
+        raise HTTPException(status_code=400, detail="ids is required")
+    if len(blog_ids) > MAX_ENGAGEMENT_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_ENGAGEMENT_BATCH} ids per request")
+
+    try:
+        with DBConnection.get_db_connection() as conn:
+            return {"blogs": Queries(conn).get_blog_engagement_counts(blog_ids)}
+    except Exception as e:
+        logger.exception("Error fetching engagement stats")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/blogs/{blog_id}")
 def get_blog_by_id(blog_id: int):
     conn = DBConnection.get_connection()
@@ -286,11 +318,8 @@ class BlogShareRequest(BaseModel):
 
 
 def get_client_ip(request: Request) -> str:
-    """Extract client IP address from request headers"""
-    forwarded = request.headers.get("X-Forwarded-For")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
-    return request.client.host if request.client else "unknown"
+    """Client IP address; X-Forwarded-For is only honoured through TRUSTED_PROXY_CIDRS"""
+    return client_ip(request)
 
 
 @router.post("/blogs/{blog_id}/view")
@@ -307,21 +336,24 @@ def record_blog_view(
     db = Queries(conn)
 
     try:
-        print(f"\n=== VIEW REQUEST ===")
-        print(f"Blog ID: {blog_id}")
-        print(f"User ID: {user_id}")
-        
         # Check if blog exists
         blog = db.fetch_blog_by_id(blog_id)
         if not blog:
             raise HTTPException(status_code=404, detail="Blog post not found")
 
+        # Crawlers and clients over their rate never reach the view tables
+        verdict = check_engagement(request, "view")
+        if not verdict.accepted:
+            return {
+                "message": "View not counted",
+                "is_unique_view": False,
+                "views": blog.get('view_count', 0)
+            }
+
         # Get client IP for unique view tracking
-        ip_address = get_client_ip(request)
+        ip_address = verdict.ip
         user_agent = request.headers.get("user-agent", "")
-        
-        print(f"IP Address: {ip_address}")
-        print(f"Current view count: {blog.get('view_count', 0)}")
+
 
         # Record the view (returns True if unique view was counted)
         is_unique = db.record_blog_view(
@@ -330,13 +362,10 @@ def record_blog_view(
             ip_address=ip_address,
             user_agent=user_agent
         )
-        
-        print(f"Is unique view: {is_unique}")
+        logger.debug("Blog %s view by user %s / %s: unique=%s", blog_id, user_id, ip_address, is_unique)
 
         # Get updated blog data with new view count
         updated_blog = db.fetch_blog_by_id(blog_id)
-        print(f"New view count: {updated_blog.get('view_count', 0)}")
-        print(f"====================\n")
 
         return {
             "message": "View recorded",
@@ -346,7 +375,7 @@ def record_blog_view(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error recording blog view: {str(e)}")
+        logger.exception("Error recording blog view")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -434,13 +463,6 @@ def add_blog_comment(
     db = Queries(conn)
 
     try:
-        print(f"\n=== COMMENT REQUEST ===")
-        print(f"Blog ID: {blog_id}")
-        print(f"User ID from token: {user_id}")
-        print(f"Request headers: {dict(request.headers)}")
-        print(f"Comment data: {data}")
-        print(f"======================\n")
-
         # Validate input
         if not data.comment_text or not data.comment_text.strip():
             raise HTTPException(status_code=400, detail="Comment text is required")
@@ -459,20 +481,16 @@ def add_blog_comment(
 
         if user_id:
             # User is authenticated - ALWAYS fetch their info from database
-            print(f"Fetching user info for user_id: {user_id}")
             user_query = "SELECT name, email FROM users WHERE id = %s"
             with conn.cursor() as cur:
                 cur.execute(user_query, (user_id,))
                 user_result = cur.fetchone()
-                print(f"User query result: {user_result}")
                 if user_result:
                     commenter_name = user_result[0]
                     commenter_email = user_result[1]
-                    print(f"User found: {commenter_name} ({commenter_email})")
                 else:
                     raise HTTPException(status_code=404, detail="User not found")
         else:
-            print("No user_id found - treating as guest user")
             # User is not authenticated - require name and email
             if not data.commenter_name or not data.commenter_email:
                 raise HTTPException(
@@ -494,7 +512,6 @@ def add_blog_comment(
                     raise HTTPException(status_code=404, detail="Parent comment not found")
 
         # Add the comment
-        print(f"Adding comment with: user_id={user_id}, name={commenter_name}, email={commenter_email}")
         comment_id = db.add_blog_comment(
             blog_id=blog_id,
             comment_text=data.comment_text,
@@ -519,9 +536,7 @@ def add_blog_comment(
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error adding blog comment: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error adding blog comment")
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -590,8 +605,15 @@ def record_blog_share(
                 detail=f"Invalid platform. Allowed: {', '.join(allowed_platforms)}"
             )
 
+        verdict = check_engagement(request, "share")
+        if not verdict.accepted:
+            return {
+                "message": "Share not counted",
+                "platform": data.platform.lower()
+            }
+
         # Get client IP
-        ip_address = get_client_ip(request)
+        ip_address = verdict.ip
 
         # Record the share
         success = db.record_blog_share(
@@ -617,30 +639,14 @@ def record_blog_share(
 
 @router.get("/blogs/{blog_id}/engagement")
 def get_blog_engagement_stats(blog_id: int):
-    """Get comprehensive engagement statistics for a blog post"""
-    conn = DBConnection.get_connection()
-    db = Queries(conn)
-
+    """Get comprehensive engagement statistics for a blog post, from its cached counters"""
     try:
-        # Check if blog exists
-        blog = db.fetch_blog_by_id(blog_id)
-        if not blog:
-            raise HTTPException(status_code=404, detail="Blog post not found")
-
-        # Get engagement stats
-        stats = db.get_blog_engagement_stats(blog_id)
-        share_stats = db.get_blog_share_stats(blog_id)
-
-        return {
-            "blog_id": blog_id,
-            "views": stats.get('total_views', 0) if stats else 0,
-            "likes": stats.get('total_likes', 0) if stats else 0,
-            "comments": stats.get('total_comments', 0) if stats else 0,
-            "shares": stats.get('total_shares', 0) if stats else 0,
-            "share_breakdown": share_stats or {}
-        }
-    except HTTPException:
-        raise
+        with DBConnection.get_db_connection() as conn:
+            stats = Queries(conn).get_blog_engagement_counts([blog_id])
     except Exception as e:
-        print(f"Error fetching engagement stats: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        logger.exception("Error fetching engagement stats")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if not stats:
+        raise HTTPException(status_code=404, detail="Blog post not found")
+    return stats[0]
\ No newline at end of file
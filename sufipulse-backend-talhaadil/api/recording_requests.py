@@ -1,11 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, BackgroundTasks, Query
 from pydantic import BaseModel, Field
 from typing import Optional, List
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from db.connection import DBConnection
 from sql.combinedQueries import Queries
 from utils.jwt_handler import get_current_user
 from psycopg2.extras import RealDictCursor
+from utils.media import prime_media_file_info
+from utils.audio_analysis import analyze_audio_file, get_analysis_executor, waveform_to_list
+from utils.availability import TIME_BLOCKS, build_availability_calendar
+from sql.queries.recordingRequestQueries import ADMIN_QUEUE_SOURCES, QUEUE_STATUSES, RECORDING_REQUEST_TABLES
+from utils.otp import build_recording_request_status_email, queue_email_batch
+from utils.metrics import upload_bytes_total
+import asyncio
+import logging
+import base64
 import os
 import uuid
 
@@ -15,6 +24,8 @@ router = APIRouter(
     dependencies=[Depends(get_current_user)]
 )
 
+logger = logging.getLogger(__name__)
+
 # ========================================
 # PYDANTIC MODELS
 # ========================================
@@ -215,10 +226,50 @@ async def upload_reference_file(file: UploadFile, kalam_id: int, request_type: s
     # Save file
     with open(file_path, "wb") as f:
         f.write(content)
+    upload_bytes_total.labels(f"recording_{request_type}").inc(file_size)
+
+    # Precompute Content-Length/ETag for the media route
+    prime_media_file_info(file_path)
     
     # Return URL (in production, this would be a CDN URL)
     return f"/{file_path}"
 
+async def run_audio_analysis(request_type: str, request_id: int, upload_url: str):
+    """Analyze an uploaded reference file in the process pool and store the preview metadata"""
+    try:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(get_analysis_executor(), analyze_audio_file, upload_url.lstrip("/"))
+    except Exception as e:
+        logger.warning("Audio analysis failed for %s request %s: %s", request_type, request_id, e)
+        return
+
+    try:
+        with DBConnection.get_db_connection() as conn:
+            Queries(conn).save_audio_analysis(
+                request_type,
+                request_id,
+                upload_url,
+                result["duration_seconds"],
+                result["sample_rate"],
+                result["waveform"]
+            )
+    except Exception as e:
+        logger.warning("Failed to store audio analysis for %s request %s: %s", request_type, request_id, e)
+
+def attach_audio_preview(request: dict) -> dict:
+    """Replace the raw analysis columns with a JSON-friendly audio_preview object"""
+    waveform = request.pop('audio_waveform', None)
+    duration = request.pop('audio_duration_seconds', None)
+    sample_rate = request.pop('audio_sample_rate', None)
+    analyzed_at = request.pop('audio_analyzed_at', None)
+    request['audio_preview'] = {
+        'duration_seconds': duration,
+        'sample_rate': sample_rate,
+        'peaks': waveform_to_list(waveform),
+        'analyzed_at': analyzed_at
+    } if analyzed_at else None
+    return request
+
 # ========================================
 # API ENDPOINTS
 # ========================================
@@ -345,6 +396,9 @@ def create_studio_recording_request(
     submitter_name = user.get('name', '')
     submitter_email = user.get('email', '')
 
+    if request.preferred_time_block not in TIME_BLOCKS:
+        raise HTTPException(status_code=400, detail="Preferred time block must be Morning, Afternoon, or Evening.")
+
     # Validate date (cannot be in the past)
     if request.preferred_session_date < date.today():
         raise HTTPException(
@@ -390,7 +444,17 @@ def create_studio_recording_request(
         ))
 
         result = cur.fetchone()
-        conn.commit()
+
+    # Reserve the studio slot in the same transaction; raises if it is already taken
+    db.reserve_session_slot(
+        'studio',
+        'studio_recording',
+        result['id'],
+        request.preferred_session_date,
+        request.preferred_time_block,
+        request.estimated_studio_duration
+    )
+    conn.commit()
 
     return StudioRecordingRequestResponse(
         id=result['id'],
@@ -532,6 +596,34 @@ def create_remote_recording_request(
         updated_at=result['updated_at']
     )
 
+MAX_AVAILABILITY_DAYS = 92
+
+@router.get("/availability")
+def get_session_availability(
+    from_date: date = Query(..., alias="from"),
+    to_date: date = Query(..., alias="to"),
+    user_id: int = Depends(get_current_user)
+):
+    """
+    Free studio capacity per day and time block between `from` and `to` (inclusive).
+    Answered from a single range query over studio_slot_bookings.
+    """
+    if to_date < from_date:
+        raise HTTPException(status_code=400, detail="'to' must be on or after 'from'")
+    if to_date - from_date > timedelta(days=MAX_AVAILABILITY_DAYS):
+        raise HTTPException(status_code=400, detail=f"Range cannot exceed {MAX_AVAILABILITY_DAYS} days")
+
+    with DBConnection.get_db_connection() as conn:
+        db = Queries(conn)
+        resources = db.get_recording_resources()
+        bookings = db.get_slot_bookings_in_range(from_date, to_date)
+
+    return {
+        "from": from_date,
+        "to": to_date,
+        "days": build_availability_calendar(from_date, to_date, resources, bookings)
+    }
+
 @router.get("/studio/my-requests")
 def get_my_studio_requests(user_id: int = Depends(get_current_user)):
     """Get all studio recording requests for the current vocalist"""
@@ -559,7 +651,7 @@ def get_my_studio_requests(user_id: int = Depends(get_current_user)):
         cur.execute(query, (vocalist['id'],))
         requests = cur.fetchall()
 
-    return {"requests": requests}
+    return {"requests": [attach_audio_preview(r) for r in requests]}
 
 @router.get("/remote/my-requests")
 def get_my_remote_requests(user_id: int = Depends(get_current_user)):
@@ -588,7 +680,66 @@ def get_my_remote_requests(user_id: int = Depends(get_current_user)):
         cur.execute(query, (vocalist['id'],))
         requests = cur.fetchall()
 
-    return {"requests": requests}
+    return {"requests": [attach_audio_preview(r) for r in requests]}
+
+async def _upload_request_audio(
+    request_type: str,
+    request_id: int,
+    file: UploadFile,
+    user_id: int,
+    background_tasks: BackgroundTasks
+) -> dict:
+    conn = DBConnection.get_connection()
+    db = Queries(conn)
+
+    vocalist = db.get_vocalist_by_user_id(user_id)
+    if not vocalist:
+        raise HTTPException(status_code=403, detail="Only vocalists can upload reference files")
+
+    table = "studio_recording_requests" if request_type == "studio" else "remote_recording_requests_new"
+    with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        cur.execute(f"SELECT kalam_id FROM {table} WHERE id = %s AND vocalist_id = %s", (request_id, vocalist['id']))
+        request = cur.fetchone()
+
+    if not request:
+        raise HTTPException(status_code=404, detail="Request not found")
+
+    upload_url = await upload_reference_file(file, request['kalam_id'], request_type)
+    result = db.save_recording_upload(
+        request_type,
+        request_id,
+        vocalist['id'],
+        upload_url,
+        file.content_type,
+        os.path.getsize(upload_url.lstrip("/"))
+    )
+
+    # Duration/waveform extraction runs after the response is sent
+    background_tasks.add_task(run_audio_analysis, request_type, request_id, upload_url)
+
+    return attach_audio_preview(result)
+
+@router.post("/studio/{request_id}/reference")
+async def upload_studio_reference(
+    request_id: int,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    user_id: int = Depends(get_current_user)
+):
+    """Upload the reference audio for a studio recording request (MP3/WAV, max 10MB)"""
+    request = await _upload_request_audio("studio", request_id, file, user_id, background_tasks)
+    return {"message": "Reference file uploaded", "request": request}
+
+@router.post("/remote/{request_id}/sample")
+async def upload_remote_sample(
+    request_id: int,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    user_id: int = Depends(get_current_user)
+):
+    """Upload the sample audio for a remote recording request (MP3/WAV, max 10MB)"""
+    request = await _upload_request_audio("remote", request_id, file, user_id, background_tasks)
+    return {"message": "Sample file uploaded", "request": request}
 
 @router.get("/check-exists/{kalam_id}")
 def check_request_exists(kalam_id: int, user_id: int = Depends(get_current_user)):
@@ -633,6 +784,13 @@ class AdminUpdateRequestStatus(BaseModel):
     status: str  # 'approved', 'rejected', 'completed'
     admin_comments: Optional[str] = None
 
+class AdminBulkUpdateRequestStatus(BaseModel):
+    """Model for admin to move many requests to one status"""
+    request_type: str  # 'studio' or 'remote'
+    request_ids: List[int] = Field(..., min_length=1, max_length=500)
+    status: str  # 'pending', 'approved', 'rejected', 'completed'
+    admin_comments: Optional[str] = None
+
 @router.get("/admin/studio-requests")
 def get_all_studio_requests(user_id: int = Depends(get_current_user)):
     """Get all studio recording requests (Admin only)"""
@@ -655,7 +813,7 @@ def get_all_studio_requests(user_id: int = Depends(get_current_user)):
         cur.execute(query)
         requests = cur.fetchall()
     
-    return {"requests": requests}
+    return {"requests": [attach_audio_preview(r) for r in requests]}
 
 @router.get("/admin/remote-requests")
 def get_all_remote_requests(user_id: int = Depends(get_current_user)):
@@ -679,7 +837,142 @@ def get_all_remote_requests(user_id: int = Depends(get_current_user)):
         cur.execute(query)
         requests = cur.fetchall()
     
-    return {"requests": requests}
+    return {"requests": [attach_audio_preview(r) for r in requests]}
+
+def encode_queue_cursor(row: dict) -> str:
+    raw = f"{row['created_at'].isoformat()}|{row['source_rank']}|{row['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_queue_cursor(cursor: str) -> tuple:
+    try:
+        created_at, rank, request_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(rank), int(request_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@router.get("/admin/queue")
+def get_admin_request_queue(
+    status: Optional[str] = None,
+    request_type: Optional[List[str]] = Query(None),
+    vocalist_id: Optional[int] = Query(None, description="Vocalist user id"),
+    kalam_id: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(25, ge=1, le=100),
+    user_id: int = Depends(get_current_user)
+):
+    """
+    Unified admin queue over studio/remote recording requests, studio visits and
+    remote sessions, newest first, with keyset pagination and per-status counts.
+    Pass next_cursor from the previous response to fetch the following page.
+    """
+    with DBConnection.get_db_connection() as conn:
+        db = Queries(conn)
+
+        user = db.get_user_by_id(user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        if user['role'] not in ['admin', 'sub-admin']:
+            raise HTTPException(status_code=403, detail="Only admins can access this endpoint")
+
+        if status and status not in QUEUE_STATUSES:
+            raise HTTPException(status_code=400, detail=f"Invalid status. Allowed: {', '.join(QUEUE_STATUSES)}")
+
+        request_types = request_type or list(ADMIN_QUEUE_SOURCES)
+        invalid = [t for t in request_types if t not in ADMIN_QUEUE_SOURCES]
+        if invalid:
+            raise HTTPException(status_code=400, detail=f"Invalid request_type. Allowed: {', '.join(ADMIN_QUEUE_SOURCES)}")
+
+        # date_to is inclusive for callers
+        date_to_exclusive = date_to + timedelta(days=1) if date_to else None
+
+        rows = db.get_admin_request_queue(
+            request_types,
+            status=status,
+            vocalist_user_id=vocalist_id,
+            kalam_id=kalam_id,
+            date_from=date_from,
+            date_to=date_to_exclusive,
+            cursor=decode_queue_cursor(cursor) if cursor else None,
+            limit=limit
+        )
+        counts = db.get_admin_request_status_counts(
+            request_types,
+            vocalist_user_id=vocalist_id,
+            kalam_id=kalam_id,
+            date_from=date_from,
+            date_to=date_to_exclusive
+        )
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    return {
+        "requests": rows,
+        "counts": counts,
+        "has_more": has_more,
+        "next_cursor": encode_queue_cursor(rows[-1]) if has_more else None
+    }
+
+@router.post("/admin/bulk-status")
+def bulk_update_request_status(
+    data: AdminBulkUpdateRequestStatus,
+    background_tasks: BackgroundTasks,
+    user_id: int = Depends(get_current_user)
+):
+    """
+    Move many studio or remote recording requests to one status (Admin only).
+    Transitions are validated per row and applied in a single UPDATE; status emails
+    go out as one batch after the response. Returns an outcome for every id.
+    """
+    if data.request_type not in RECORDING_REQUEST_TABLES:
+        raise HTTPException(status_code=400, detail="request_type must be 'studio' or 'remote'")
+
+    if data.status not in QUEUE_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Invalid status. Allowed: {', '.join(QUEUE_STATUSES)}")
+
+    request_ids = list(dict.fromkeys(data.request_ids))
+
+    with DBConnection.get_db_connection() as conn:
+        db = Queries(conn)
+
+        user = db.get_user_by_id(user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        if user['role'] not in ['admin', 'sub-admin']:
+            raise HTTPException(status_code=403, detail="Only admins can update request status")
+
+        updated, outcomes = db.bulk_update_request_status(
+            data.request_type, request_ids, data.status, data.admin_comments
+        )
+        # Rejected studio sessions give their slots back in the same transaction,
+        # and sessions leaving rejected take theirs again
+        if data.request_type == 'studio' and data.status == 'rejected' and updated:
+            db.release_session_slots('studio_recording', [row['id'] for row in updated])
+        elif data.request_type == 'studio' and updated:
+            db.restore_session_slots(
+                'studio_recording', [row['id'] for row in updated if row['previous_status'] == 'rejected']
+            )
+        conn.commit()
+
+    emails = [
+        build_recording_request_status_email(
+            row['submitter_email'], data.request_type, data.status, row['lyric_title'], row['submitter_name']
+        )
+        for row in updated
+        if row['submitter_email']
+    ]
+    queue_email_batch(background_tasks, emails)
+
+    return {
+        "message": f"{len(updated)} of {len(request_ids)} {data.request_type} requests moved to {data.status}",
+        "updated": len(updated),
+        "emails_queued": len(emails),
+        "results": outcomes
+    }
 
 @router.put("/admin/studio-requests/{request_id}/status")
 def update_studio_request_status(
@@ -722,6 +1015,11 @@ def update_studio_request_status(
     with conn.cursor(cursor_factory=RealDictCursor) as cur:
         cur.execute(update_query, (data.status, data.admin_comments, request_id))
         result = cur.fetchone()
+        # Rejected sessions give their studio slot back, and take it again when un-rejected
+        if data.status == 'rejected':
+            db.release_session_slot('studio_recording', request_id)
+        elif request['status'] == 'rejected':
+            db.restore_session_slots('studio_recording', [request_id])
         conn.commit()
     
     # If approved, update the blog assignment
@@ -736,10 +1034,11 @@ def update_studio_request_status(
     try:
         from utils.otp import send_recording_request_status_email
         send_recording_request_status_email(
-            email=request.get('lyric_writer', ''),
+            email=request.get('submitter_email'),
             request_type='studio',
             status=data.status,
-            title=result['lyric_title']
+            title=result['lyric_title'],
+            name=request.get('submitter_name')
         )
     except Exception as e:
         print(f"Failed to send email notification: {e}")
@@ -801,10 +1100,11 @@ def update_remote_request_status(
     try:
         from utils.otp import send_recording_request_status_email
         send_recording_request_status_email(
-            email=request.get('lyric_writer', ''),
+            email=request.get('submitter_email'),
             request_type='remote',
             status=data.status,
-            title=result['lyric_title']
+            title=result['lyric_title'],
+            name=request.get('submitter_name')
         )
     except Exception as e:
         print(f"Failed to send email notification: {e}")
@@ -269,6 +269,11 @@ def update_studio_visit_request_status(
     with conn.cursor() as cur:
         cur.execute(update_query, (data.status, data.admin_comments, request_id))
         result = cur.fetchone()
+        # Rejected visits give their studio slot back, and take it again when un-rejected
+        if data.status == 'rejected':
+            db.release_session_slot('studio_visit', request_id)
+        elif request['status'] == 'rejected':
+            db.restore_session_slots('studio_visit', [request_id])
         conn.commit()
 
     if not result:
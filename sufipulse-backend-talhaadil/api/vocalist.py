@@ -132,14 +132,14 @@ def approve_or_reject_kalam(
     if user["role"] not in ["admin", "vocalist",'sub-admin']:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    result = db.approve_or_reject_kalam(
-        kalam_id=kalam_id,
-        status=data.status,
-        comments=data.comments,
-        vocalist_id=current_user_id
-    )
+    if data.status not in ["approved", "rejected"]:
+        raise HTTPException(status_code=400, detail="Invalid status. Must be 'approved' or 'rejected'")
+
+    action = "vocalist_approve" if data.status == "approved" else "vocalist_reject"
+    result = db.apply_kalam_transition(kalam_id, action, current_user_id, user["role"], data.comments)
 
     if not result:
         raise HTTPException(status_code=404, detail="Kalam submission not found")
+    result.pop("kalam", None)
 
     return {"message": f"Kalam {data.status} successfully", "kalam_submission": result}
\ No newline at end of file
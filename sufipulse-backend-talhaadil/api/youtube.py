@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from db.connection import DBConnection
 from utils.jwt_handler import get_current_user
 from sql.combinedQueries import Queries
+from utils.metrics import observe_youtube_call, youtube_sync_duration_seconds
 import os, re, requests
 from dotenv import load_dotenv
 from datetime import datetime
@@ -42,6 +43,8 @@ class VideoResponse(VideoBase):
 # ============================
 def fetch_from_youtube(url: str) -> dict:
     resp = requests.get(url)
+    # .../youtube/v3/{endpoint}?... -> quota cost per endpoint
+    observe_youtube_call(url.split("?", 1)[0].rsplit("/", 1)[-1], resp.status_code)
     if resp.status_code != 200:
         raise HTTPException(status_code=resp.status_code, detail=resp.text)
     return resp.json()
@@ -108,6 +111,7 @@ def fetch_all_videos_from_channel(channel_id: str) -> List[dict]:
 # Routes
 # ============================@router.post("/fetch-and-store", response_model=List[VideoResponse])
 @router.post("/fetch-and-store", response_model=List[VideoResponse])
+@youtube_sync_duration_seconds.time()
 def fetch_and_store():
     conn = DBConnection.get_connection()
     db = Queries(conn)
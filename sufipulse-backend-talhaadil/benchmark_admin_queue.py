@@ -0,0 +1,181 @@
+"""
+Benchmark the unified admin request queue
+Seeds ~1M synthetic requests across the four request tables inside a transaction,
+then times the first page, a deep keyset page and the filtered variants, and prints
+the EXPLAIN ANALYZE plan of each queue query. Everything is rolled back unless --keep.
+
+Apply the migrations first (python migrate.py up), then run this from the
+sufipulse-backend-talhaadil directory:
+    python benchmark_admin_queue.py [--rows 1000000] [--pages 40] [--keep]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import psycopg2
+from psycopg2.extensions import connection, cursor as base_cursor
+from dotenv import load_dotenv
+
+from sql.combinedQueries import Queries
+from sql.queries.recordingRequestQueries import ADMIN_QUEUE_SOURCES
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+load_dotenv()
+
+# Database configuration
+DB_CONFIG = {
+    'dbname': os.getenv('DB_NAME', 'sufipulse'),
+    'user': os.getenv('DB_USER', 'postgres'),
+    'password': os.getenv('DB_PASSWORD', 'postgres'),
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'port': os.getenv('DB_PORT', '5432'),
+}
+
+# Rows are spread over several months of created_at values; statuses cycle through each table's values
+SEED_STATEMENTS = {
+    "studio_recording_requests": """
+        INSERT INTO studio_recording_requests (lyric_title, preferred_session_date, preferred_time_block,
+            estimated_studio_duration, performance_direction, status, created_at)
+        SELECT 'Bench kalam ' || g, CURRENT_DATE + (g %% 90), (ARRAY['Morning','Afternoon','Evening'])[1 + g %% 3],
+            '1 Hour', 'benchmark', (ARRAY['pending_review','approved','rejected','completed'])[1 + g %% 4],
+            NOW() - (g * INTERVAL '31 seconds')
+        FROM generate_series(1, %s) g
+    """,
+    "remote_recording_requests_new": """
+        INSERT INTO remote_recording_requests_new (lyric_title, recording_environment, target_submission_date,
+            interpretation_notes, status, created_at)
+        SELECT 'Bench kalam ' || g, 'USB Microphone', CURRENT_DATE + (g %% 90), 'benchmark',
+            (ARRAY['under_review','approved','rejected','completed'])[1 + g %% 4],
+            NOW() - (g * INTERVAL '29 seconds')
+        FROM generate_series(1, %s) g
+    """,
+    "studio_visit_requests": """
+        INSERT INTO studio_visit_requests (name, email, preferred_date, status, created_at)
+        SELECT 'Visitor ' || g, 'visitor' || g || '@example.com', CURRENT_DATE + (g %% 90),
+            (ARRAY['pending','approved','rejected','completed'])[1 + g %% 4],
+            NOW() - (g * INTERVAL '37 seconds')
+        FROM generate_series(1, %s) g
+    """,
+    "remote_recording_requests": """
+        INSERT INTO remote_recording_requests (name, email, status, created_at)
+        SELECT 'Remote ' || g, 'remote' || g || '@example.com',
+            (ARRAY['pending','approved','rejected','completed'])[1 + g %% 4],
+            NOW() - (g * INTERVAL '41 seconds')
+        FROM generate_series(1, %s) g
+    """,
+}
+
+
+class CapturingConnection(connection):
+    """Remembers the last statement sent (parameters bound) so it can be re-run under EXPLAIN"""
+
+    last_query = None
+
+    def cursor(self, *args, cursor_factory=None, **kwargs):
+        conn = self
+        factory = cursor_factory or self.cursor_factory or base_cursor
+
+        class CapturingCursor(factory):
+            def execute(self, query, vars=None):
+                try:
+                    return super().execute(query, vars)
+                finally:
+                    conn.last_query = self.query.decode() if self.query else None
+
+        return super().cursor(*args, cursor_factory=CapturingCursor, **kwargs)
+
+
+def seed(conn, rows):
+    per_table = rows // len(SEED_STATEMENTS)
+    with conn.cursor() as cur:
+        for table, statement in SEED_STATEMENTS.items():
+            start = time.perf_counter()
+            cur.execute(statement, (per_table,))
+            print(f"   - {table}: {per_table:,} rows in {time.perf_counter() - start:.1f}s")
+            cur.execute(f"ANALYZE {table}")
+
+
+def explain(conn, query):
+    with conn.cursor() as cur:
+        cur.execute("EXPLAIN (ANALYZE, BUFFERS) " + query)
+        return "\n".join(row[0] for row in cur.fetchall())
+
+
+def timed_page(conn, db, label, **kwargs):
+    start = time.perf_counter()
+    rows = db.get_admin_request_queue(list(ADMIN_QUEUE_SOURCES), **kwargs)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"\n{label}: {len(rows)} rows in {elapsed:.2f} ms")
+    print(explain(conn, conn.last_query))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the admin request queue")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--pages", type=int, default=40, help="Pages to walk before the deep-page measurement")
+    parser.add_argument("--limit", type=int, default=25)
+    parser.add_argument("--keep", action="store_true", help="Commit the seeded rows instead of rolling back")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("ADMIN REQUEST QUEUE BENCHMARK")
+    print("=" * 60)
+    print(f"\nConnecting to database: {DB_CONFIG['dbname']}@{DB_CONFIG['host']}")
+
+    conn = psycopg2.connect(connection_factory=CapturingConnection, **DB_CONFIG)
+    conn.autocommit = False
+    db = Queries(conn)
+
+    try:
+        print(f"\nSeeding {args.rows:,} requests...")
+        seed(conn, args.rows)
+
+        rows = timed_page(conn, db, "First page", limit=args.limit)
+
+        walk_start = time.perf_counter()
+        for _ in range(args.pages):
+            if len(rows) <= args.limit:
+                break
+            last = rows[args.limit - 1]
+            rows = db.get_admin_request_queue(
+                list(ADMIN_QUEUE_SOURCES),
+                cursor=(last["created_at"], last["source_rank"], last["id"]),
+                limit=args.limit
+            )
+        walk_ms = (time.perf_counter() - walk_start) * 1000
+        print(f"\nWalked {args.pages} pages in {walk_ms:.2f} ms ({walk_ms / max(args.pages, 1):.2f} ms/page)")
+
+        last = rows[min(args.limit, len(rows)) - 1]
+        timed_page(conn, db, f"Page {args.pages + 1} (keyset)", limit=args.limit,
+                   cursor=(last["created_at"], last["source_rank"], last["id"]))
+        timed_page(conn, db, "Status filter (pending)", status="pending", limit=args.limit)
+
+        start = time.perf_counter()
+        counts = db.get_admin_request_status_counts(list(ADMIN_QUEUE_SOURCES))
+        print(f"\nStatus counts in {(time.perf_counter() - start) * 1000:.2f} ms: {counts}")
+
+        if args.keep:
+            conn.commit()
+            print("\n[OK] Seeded rows committed")
+        else:
+            conn.rollback()
+            print("\n[OK] Seeded rows rolled back")
+    except Exception as e:
+        conn.rollback()
+        print(f"\n[ERROR] {e}")
+        return 1
+    finally:
+        conn.close()
+
+    print("\n" + "=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,362 @@
+"""
+Load test the API with realistic mixed traffic
+Drives a running server (uvicorn/gunicorn) with a weighted mix of public browsing,
+blog engagement, admin queue, notification and CMS requests from concurrent
+workers, then reports throughput, latency percentiles and DB statements per
+request (from the Server-Timing header) and writes them to a JSON artifact.
+Artifacts from two commits can be compared with --compare.
+
+Seed the database first (python seed_synthetic_data.py), start the server with the
+same .env (JWT_SECRET is used to mint tokens for the synthetic users), then run
+this from the sufipulse-backend-talhaadil directory. Guest traffic spreads over many
+client IPs through X-Forwarded-For, which the server only honours from TRUSTED_PROXY_CIDRS
+(loopback by default); from any other host, start the server with RATE_LIMIT_ENABLED=false
+or the per-IP limits turn writes into 429s (reported as rate_limited in the artifact):
+    python benchmark_load.py --base-url http://127.0.0.1:8000 --duration 60 --concurrency 32
+    python benchmark_load.py --compare bench-results/load-<old>.json --max-regression 15
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import psycopg2
+import requests
+from dotenv import load_dotenv
+
+from seed_synthetic_data import BENCH_EMAIL_DOMAIN, DB_CONFIG
+from utils.jwt_handler import create_access_token
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+load_dotenv()
+
+RESULTS_DIR = "bench-results"
+
+SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries')
+
+
+class Fixtures:
+    """Ids, slugs and tokens the scenarios pick from, read once from the seeded database"""
+
+    def __init__(self, conn):
+        domain = "%@" + BENCH_EMAIL_DOMAIN
+        with conn.cursor() as cur:
+            cur.execute("SELECT id FROM blog_submissions WHERE status IN ('approved', 'posted') ORDER BY id LIMIT 5000")
+            self.blog_ids = [row[0] for row in cur.fetchall()]
+            cur.execute("SELECT page_slug FROM cms_pages WHERE is_active = TRUE")
+            self.cms_slugs = [row[0] for row in cur.fetchall()]
+            cur.execute("SELECT id, role FROM users WHERE email LIKE %s AND role <> 'admin' ORDER BY id LIMIT 2000", (domain,))
+            users = cur.fetchall()
+            cur.execute("SELECT id FROM users WHERE email = %s", ("admin@" + BENCH_EMAIL_DOMAIN,))
+            admin = cur.fetchone()
+
+        if not self.blog_ids or not users or not admin:
+            raise RuntimeError("No synthetic data found; run seed_synthetic_data.py first")
+
+        self.user_tokens = [create_access_token({"sub": str(user_id), "role": role}) for user_id, role in users]
+        self.admin_token = create_access_token({"sub": str(admin[0]), "role": "admin"})
+
+    def blog_id(self):
+        # Same skew as the seeded engagement: a few blogs get most of the traffic
+        return self.blog_ids[int(random.random() ** 3 * len(self.blog_ids))]
+
+
+# Engagement endpoints drop scripted user agents (utils/engagement_filter.py)
+BROWSER_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+
+def guest_ip():
+    return f"172.{random.randint(16, 31)}.{random.randint(0, 255)}.{random.randint(1, 254)}"
+
+
+# Each scenario returns (endpoint label, method, path, request kwargs)
+
+def browse_blogs(f):
+    return "GET /public/blogs", "GET", "/public/blogs", {"params": {"skip": random.choice((0, 0, 0, 6, 12, 60)), "limit": 6}}
+
+
+def read_blog(f):
+    return "GET /public/blogs/{id}", "GET", f"/public/blogs/{f.blog_id()}", {}
+
+
+def read_comments(f):
+    return "GET /public/blogs/{id}/comments", "GET", f"/public/blogs/{f.blog_id()}/comments", {}
+
+
+def blog_engagement(f):
+    return "GET /public/blogs/{id}/engagement", "GET", f"/public/blogs/{f.blog_id()}/engagement", {}
+
+
+def browse_kalams(f):
+    return "GET /public/postedkalams", "GET", "/public/postedkalams", {}
+
+
+def browse_vocalists(f):
+    return "GET /public/vocalists", "GET", "/public/vocalists", {}
+
+
+def record_view(f):
+    return "POST /public/blogs/{id}/view", "POST", f"/public/blogs/{f.blog_id()}/view", {
+        "headers": {"X-Forwarded-For": guest_ip(), "User-Agent": BROWSER_USER_AGENT}}
+
+
+def toggle_like(f):
+    return "POST /public/blogs/{id}/like", "POST", f"/public/blogs/{f.blog_id()}/like", {
+        "headers": {"X-Forwarded-For": guest_ip()}}
+
+
+def add_comment(f):
+    # A new commenter each time: comments are rate limited per IP and per email
+    return "POST /public/blogs/{id}/comment", "POST", f"/public/blogs/{f.blog_id()}/comment", {
+        "headers": {"X-Forwarded-For": guest_ip()},
+        "json": {"comment_text": "Load test comment", "commenter_name": "Load Guest",
+                 "commenter_email": f"load-{random.getrandbits(32):08x}@{BENCH_EMAIL_DOMAIN}"}}
+
+
+def cms_page(f):
+    slug = random.choice(f.cms_slugs) if f.cms_slugs else "about"
+    return "GET /cms/page/{slug}", "GET", f"/cms/page/{slug}", {}
+
+
+def user_notifications(f):
+    return "GET /notifications/user/", "GET", "/notifications/user/", {
+        "headers": {"Authorization": f"Bearer {random.choice(f.user_tokens)}"}}
+
+
+def admin_queue(f):
+    params = {"limit": 25}
+    if random.random() < 0.5:
+        params["status"] = "pending"
+    return "GET /recording-requests/admin/queue", "GET", "/recording-requests/admin/queue", {
+        "params": params, "headers": {"Authorization": f"Bearer {f.admin_token}"}}
+
+
+def admin_blog_submissions(f):
+    return "GET /admin/blog-submissions", "GET", "/admin/blog-submissions", {
+        "headers": {"Authorization": f"Bearer {f.admin_token}"}}
+
+
+# Relative weights, roughly the production mix: mostly anonymous reads
+SCENARIOS = (
+    (browse_blogs, 20),
+    (read_blog, 20),
+    (read_comments, 8),
+    (blog_engagement, 8),
+    (browse_kalams, 8),
+    (browse_vocalists, 4),
+    (record_view, 12),
+    (toggle_like, 4),
+    (add_comment, 1),
+    (cms_page, 8),
+    (user_notifications, 4),
+    (admin_queue, 2),
+    (admin_blog_submissions, 1),
+)
+
+
+class Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = defaultdict(list)
+
+    def add(self, endpoint, status, latency_ms, db_ms, db_statements):
+        with self._lock:
+            self.samples[endpoint].append((status, latency_ms, db_ms, db_statements))
+
+
+def worker(base_url, fixtures, recorder, deadline):
+    session = requests.Session()
+    functions = [scenario for scenario, _ in SCENARIOS]
+    weights = [weight for _, weight in SCENARIOS]
+    while time.perf_counter() < deadline:
+        endpoint, method, path, kwargs = random.choices(functions, weights)[0](fixtures)
+        start = time.perf_counter()
+        try:
+            response = session.request(method, base_url + path, timeout=30, **kwargs)
+            status = response.status_code
+            timing = SERVER_TIMING_DB.search(response.headers.get("server-timing", ""))
+        except requests.RequestException:
+            status, timing = 0, None
+        latency_ms = (time.perf_counter() - start) * 1000
+        recorder.add(endpoint, status, latency_ms,
+                     float(timing.group(1)) if timing else None,
+                     int(timing.group(2)) if timing else None)
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return round(sorted_values[index], 2)
+
+
+def summarize(samples, seconds):
+    latencies = sorted(s[1] for s in samples)
+    db_ms = sorted(s[2] for s in samples if s[2] is not None)
+    statements = [s[3] for s in samples if s[3] is not None]
+    errors = sum(1 for s in samples if s[0] == 0 or s[0] >= 500)
+    client_errors = sum(1 for s in samples if 400 <= s[0] < 500)
+    rate_limited = sum(1 for s in samples if s[0] == 429)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "client_errors": client_errors,
+        "rate_limited": rate_limited,
+        "throughput_rps": round(len(samples) / seconds, 2),
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "db_p50_ms": percentile(db_ms, 0.50),
+        "db_p95_ms": percentile(db_ms, 0.95),
+        "avg_db_statements": round(statistics.mean(statements), 2) if statements else None,
+        "max_db_statements": max(statements) if statements else None,
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline_path, max_regression):
+    """Print p95/throughput deltas against a previous artifact; True if within max_regression percent"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    print(f"\nCompared with {baseline_path} (commit {baseline['meta'].get('commit')}):")
+    ok = True
+    rows = [("overall", current["overall"], baseline["overall"])]
+    rows += [(name, stats, baseline["endpoints"].get(name)) for name, stats in current["endpoints"].items()]
+    for name, now, before in rows:
+        if not before or not before.get("p95_ms") or not now.get("p95_ms"):
+            continue
+        p95_change = (now["p95_ms"] - before["p95_ms"]) / before["p95_ms"] * 100
+        flag = ""
+        if p95_change > max_regression:
+            flag = "  [REGRESSION]"
+            ok = False
+        statements = ""
+        if now.get("avg_db_statements") is not None and before.get("avg_db_statements") is not None:
+            statements = f", statements {before['avg_db_statements']} -> {now['avg_db_statements']}"
+        print(f"   - {name}: p95 {before['p95_ms']} -> {now['p95_ms']} ms ({p95_change:+.1f}%){statements}{flag}")
+
+    rps_change = (current["overall"]["throughput_rps"] - baseline["overall"]["throughput_rps"]) \
+        / max(baseline["overall"]["throughput_rps"], 0.01) * 100
+    print(f"   - throughput: {baseline['overall']['throughput_rps']} -> "
+          f"{current['overall']['throughput_rps']} req/s ({rps_change:+.1f}%)")
+    if rps_change < -max_regression:
+        ok = False
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the API with mixed traffic")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds of measured traffic")
+    parser.add_argument("--warmup", type=float, default=5, help="Seconds of unmeasured traffic first")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--output", help=f"Artifact path (default {RESULTS_DIR}/load-<commit>-<time>.json)")
+    parser.add_argument("--compare", help="Previous artifact to compare against")
+    parser.add_argument("--max-regression", type=float, default=15,
+                        help="Percent p95/throughput regression that fails --compare")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("API LOAD TEST")
+    print("=" * 60)
+
+    print(f"\nLoading fixtures from {DB_CONFIG['dbname']}@{DB_CONFIG['host']}")
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        fixtures = Fixtures(conn)
+    except Exception as e:
+        print(f"\n[ERROR] {e}")
+        return 1
+    finally:
+        conn.close()
+
+    base_url = args.base_url.rstrip("/")
+    print(f"Target: {base_url}, {args.concurrency} workers")
+
+    if args.warmup:
+        print(f"\nWarming up for {args.warmup:.0f}s...")
+        deadline = time.perf_counter() + args.warmup
+        with ThreadPoolExecutor(args.concurrency) as pool:
+            for _ in range(args.concurrency):
+                pool.submit(worker, base_url, fixtures, Recorder(), deadline)
+
+    print(f"Measuring for {args.duration:.0f}s...")
+    recorder = Recorder()
+    start = time.perf_counter()
+    deadline = start + args.duration
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        for _ in range(args.concurrency):
+            pool.submit(worker, base_url, fixtures, recorder, deadline)
+    elapsed = time.perf_counter() - start
+
+    all_samples = [sample for samples in recorder.samples.values() for sample in samples]
+    if not all_samples:
+        print("\n[ERROR] No requests completed")
+        return 1
+
+    commit = git_commit()
+    result = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "base_url": base_url,
+            "concurrency": args.concurrency,
+            "duration_s": round(elapsed, 1),
+            "blogs_in_pool": len(fixtures.blog_ids),
+        },
+        "overall": summarize(all_samples, elapsed),
+        "endpoints": {
+            name: summarize(samples, elapsed)
+            for name, samples in sorted(recorder.samples.items())
+        },
+    }
+
+    overall = result["overall"]
+    print(f"\n{overall['requests']:,} requests, {overall['errors']} errors, {overall['client_errors']} 4xx "
+          f"({overall['rate_limited']} rate limited), {overall['throughput_rps']} req/s")
+    print(f"p50 {overall['p50_ms']} ms, p95 {overall['p95_ms']} ms, p99 {overall['p99_ms']} ms, "
+          f"{overall['avg_db_statements']} statements/request")
+    print()
+    for name, stats in result["endpoints"].items():
+        print(f"   - {name}: {stats['requests']:,} req, p50 {stats['p50_ms']} ms, p95 {stats['p95_ms']} ms, "
+              f"db p95 {stats['db_p95_ms']} ms, {stats['avg_db_statements']} statements, {stats['errors']} errors, "
+              f"{stats['client_errors']} 4xx")
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"load-{commit or 'nocommit'}-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"\n[OK] Results written to {output}")
+
+    exit_code = 0
+    if args.compare and not compare(result, args.compare, args.max_regression):
+        print("\n[FAIL] Regression beyond the allowed threshold")
+        exit_code = 1
+
+    print("\n" + "=" * 60)
+    return exit_code
+
+
+if __name__ == "__main__":
+    exit(main())
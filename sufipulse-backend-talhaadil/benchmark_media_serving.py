@@ -0,0 +1,98 @@
+"""
+Benchmark recording reference audio serving
+Compares the dedicated media route against a plain StaticFiles mount for
+full downloads, range scrubbing and conditional (ETag) revalidation.
+
+Run this from the sufipulse-backend-talhaadil directory:
+    python benchmark_media_serving.py [--size-mb 10] [--requests 200]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+
+from fastapi import FastAPI
+from fastapi.staticfiles import StaticFiles
+from fastapi.testclient import TestClient
+
+from api.media import router as media_router, RECORDING_UPLOAD_ROOT
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+
+def build_apps():
+    media_app = FastAPI()
+    media_app.include_router(media_router)
+    media_app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+
+    static_app = FastAPI()
+    static_app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+    return TestClient(media_app), TestClient(static_app)
+
+
+def run_case(client, url, headers, n):
+    timings = []
+    bytes_sent = 0
+    status = None
+    for _ in range(n):
+        start = time.perf_counter()
+        response = client.get(url, headers=headers)
+        timings.append((time.perf_counter() - start) * 1000)
+        bytes_sent += len(response.content)
+        status = response.status_code
+    timings.sort()
+    return {
+        "status": status,
+        "p50_ms": statistics.median(timings),
+        "p95_ms": timings[int(len(timings) * 0.95) - 1],
+        "avg_kb": bytes_sent / n / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark media serving")
+    parser.add_argument("--size-mb", type=float, default=10)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    upload_dir = os.path.join(RECORDING_UPLOAD_ROOT, "studio")
+    os.makedirs(upload_dir, exist_ok=True)
+    filename = f"{uuid.uuid4()}_0.mp3"
+    file_path = os.path.join(upload_dir, filename)
+    with open(file_path, "wb") as f:
+        f.write(os.urandom(int(args.size_mb * 1024 * 1024)))
+
+    url = f"/uploads/recording_requests/studio/{filename}"
+    media_client, static_client = build_apps()
+
+    try:
+        etag = media_client.get(url, headers={"range": "bytes=0-0"}).headers.get("etag")
+        cases = [
+            ("full download", {}),
+            ("range scrub 256KB", {"range": "bytes=1048576-1310719"}),
+            ("revalidate (If-None-Match)", {"if-none-match": etag}),
+        ]
+
+        print("=" * 72)
+        print(f"MEDIA SERVING BENCHMARK ({args.size_mb} MB file, {args.requests} requests/case)")
+        print("=" * 72)
+        print(f"{'case':<30}{'server':<10}{'status':>7}{'p50 ms':>10}{'p95 ms':>10}{'avg KB':>10}")
+        for name, headers in cases:
+            for label, client in (("media", media_client), ("static", static_client)):
+                result = run_case(client, url, headers, args.requests)
+                print(f"{name:<30}{label:<10}{result['status']:>7}{result['p50_ms']:>10.2f}"
+                      f"{result['p95_ms']:>10.2f}{result['avg_kb']:>10.1f}")
+        print("=" * 72)
+    finally:
+        os.remove(file_path)
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
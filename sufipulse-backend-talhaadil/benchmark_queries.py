@@ -0,0 +1,515 @@
+"""
+Microbenchmark the Queries methods (sql/queries/*.py)
+Times each method against the seeded database, replays the statements it issued
+under EXPLAIN (ANALYZE, BUFFERS) to record rows scanned, buffer hits/reads and the
+scan type used per table, and writes a JSON artifact per data scale. Writes run in a
+transaction that is rolled back after every call (the methods' own commits are held).
+
+With --baseline, any method whose plan switched from an index to a sequential scan
+on some table (at the same scale) is reported as a regression and the run fails.
+
+Run this from the sufipulse-backend-talhaadil directory against a throwaway database:
+    python benchmark_queries.py --scales 1k 100k 10m --seed
+    python benchmark_queries.py --scales 100k --baseline bench-results/queries-100k-<old>.json
+"""
+
+import argparse
+import inspect
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+import psycopg2
+from psycopg2.extensions import connection, cursor as base_cursor
+from psycopg2.extras import DictCursor
+from dotenv import load_dotenv
+
+import seed_synthetic_data
+from seed_synthetic_data import BENCH_EMAIL_DOMAIN, DB_CONFIG, LOCAL_HOSTS
+from sql.combinedQueries import Queries
+from sql.queries.notificationQueries import SpecialRecognitionCreate
+from sql.queries.recordingRequestQueries import ADMIN_QUEUE_SOURCES
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+load_dotenv()
+
+RESULTS_DIR = "bench-results"
+
+# Rows in the largest table (blog_views); the other tables keep the "small" proportions
+SCALE_ROWS = {
+    "1k": 1_000,
+    "100k": 100_000,
+    "10m": 10_000_000,
+}
+
+INDEX_SCANS = ("Index Scan", "Index Only Scan", "Bitmap Heap Scan")
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "VALUES")
+
+
+def volumes_for(rows: int) -> dict:
+    base = seed_synthetic_data.SCALES["small"]
+    factor = rows / base["blog_views"]
+    return {name: max(10, int(count * factor)) for name, count in base.items()}
+
+
+# ==================== CONNECTION ====================
+
+@lru_cache(maxsize=None)
+def _capturing_cursor_class(factory):
+    class CapturingCursor(factory):
+        def execute(self, query, vars=None):
+            try:
+                return super().execute(query, vars)
+            finally:
+                if self.query and self.connection.captured is not None:
+                    self.connection.captured.append(self.query.decode("utf-8", "replace"))
+
+    return CapturingCursor
+
+
+class BenchConnection(connection):
+    """Records every statement sent (parameters bound) and holds commits so each call can be rolled back"""
+
+    captured = None
+    hold_commits = True
+
+    def cursor(self, *args, cursor_factory=None, **kwargs):
+        factory = cursor_factory or self.cursor_factory or base_cursor
+        return super().cursor(*args, cursor_factory=_capturing_cursor_class(factory), **kwargs)
+
+    def commit(self):
+        if not self.hold_commits:
+            super().commit()
+
+
+# ==================== CASES ====================
+
+class Fixtures:
+    """Representative ids from the seeded data, biased towards the busiest rows"""
+
+    def __init__(self, conn):
+        domain = "%@" + BENCH_EMAIL_DOMAIN
+
+        def one(query, *params):
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+                row = cur.fetchone()
+                return row[0] if row else None
+
+        self.blog_id = one("SELECT id FROM blog_submissions WHERE status IN ('approved','posted') ORDER BY view_count DESC NULLS LAST LIMIT 1")
+        self.draft_blog_id = one("SELECT id FROM blog_submissions WHERE status = 'pending' ORDER BY id LIMIT 1")
+        self.comment_id = one("SELECT id FROM blog_comments WHERE blog_id = %s ORDER BY id LIMIT 1", self.blog_id)
+        self.writer_id = one("SELECT id FROM users WHERE role = 'writer' AND email LIKE %s ORDER BY id LIMIT 1", domain)
+        self.vocalist_id = one("SELECT id FROM users WHERE role = 'vocalist' AND email LIKE %s ORDER BY id LIMIT 1", domain)
+        self.blogger_id = one("SELECT user_id FROM blog_submissions WHERE id = %s", self.blog_id)
+        self.admin_id = one("SELECT id FROM users WHERE email = %s", "admin@" + BENCH_EMAIL_DOMAIN)
+        self.email = one("SELECT email FROM users WHERE id = %s", self.writer_id)
+        self.kalam_id = one("SELECT kalam_id FROM kalam_submissions WHERE status = 'posted' ORDER BY kalam_id LIMIT 1")
+        self.approved_kalam_id = one("SELECT kalam_id FROM kalam_submissions WHERE status = 'admin_approved' ORDER BY kalam_id LIMIT 1")
+        self.submission_id = one("SELECT id FROM kalam_submissions WHERE kalam_id = %s", self.kalam_id)
+        self.notification_id = one("SELECT id FROM notifications ORDER BY id DESC LIMIT 1")
+        studio_request_id = one("SELECT id FROM studio_recording_requests WHERE status = 'pending_review' ORDER BY id LIMIT 1")
+        self.studio_request_id = studio_request_id
+        self.studio_request_ids = [studio_request_id] if studio_request_id else []
+        self.studio_visit_id = one("SELECT id FROM studio_visit_requests WHERE preferred_date >= CURRENT_DATE ORDER BY id LIMIT 1")
+        self.guest_ip = "10.0.0.1"
+
+        if not self.blog_id or not self.writer_id or not self.kalam_id:
+            raise RuntimeError("No synthetic data found; run seed_synthetic_data.py or pass --seed")
+
+
+# Past the 90 days of seeded recording requests, so new bookings find a free lane
+FREE_DATE = date.today() + timedelta(days=120)
+
+BENCH_VIDEO = {
+    "id": "bench-video", "title": "Bench video", "writer": "Bench", "vocalist": "Bench",
+    "thumbnail": None, "views": "0", "duration": "PT4M", "uploaded_at": None, "tags": ["bench"],
+}
+
+
+def studio_visit_data(f):
+    return {
+        "vocalist_id": f.vocalist_id, "kalam_id": f.kalam_id, "name": "Bench", "email": f.email,
+        "organization": None, "contact_number": None, "preferred_date": FREE_DATE,
+        "preferred_time": "Morning (9:00 AM - 12:00 PM)", "purpose": "benchmark", "number_of_visitors": 1,
+        "additional_details": None, "special_requests": None,
+    }
+
+
+def remote_recording_data(f):
+    return {
+        "vocalist_id": f.vocalist_id, "kalam_id": f.kalam_id, "name": "Bench", "email": f.email,
+        "city": "Lahore", "country": "Pakistan", "time_zone": "Asia/Karachi", "role": "vocalist",
+        "project_type": "benchmark", "recording_equipment": "USB Microphone", "internet_speed": "50 Mbps",
+        "preferred_software": None, "availability": None, "recording_experience": None,
+        "technical_setup": None, "additional_details": None,
+    }
+
+
+# Method name -> call. Every public Queries method is either here, in SKIPPED, or
+# listed as "not covered" at the end of the run.
+CASES = {
+    # Auth
+    "get_user_by_id": lambda db, f: db.get_user_by_id(f.writer_id),
+    "get_user_by_email": lambda db, f: db.get_user_by_email(f.email),
+    "get_all_subadmins": lambda db, f: db.get_all_subadmins(),
+    "update_password": lambda db, f: db.update_password(f.email, "bench-hash"),
+    "resend_otp": lambda db, f: db.resend_otp(f.email, "123456", datetime.now() + timedelta(minutes=10)),
+    "purge_auth_challenges": lambda db, f: db.purge_auth_challenges(),
+    "create_user": lambda db, f: db.create_user(
+        "new-user@" + BENCH_EMAIL_DOMAIN, "Bench", "bench-hash", "writer", "Pakistan", "Lahore"),
+    "create_user_with_otp": lambda db, f: db.create_user_with_otp(
+        "new-user@" + BENCH_EMAIL_DOMAIN, "Bench", "bench-hash", "writer", "Pakistan", "Lahore",
+        "123456", datetime.now() + timedelta(minutes=10)),
+    "create_subadmin": lambda db, f: db.create_subadmin("subadmin@" + BENCH_EMAIL_DOMAIN, "Bench", "bench-hash", []),
+    "update_subadmin": lambda db, f: db.update_subadmin(f.admin_id, "Bench", "bench-hash", []),
+    # Writers / vocalists / bloggers
+    "get_writer_by_user_id": lambda db, f: db.get_writer_by_user_id(f.writer_id),
+    "create_writer_profile": lambda db, f: db.create_writer_profile(
+        f.admin_id, ["Ghazal"], ["Urdu"], "Bench sample", "benchmark", None, "weekends"),
+    "update_writer_profile": lambda db, f: db.update_writer_profile(f.writer_id, sample_title="Bench sample"),
+    "is_writer_registered": lambda db, f: db.is_writer_registered(f.writer_id),
+    "fetch_writers": lambda db, f: db.fetch_writers(0, 20),
+    "get_vocalist_by_user_id": lambda db, f: db.get_vocalist_by_user_id(f.vocalist_id),
+    "create_vocalist_profile": lambda db, f: db.create_vocalist_profile(
+        f.admin_id, "Tenor", ["Urdu"], "Bench sample", None, "benchmark", "benchmark", None, "weekends"),
+    "update_vocalist_profile": lambda db, f: db.update_vocalist_profile(f.vocalist_id, sample_title="Bench sample"),
+    "is_vocalist_registered": lambda db, f: db.is_vocalist_registered(f.vocalist_id),
+    "fetch_vocalists": lambda db, f: db.fetch_vocalists(0, 20),
+    "get_kalams_by_vocalist_id": lambda db, f: db.get_kalams_by_vocalist_id(f.vocalist_id),
+    "update_vocalist_status": lambda db, f: db.update_vocalist_status(f.vocalist_id, "approved"),
+    "get_blogger_by_user_id": lambda db, f: db.get_blogger_by_user_id(f.blogger_id),
+    "is_blogger_registered": lambda db, f: db.is_blogger_registered(f.blogger_id),
+    "create_blogger_profile": lambda db, f: db.create_blogger_profile(
+        f.admin_id, "Bench", None, "benchmark", "Lahore", None, {}, False, True, True, True),
+    "update_blogger_profile": lambda db, f: db.update_blogger_profile(f.blogger_id, short_bio="benchmark"),
+    "update_blogger_status": lambda db, f: db.update_blogger_status(f.blogger_id, "approved"),
+    # Kalams
+    "get_kalam_by_id": lambda db, f: db.get_kalam_by_id(f.kalam_id),
+    "create_kalam": lambda db, f: db.create_kalam(
+        "Bench kalam", "Urdu", "Love", "benchmark", "benchmark", "Rumi", "Qawwali", f.writer_id),
+    "get_kalam_submission_by_id": lambda db, f: db.get_kalam_submission_by_id(f.submission_id),
+    "get_kalam_submission_by_kalam_id": lambda db, f: db.get_kalam_submission_by_kalam_id(f.kalam_id),
+    "get_kalams_by_writer_id": lambda db, f: db.get_kalams_by_writer_id(f.writer_id),
+    "fetch_posted_kalams": lambda db, f: db.fetch_posted_kalams(0, 20),
+    "fetch_approved_kalams_for_vocalist": lambda db, f: db.fetch_approved_kalams_for_vocalist(0, 100, f.vocalist_id),
+    "update_kalam": lambda db, f: db.update_kalam(f.kalam_id, title="Bench kalam (edited)"),
+    "get_kalam_workflow_log": lambda db, f: db.get_kalam_workflow_log(f.kalam_id),
+    "apply_kalam_transition": lambda db, f: db.apply_kalam_transition(
+        f.approved_kalam_id, "admin_reject", f.admin_id, "admin", "benchmark"),
+    "get_all_youtube_videos": lambda db, f: db.get_all_youtube_videos(),
+    "get_three_youtube_videos": lambda db, f: db.get_three_youtube_videos(),
+    "upsert_youtube_video": lambda db, f: db.upsert_youtube_video(BENCH_VIDEO),
+    # Blogs
+    "fetch_approved_blogs": lambda db, f: db.fetch_approved_blogs(0, 6),
+    "fetch_approved_blogs[trending]": lambda db, f: db.fetch_approved_blogs(0, 6, sort="trending"),
+    "fetch_approved_blogs[popular]": lambda db, f: db.fetch_approved_blogs(0, 6, sort="popular"),
+    "refresh_blog_rankings": lambda db, f: db.refresh_blog_rankings(),
+    "maintain_engagement_partitions": lambda db, f: db.maintain_engagement_partitions(),
+    "fetch_blog_by_id": lambda db, f: db.fetch_blog_by_id(f.blog_id),
+    "fetch_blog_submissions": lambda db, f: db.fetch_blog_submissions(0, 20),
+    "create_blog_submission": lambda db, f: db.create_blog_submission(
+        "Bench blog", "benchmark", None, "benchmark", "Poetry", ["bench"], "English", f.blogger_id),
+    "update_blog_submission": lambda db, f: db.update_blog_submission(f.draft_blog_id, title="Bench blog (edited)"),
+    "get_blog_submission_by_id": lambda db, f: db.get_blog_submission_by_id(f.blog_id),
+    "get_blog_submissions_by_user_id": lambda db, f: db.get_blog_submissions_by_user_id(f.blogger_id),
+    "get_blog_submissions_count": lambda db, f: db.get_blog_submissions_count(),
+    "update_blog_submission_status": lambda db, f: db.update_blog_submission_status(f.draft_blog_id, "review"),
+    "bulk_update_blog_submission_status": lambda db, f: db.bulk_update_blog_submission_status([f.draft_blog_id], "review"),
+    # Blog engagement
+    "record_blog_view": lambda db, f: db.record_blog_view(f.blog_id, ip_address=f.guest_ip, user_agent="bench"),
+    "get_guest_unique_views": lambda db, f: db.get_guest_unique_views(f.blog_id),
+    "record_blog_like": lambda db, f: db.record_blog_like(f.blog_id, ip_address=f.guest_ip),
+    "record_blog_share": lambda db, f: db.record_blog_share(f.blog_id, "twitter", ip_address=f.guest_ip),
+    "is_user_liked_blog": lambda db, f: db.is_user_liked_blog(f.blog_id, ip_address=f.guest_ip),
+    "add_blog_comment": lambda db, f: db.add_blog_comment(
+        f.blog_id, "Benchmark comment", commenter_name="Bench", commenter_email="bench@" + BENCH_EMAIL_DOMAIN),
+    "get_blog_comments": lambda db, f: db.get_blog_comments(f.blog_id),
+    "get_blog_comments_paginated": lambda db, f: db.get_blog_comments_paginated(f.blog_id, 0, 5),
+    "approve_comment": lambda db, f: db.approve_comment(f.comment_id),
+    "delete_comment": lambda db, f: db.delete_comment(f.comment_id),
+    "get_blog_engagement_stats": lambda db, f: db.get_blog_engagement_stats(f.blog_id),
+    "get_blog_share_stats": lambda db, f: db.get_blog_share_stats(f.blog_id),
+    "get_blog_engagement_counts": lambda db, f: db.get_blog_engagement_counts([f.blog_id]),
+    # Notifications / guest posts / recognitions
+    "get_user_notifications": lambda db, f: db.get_user_notifications(f.writer_id, role="writer", limit=21),
+    "get_notification_audience": lambda db, f: db.get_notification_audience(f.writer_id),
+    "get_user_notifications_after": lambda db, f: db.get_user_notifications_after(f.writer_id, "writers", 0),
+    "get_latest_notification_id": lambda db, f: db.get_latest_notification_id(),
+    "mark_all_as_read": lambda db, f: db.mark_all_as_read(f.writer_id, role="writer"),
+    "create_notification": lambda db, f: db.create_notification("Bench", "Benchmark notification", "all"),
+    "create_specific_notifications": lambda db, f: db.create_specific_notifications(
+        [("Bench", "Benchmark notification", user_id) for user_id in (f.writer_id, f.vocalist_id, f.blogger_id)]),
+    "mark_as_read": lambda db, f: db.mark_as_read(f.notification_id, f.writer_id),
+    "get_unread_notification_count": lambda db, f: db.get_unread_notification_count(f.writer_id, role="writer"),
+    "fetch_all_guest_posts": lambda db, f: db.fetch_all_guest_posts(),
+    "fetch_paginated_guest_posts": lambda db, f: db.fetch_paginated_guest_posts(0, 20),
+    "fetch_user_guest_posts": lambda db, f: db.fetch_user_guest_posts(str(f.writer_id)),
+    "create_guest_post": lambda db, f: db.create_guest_post(
+        str(f.writer_id), "Bench post", "writer", "Lahore", "Pakistan", date.today().isoformat(),
+        "Poetry", "benchmark", "benchmark", ["bench"]),
+    # No guest posts or recognitions are seeded: these time the keyed lookup that finds nothing
+    "update_guest_post_status": lambda db, f: db.update_guest_post_status(0, "approved"),
+    "fetch_all_special_recognitions": lambda db, f: db.fetch_all_special_recognitions(),
+    "create_special_recognition": lambda db, f: db.create_special_recognition(
+        SpecialRecognitionCreate(title="Bench recognition", achievement="benchmark")),
+    # Recording requests and studio
+    "get_admin_request_queue": lambda db, f: db.get_admin_request_queue(list(ADMIN_QUEUE_SOURCES), limit=25),
+    "get_admin_request_status_counts": lambda db, f: db.get_admin_request_status_counts(list(ADMIN_QUEUE_SOURCES)),
+    "bulk_update_request_status": lambda db, f: db.bulk_update_request_status(
+        "studio", f.studio_request_ids, "approved"),
+    "get_all_studio_visit_requests": lambda db, f: db.get_all_studio_visit_requests(),
+    "get_all_remote_recording_requests": lambda db, f: db.get_all_remote_recording_requests(),
+    "get_studio_visit_requests_by_vocalist": lambda db, f: db.get_studio_visit_requests_by_vocalist(f.vocalist_id),
+    "get_remote_recording_requests_by_vocalist": lambda db, f: db.get_remote_recording_requests_by_vocalist(f.vocalist_id),
+    "create_studio_visit_request": lambda db, f: db.create_studio_visit_request(studio_visit_data(f)),
+    "create_remote_recording_request": lambda db, f: db.create_remote_recording_request(remote_recording_data(f)),
+    "studio_request_exists": lambda db, f: db.studio_request_exists(f.vocalist_id, f.kalam_id),
+    "remote_request_exists": lambda db, f: db.remote_request_exists(f.vocalist_id, f.kalam_id),
+    "check_studio_visit_conflict_datetime": lambda db, f: db.check_studio_visit_conflict_datetime(
+        date.today() + timedelta(days=7), "Morning"),
+    "check_remote_recording_conflict_datetime": lambda db, f: db.check_remote_recording_conflict_datetime(
+        date.today() + timedelta(days=7), "Morning"),
+    "check_studio_visit_conflict": lambda db, f: db.check_studio_visit_conflict(
+        f.vocalist_id, f.kalam_id, date.today() + timedelta(days=7), "Morning"),
+    "check_remote_recording_conflict": lambda db, f: db.check_remote_recording_conflict(
+        f.vocalist_id, f.kalam_id, date.today() + timedelta(days=7), "Morning"),
+    "save_recording_upload": lambda db, f: db.save_recording_upload(
+        "studio", f.studio_request_id, f.vocalist_id, "https://example.com/bench.mp3", "audio/mpeg", 1024),
+    "save_audio_analysis": lambda db, f: db.save_audio_analysis(
+        "studio", f.studio_request_id, "https://example.com/bench.mp3", 180.0, 44100, bytes(64)),
+    "get_recording_resources": lambda db, f: db.get_recording_resources(),
+    "get_slot_bookings_in_range": lambda db, f: db.get_slot_bookings_in_range(date.today(), date.today() + timedelta(days=30)),
+    "reserve_session_slot": lambda db, f: db.reserve_session_slot(
+        "studio", "studio_visit", f.studio_visit_id, FREE_DATE, "Morning"),
+    "release_session_slot": lambda db, f: db.release_session_slot("studio_recording", f.studio_request_id),
+    "release_session_slots": lambda db, f: db.release_session_slots("studio_recording", f.studio_request_ids),
+    "restore_session_slots": lambda db, f: db.restore_session_slots("studio_recording", f.studio_request_ids),
+    # Diagnostics
+    "get_slow_query_plans": lambda db, f: db.get_slow_query_plans(50),
+    "get_slow_query_summary": lambda db, f: db.get_slow_query_summary(50),
+}
+
+# Methods deliberately not benchmarked
+SKIPPED = {
+    "delete_all_youtube_videos": "deletes every video",
+    "delete_special_recognition": "no recognitions are seeded and a missing id raises 404",
+    "delete_user_by_id": "cascades through the seeded data",
+    "verify_otp_and_register": "needs a live OTP",
+}
+
+
+# ==================== PLAN ANALYSIS ====================
+
+def summarize_plan(plan: dict) -> dict:
+    """Rows scanned, buffers and scan types per table from an EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) plan"""
+    root = plan["Plan"]
+    scans = {}
+    rows_scanned = 0
+
+    def walk(node):
+        nonlocal rows_scanned
+        loops = node.get("Actual Loops", 1)
+        relation = node.get("Relation Name")
+        if relation:
+            scans.setdefault(relation, set()).add(node["Node Type"])
+            rows_scanned += (node.get("Actual Rows", 0) + node.get("Rows Removed by Filter", 0)) * loops
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(root)
+    return {
+        "execution_ms": plan.get("Execution Time"),
+        "rows_scanned": int(rows_scanned),
+        "shared_hit_blocks": root.get("Shared Hit Blocks", 0),
+        "shared_read_blocks": root.get("Shared Read Blocks", 0),
+        "scans": {relation: sorted(types) for relation, types in scans.items()},
+    }
+
+
+def explain_statements(conn, statements: list) -> list:
+    """Replay the statements in order under EXPLAIN ANALYZE (which executes them, so later ones see the same state)"""
+    plans = []
+    with conn.cursor() as cur:
+        for statement in statements:
+            if not statement.lstrip().upper().startswith(EXPLAINABLE):
+                continue
+            cur.execute("SAVEPOINT bench_explain")
+            try:
+                cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement)
+                plans.append(summarize_plan(cur.fetchone()[0][0]))
+                cur.execute("RELEASE SAVEPOINT bench_explain")
+            except psycopg2.Error as e:
+                cur.execute("ROLLBACK TO SAVEPOINT bench_explain")
+                plans.append({"error": str(e).strip().splitlines()[0]})
+    return plans
+
+
+# ==================== RUN ====================
+
+def run_case(conn, db, fixtures, name, call, iterations):
+    timings = []
+    error = None
+    for _ in range(iterations):
+        conn.captured = []
+        start = time.perf_counter()
+        try:
+            call(db, fixtures)
+        except Exception as e:
+            error = f"{type(e).__name__}: {getattr(e, 'detail', e)}"
+        timings.append((time.perf_counter() - start) * 1000)
+        conn.rollback()
+        if error:
+            break
+
+    statements = list(conn.captured)
+    conn.captured = None
+    plans = explain_statements(conn, statements) if not error else []
+    conn.rollback()
+
+    timings.sort()
+    scans = {}
+    for plan in plans:
+        for relation, types in plan.get("scans", {}).items():
+            scans[relation] = sorted(set(scans.get(relation, [])) | set(types))
+
+    return {
+        "p50_ms": round(statistics.median(timings), 3),
+        "max_ms": round(timings[-1], 3),
+        "statements": len(statements),
+        "rows_scanned": sum(plan.get("rows_scanned", 0) for plan in plans),
+        "shared_hit_blocks": sum(plan.get("shared_hit_blocks", 0) for plan in plans),
+        "shared_read_blocks": sum(plan.get("shared_read_blocks", 0) for plan in plans),
+        "scans": scans,
+        "plans": plans,
+        "error": error,
+    }
+
+
+def find_scan_regressions(current: dict, baseline: dict) -> list:
+    """(method, table, before, after) where a table read through an index is now sequentially scanned"""
+    regressions = []
+    for name, result in current["methods"].items():
+        before = baseline["methods"].get(name)
+        if not before:
+            continue
+        for relation, types in result["scans"].items():
+            previous = before["scans"].get(relation)
+            if not previous:
+                continue
+            if "Seq Scan" in types and "Seq Scan" not in previous and any(t in INDEX_SCANS for t in previous):
+                regressions.append((name, relation, previous, types))
+    return regressions
+
+
+def run_scale(conn, label, iterations, only):
+    fixtures = Fixtures(conn)
+    db = Queries(conn)
+    methods = {}
+    cases = {name: call for name, call in CASES.items() if not only or name in only}
+
+    for name, call in cases.items():
+        result = run_case(conn, db, fixtures, name, call, iterations)
+        methods[name] = result
+        scans = ", ".join(f"{relation}: {'/'.join(types)}" for relation, types in sorted(result["scans"].items()))
+        status = f"[ERROR] {result['error']}" if result["error"] else scans
+        print(f"   - {name}: p50 {result['p50_ms']} ms, {result['statements']} stmt, "
+              f"{result['rows_scanned']:,} rows scanned, {result['shared_hit_blocks']} hit / "
+              f"{result['shared_read_blocks']} read | {status}")
+
+    public = {name for name, _ in inspect.getmembers(Queries, inspect.isfunction) if not name.startswith("_")}
+    uncovered = sorted(public - set(CASES) - set(SKIPPED))
+    return {"scale": label, "methods": methods, "uncovered": uncovered}
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmark the Queries methods")
+    parser.add_argument("--scales", nargs="+", choices=sorted(SCALE_ROWS), default=["1k"])
+    parser.add_argument("--seed", action="store_true", help="Truncate and reseed synthetic data for each scale")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--method", nargs="+", help="Only these methods")
+    parser.add_argument("--baseline", nargs="+", default=[], help="Earlier artifacts to check for scan regressions")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("QUERIES MICROBENCHMARKS")
+    print("=" * 60)
+
+    if args.seed and DB_CONFIG["host"] not in LOCAL_HOSTS:
+        print(f"\n[ERROR] Refusing to reseed {DB_CONFIG['host']}")
+        return 1
+
+    baselines = {}
+    for path in args.baseline:
+        with open(path, encoding="utf-8") as f:
+            artifact = json.load(f)
+        baselines[artifact["scale"]] = (path, artifact)
+
+    print(f"\nConnecting to database: {DB_CONFIG['dbname']}@{DB_CONFIG['host']}")
+    # DictCursor like the app's connections: some methods read columns by name
+    conn = psycopg2.connect(connection_factory=BenchConnection, cursor_factory=DictCursor, **DB_CONFIG)
+    commit = git_commit()
+    failed = False
+
+    try:
+        for label in args.scales:
+            if args.seed:
+                print(f"\nSeeding {label} ({SCALE_ROWS[label]:,} rows in the largest table)...")
+                conn.hold_commits = False
+                seed_synthetic_data.truncate(conn)
+                seed_synthetic_data.seed(conn, volumes_for(SCALE_ROWS[label]))
+                conn.hold_commits = True
+
+            print(f"\nScale {label}:")
+            result = run_scale(conn, label, args.iterations, set(args.method or []))
+            result["meta"] = {
+                "commit": commit,
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "iterations": args.iterations,
+            }
+            if result["uncovered"]:
+                print(f"\n   Not covered: {', '.join(result['uncovered'])}")
+
+            os.makedirs(RESULTS_DIR, exist_ok=True)
+            output = os.path.join(RESULTS_DIR, f"queries-{label}-{commit or 'nocommit'}.json")
+            with open(output, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2, default=str)
+            print(f"\n[OK] Results written to {output}")
+
+            if label in baselines:
+                path, baseline = baselines[label]
+                regressions = find_scan_regressions(result, baseline)
+                for name, relation, before, after in regressions:
+                    print(f"   [REGRESSION] {name}: {relation} {'/'.join(before)} -> {'/'.join(after)}")
+                if regressions:
+                    failed = True
+                else:
+                    print(f"   No index-to-seq-scan regressions against {path}")
+    except Exception as e:
+        conn.rollback()
+        print(f"\n[ERROR] {e}")
+        return 1
+    finally:
+        conn.close()
+
+    print("\n" + "=" * 60)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    exit(main())
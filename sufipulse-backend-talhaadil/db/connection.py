@@ -1,13 +1,15 @@
 import os
+import logging
 from dotenv import load_dotenv
 import psycopg2
 from psycopg2.extras import DictCursor
 from contextlib import contextmanager
+from utils.instrumentation import InstrumentedConnection
 
 # Load environment variables from .env file
 load_dotenv()
 
-print("DATABASE_URL:", os.getenv("DATABASE_URL"))
+logger = logging.getLogger(__name__)
 
 class DBConnection:
     """
@@ -20,15 +22,15 @@ class DBConnection:
         """Returns a new database connection for each request to avoid sharing issues."""
         try:
             database_url = os.getenv("DATABASE_URL")
-            print("Attempting to connect with DATABASE_URL:", database_url)
             conn = psycopg2.connect(
                 database_url,
-                cursor_factory=DictCursor
+                cursor_factory=DictCursor,
+                connection_factory=InstrumentedConnection
             )
-            print("Database connected.")
+            logger.debug("Database connected")
             return conn
         except psycopg2.Error as e:
-            print("Error connecting to database:", e)
+            logger.error("Error connecting to database: %s", e)
             raise e
 
     @classmethod
@@ -0,0 +1,204 @@
+"""
+Guest view sketches: accuracy/memory benchmark and legacy fold-in
+Guest views are counted with HyperLogLog sketches (utils/hyperloglog.py) instead
+of one blog_views row per (blog, ip).
+
+    benchmark  Compares the sketch against exact counting. It uses synthetic
+               traffic and, when the database has legacy guest rows, the real
+               per-blog IP sets. It reports the estimate error and the bytes
+               stored per blog for each approach.
+    fold       Folds the legacy guest rows (user_id IS NULL) into the day and
+               all-time sketches, deletes them, and refreshes view_count.
+
+Run this from the sufipulse-backend-talhaadil directory (uses DATABASE_URL):
+    python guest_view_sketches.py benchmark [--no-db]
+    python guest_view_sketches.py fold [--dry-run]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+from collections import defaultdict
+
+import psycopg2
+from dotenv import load_dotenv
+
+from migrate import connect
+from utils.hyperloglog import REGISTERS, HyperLogLog
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+load_dotenv()
+
+# Distinct guests per blog to simulate; each is seen VIEWS_PER_GUEST times on average
+SYNTHETIC_CARDINALITIES = [10, 100, 1_000, 10_000, 100_000]
+VIEWS_PER_GUEST = 3
+TRIALS = 5
+# blog_views row + its four indexes, used when the database cannot be measured
+ESTIMATED_ROW_BYTES = 200
+
+
+def random_ip(rng):
+    return f"{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+
+
+def measured_row_bytes(conn):
+    """On-disk bytes per blog_views row, indexes included"""
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_total_relation_size('blog_views'), (SELECT COUNT(*) FROM blog_views)")
+        total_bytes, rows = cur.fetchone()
+    return total_bytes / rows if rows else None
+
+
+def benchmark_synthetic(row_bytes):
+    print("\nSynthetic traffic (error over %d trials)" % TRIALS)
+    print(f"   {'distinct':>10} {'mean err':>9} {'max err':>8} {'exact bytes':>13} {'sketch bytes':>13}")
+    rng = random.Random(42)
+    for distinct in SYNTHETIC_CARDINALITIES:
+        errors = []
+        for _ in range(TRIALS):
+            guests = {random_ip(rng) for _ in range(distinct)}
+            sketch = HyperLogLog()
+            for ip in guests:
+                for _ in range(rng.randint(1, 2 * VIEWS_PER_GUEST - 1)):
+                    sketch.add(ip)
+            errors.append(abs(sketch.estimate() - len(guests)) / len(guests) * 100)
+        print(f"   {distinct:>10,} {statistics.mean(errors):>8.2f}% {max(errors):>7.2f}% "
+              f"{int(distinct * row_bytes):>13,} {REGISTERS:>13,}")
+
+
+def benchmark_legacy(conn, row_bytes):
+    with conn.cursor(name="legacy_guests") as cur:
+        cur.itersize = 50_000
+        cur.execute("SELECT blog_id, ip_address FROM blog_views WHERE user_id IS NULL")
+        exact = defaultdict(set)
+        for blog_id, ip in cur:
+            exact[blog_id].add(ip or "unknown")
+
+    if not exact:
+        print("\nNo legacy guest rows in blog_views; skipping the real-data comparison")
+        return
+
+    errors = []
+    for ips in exact.values():
+        sketch = HyperLogLog()
+        for ip in ips:
+            sketch.add(ip)
+        errors.append(abs(sketch.estimate() - len(ips)) / len(ips) * 100)
+
+    rows = sum(len(ips) for ips in exact.values())
+    print(f"\nLegacy guest rows: {rows:,} over {len(exact):,} blogs")
+    print(f"   - estimate error per blog: mean {statistics.mean(errors):.2f}%, "
+          f"p95 {sorted(errors)[int(len(errors) * 0.95)]:.2f}%, max {max(errors):.2f}%")
+    print(f"   - exact rows: {int(rows * row_bytes):,} bytes; all-time sketches: {len(exact) * REGISTERS:,} bytes")
+
+
+def merge_and_store(cur, select_sql, upsert_sql, key, sketch):
+    """Merge with what live traffic already recorded, then write the sketch and its estimate"""
+    cur.execute(select_sql, key)
+    existing = cur.fetchone()
+    if existing:
+        sketch.merge(HyperLogLog(bytes(existing[0])))
+    cur.execute(upsert_sql, key + (psycopg2.Binary(sketch.to_bytes()), sketch.estimate()))
+
+
+def fold(conn, dry_run):
+    days = defaultdict(HyperLogLog)
+    totals = defaultdict(HyperLogLog)
+    rows = 0
+    with conn.cursor(name="legacy_guests") as cur:
+        cur.itersize = 50_000
+        cur.execute("""
+            SELECT blog_id, COALESCE(viewed_at::date, CURRENT_DATE), COALESCE(ip_address, 'unknown')
+            FROM blog_views WHERE user_id IS NULL
+        """)
+        for blog_id, day, ip in cur:
+            days[(blog_id, day)].add(ip)
+            totals[blog_id].add(ip)
+            rows += 1
+
+    print(f"\n   - {rows:,} guest rows -> {len(days):,} day sketches, {len(totals):,} blog sketches")
+    if dry_run or not rows:
+        return
+
+    with conn.cursor() as cur:
+        for key, sketch in days.items():
+            merge_and_store(
+                cur,
+                "SELECT registers FROM blog_guest_view_sketches WHERE blog_id = %s AND day = %s FOR UPDATE",
+                """
+                INSERT INTO blog_guest_view_sketches (blog_id, day, registers, estimate)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (blog_id, day) DO UPDATE
+                    SET registers = EXCLUDED.registers, estimate = EXCLUDED.estimate
+                """,
+                key, sketch)
+
+        for blog_id, sketch in totals.items():
+            merge_and_store(
+                cur,
+                "SELECT registers FROM blog_guest_view_totals WHERE blog_id = %s FOR UPDATE",
+                """
+                INSERT INTO blog_guest_view_totals (blog_id, registers, estimate)
+                VALUES (%s, %s, %s)
+                ON CONFLICT (blog_id) DO UPDATE SET registers = EXCLUDED.registers, estimate = EXCLUDED.estimate
+                """,
+                (blog_id,), sketch)
+
+        cur.execute("DELETE FROM blog_views WHERE user_id IS NULL")
+        cur.execute("""
+            UPDATE blog_submissions bs
+            SET view_count = (SELECT COUNT(*) FROM blog_views v WHERE v.blog_id = bs.id) + t.estimate
+            FROM blog_guest_view_totals t
+            WHERE t.blog_id = bs.id
+        """)
+    conn.commit()
+    print(f"   [OK] Folded and deleted {rows:,} guest rows")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Guest view sketch benchmark and legacy fold-in")
+    parser.add_argument("command", choices=["benchmark", "fold"])
+    parser.add_argument("--no-db", action="store_true", help="Synthetic benchmark only")
+    parser.add_argument("--dry-run", action="store_true", help="Report what fold would do")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("GUEST VIEW SKETCHES")
+    print("=" * 60)
+
+    if args.command == "benchmark" and args.no_db:
+        benchmark_synthetic(ESTIMATED_ROW_BYTES)
+        print("\n" + "=" * 60)
+        return 0
+
+    try:
+        conn = connect()
+    except psycopg2.Error as e:
+        print(f"\n[ERROR] Could not connect: {e}")
+        return 1
+
+    try:
+        if args.command == "benchmark":
+            row_bytes = measured_row_bytes(conn) or ESTIMATED_ROW_BYTES
+            print(f"\nExact approach: {row_bytes:.0f} bytes per blog_views row (indexes included)")
+            benchmark_synthetic(row_bytes)
+            benchmark_legacy(conn, row_bytes)
+        else:
+            fold(conn, args.dry_run)
+    except Exception as e:
+        conn.rollback()
+        print(f"\n[ERROR] {e}")
+        return 1
+    finally:
+        conn.close()
+
+    print("\n" + "=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
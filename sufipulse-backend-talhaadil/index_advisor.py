@@ -0,0 +1,344 @@
+"""
+Recommend missing indexes from the observed workload
+Collects the heaviest statements from pg_stat_statements and the app's own slow
+query log (slow_query_plans), explains each one as a generic plan, and derives
+candidate indexes from the sequential scans it finds (filter, join and sort
+columns). Each candidate is then tried as a hypothetical index (HypoPG) and
+ranked by the planner cost it removes across the workload, weighted by calls.
+Candidates already covered by an existing index are skipped.
+
+Requires PostgreSQL 16+ (EXPLAIN GENERIC_PLAN). pg_stat_statements and hypopg are
+used when installed; without hypopg candidates are ranked by seq-scan weight only.
+
+Run this from the sufipulse-backend-talhaadil directory (uses DATABASE_URL):
+    python index_advisor.py [--top 50] [--min-savings 5]
+    python index_advisor.py --write        # also writes migrations/NNNN_advisor_indexes.*.sql
+"""
+
+import argparse
+import os
+import re
+import sys
+from collections import defaultdict
+
+import psycopg2
+from dotenv import load_dotenv
+
+from migrate import MIGRATIONS_DIR, connect, load_migrations
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+load_dotenv()
+
+# Tables whose scans are not worth indexing (tiny or maintenance-only)
+IGNORED_TABLES = {"schema_migrations", "slow_query_plans", "recording_resources", "cms_pages"}
+SEQ_SCANS = ("Seq Scan", "Parallel Seq Scan")
+JOIN_CONDITIONS = ("Hash Cond", "Merge Cond", "Join Filter")
+EQUALITY = re.compile(r"^\)?(?:::[\w ]+)?\)?\s*(=|IS NULL|= ANY)")
+RANGE = re.compile(r"^\)?(?:::[\w ]+)?\)?\s*(<=|>=|<|>)")
+
+
+# ==================== WORKLOAD ====================
+
+def collect_workload(conn, top: int) -> list:
+    """[(sql with $n placeholders, calls, mean_ms, source)] heaviest first"""
+    workload = []
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'")
+        if cur.fetchone():
+            cur.execute("""
+                SELECT query, calls, mean_exec_time
+                FROM pg_stat_statements
+                WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+                  AND query ~* '^\\s*(select|with|update|delete)'
+                  AND query !~* '(pg_catalog|pg_stat|information_schema|schema_migrations)'
+                ORDER BY total_exec_time DESC
+                LIMIT %s
+            """, (top,))
+            workload += [(query, calls, mean_ms, "pg_stat_statements") for query, calls, mean_ms in cur.fetchall()]
+        else:
+            print("   - pg_stat_statements is not installed; using the slow query log only")
+
+        cur.execute("SELECT to_regclass('slow_query_plans')")
+        if cur.fetchone()[0]:
+            cur.execute("""
+                SELECT MIN(normalized_sql), COUNT(*), AVG(duration_ms)
+                FROM slow_query_plans
+                GROUP BY query_hash
+                ORDER BY COUNT(*) * AVG(duration_ms) DESC
+                LIMIT %s
+            """, (top,))
+            for sql, captures, mean_ms in cur.fetchall():
+                workload.append((to_positional(sql), captures, float(mean_ms), "slow_query_plans"))
+    return workload
+
+
+def to_positional(sql: str) -> str:
+    """
+    psycopg2 placeholders -> $1, $2... so EXPLAIN GENERIC_PLAN accepts them.
+    Each %s gets the next number; a named %(name)s keeps one number for every use.
+    """
+    numbers = {}
+
+    def replace(match):
+        if match.group(0) == "%%":
+            return "%"
+        key = match.group(1) if match.group(1) is not None else len(numbers)
+        if key not in numbers:
+            numbers[key] = len(numbers) + 1
+        return f"${numbers[key]}"
+
+    return re.sub(r"%%|%\((\w+)\)s|%s", replace, sql)
+
+
+def explain(cur, sql: str):
+    """Generic plan (JSON) of a parameterized statement, or None if it cannot be planned"""
+    cur.execute("SAVEPOINT advisor")
+    try:
+        cur.execute("EXPLAIN (GENERIC_PLAN, FORMAT JSON) " + sql)
+        plan = cur.fetchone()[0][0]["Plan"]
+        cur.execute("RELEASE SAVEPOINT advisor")
+        return plan
+    except psycopg2.Error:
+        cur.execute("ROLLBACK TO SAVEPOINT advisor")
+        return None
+
+
+# ==================== CANDIDATES ====================
+
+def table_columns(cur) -> dict:
+    cur.execute("""
+        SELECT table_name, array_agg(column_name::text)
+        FROM information_schema.columns
+        WHERE table_schema = 'public'
+        GROUP BY table_name
+    """)
+    return dict(cur.fetchall())
+
+
+def existing_indexes(cur) -> dict:
+    """table -> list of column tuples of its valid btree indexes"""
+    cur.execute("""
+        SELECT t.relname, array_agg(a.attname::text ORDER BY k.ord)
+        FROM pg_index i
+        JOIN pg_class t ON t.oid = i.indrelid
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_am am ON am.oid = c.relam AND am.amname = 'btree'
+        JOIN LATERAL unnest(i.indkey) WITH ORDINALITY AS k(attnum, ord) ON TRUE
+        JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum
+        WHERE i.indisvalid AND t.relnamespace = 'public'::regnamespace
+        GROUP BY t.relname, i.indexrelid
+    """)
+    indexes = defaultdict(list)
+    for table, columns in cur.fetchall():
+        indexes[table].append(tuple(columns))
+    return indexes
+
+
+def columns_in(text: str, alias: str, columns: list) -> list:
+    """(column, kind) for this relation's columns in a condition; kind is eq, range or other"""
+    found = []
+    for column in columns:
+        for match in re.finditer(rf"(?:\b(\w+)\.)?\b{re.escape(column)}\b", text):
+            if match.group(1) and match.group(1) != alias:
+                continue
+            rest = text[match.end():]
+            kind = "eq" if EQUALITY.match(rest) else "range" if RANGE.match(rest) else "other"
+            found.append((column, kind))
+            break
+    return found
+
+
+def scan_candidates(plan: dict, columns_by_table: dict) -> list:
+    """[(table, columns tuple)] for every sequential scan in the plan"""
+    candidates = []
+
+    def walk(node, ancestors):
+        table = node.get("Relation Name")
+        if node["Node Type"] in SEQ_SCANS and table in columns_by_table and table not in IGNORED_TABLES:
+            alias = node.get("Alias", table)
+            columns = columns_by_table[table]
+            eq, ranged, sort = [], [], []
+            for column, kind in columns_in(node.get("Filter", ""), alias, columns):
+                (eq if kind == "eq" else ranged).append(column)
+            for parent in ancestors:
+                for key in JOIN_CONDITIONS:
+                    for column, _ in columns_in(parent.get(key, ""), alias, columns):
+                        if column not in eq:
+                            eq.append(column)
+                for sort_key in parent.get("Sort Key", []):
+                    for column, _ in columns_in(sort_key, alias, columns):
+                        sort.append(column)
+            if eq or ranged or sort:
+                tail = [c for c in ranged[:1] + sort[:1] if c not in eq]
+                candidates.append((table, tuple(eq[:3] + tail[:1])))
+                for column in eq[:3]:
+                    candidates.append((table, (column,)))
+        for child in node.get("Plans", []):
+            walk(child, [node] + ancestors[:2])
+
+    walk(plan, [])
+    return candidates
+
+
+def is_covered(columns: tuple, indexes: list) -> bool:
+    return any(index[:len(columns)] == columns for index in indexes)
+
+
+# ==================== HYPOTHETICAL INDEXES ====================
+
+def has_hypopg(cur) -> bool:
+    cur.execute("SAVEPOINT advisor")
+    try:
+        cur.execute("CREATE EXTENSION IF NOT EXISTS hypopg")
+        cur.execute("RELEASE SAVEPOINT advisor")
+        return True
+    except psycopg2.Error:
+        cur.execute("ROLLBACK TO SAVEPOINT advisor")
+        return False
+
+
+def evaluate(cur, table, columns, statements) -> tuple:
+    """(cost removed weighted by calls, estimated ms saved, statements improved) with one hypothetical index"""
+    cur.execute("SELECT indexrelid FROM hypopg_create_index(%s)",
+                (f"CREATE INDEX ON {table} ({', '.join(columns)})",))
+    saved_cost = 0.0
+    saved_ms = 0.0
+    improved = 0
+    try:
+        for sql, calls, mean_ms, baseline_cost in statements:
+            plan = explain(cur, sql)
+            if not plan or baseline_cost <= 0:
+                continue
+            gain = baseline_cost - plan["Total Cost"]
+            if gain > 0:
+                saved_cost += gain * calls
+                saved_ms += mean_ms * calls * gain / baseline_cost
+                improved += 1
+    finally:
+        cur.execute("SELECT hypopg_reset()")
+    return saved_cost, saved_ms, improved
+
+
+def index_name(table, columns):
+    return f"idx_{table}_{'_'.join(columns)}"[:63]
+
+
+def write_migration(recommendations):
+    migrations = load_migrations()
+    version = f"{int(migrations[-1].version) + 1:04d}" if migrations else "0001"
+    base = os.path.join(MIGRATIONS_DIR, f"{version}_advisor_indexes")
+    with open(base + ".up.sql", "w", encoding="utf-8") as f:
+        f.write("-- migrate: no-transaction\n")
+        f.write("-- Generated by index_advisor.py; review before applying\n\n")
+        for rec in recommendations:
+            f.write(f"-- {rec['improved']} statement(s), est. {rec['saved_ms']:.0f} ms saved per stats window\n")
+            f.write(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name(rec['table'], rec['columns'])} "
+                    f"ON {rec['table']}({', '.join(rec['columns'])});\n\n")
+    with open(base + ".down.sql", "w", encoding="utf-8") as f:
+        f.write("-- migrate: no-transaction\n")
+        for rec in recommendations:
+            f.write(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name(rec['table'], rec['columns'])};\n")
+    return base
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recommend indexes from the observed workload")
+    parser.add_argument("--top", type=int, default=50, help="Statements taken from each source")
+    parser.add_argument("--min-savings", type=float, default=5, help="Minimum percent of workload cost removed")
+    parser.add_argument("--limit", type=int, default=10, help="Recommendations to report")
+    parser.add_argument("--write", action="store_true", help="Write the recommendations as a migration")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("INDEX ADVISOR")
+    print("=" * 60)
+
+    try:
+        conn = connect()
+    except psycopg2.Error as e:
+        print(f"\n[ERROR] Could not connect: {e}")
+        return 1
+
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SHOW server_version_num")
+            if int(cur.fetchone()[0]) < 160000:
+                print("\n[ERROR] PostgreSQL 16+ is required for EXPLAIN (GENERIC_PLAN)")
+                return 1
+
+            print("\nCollecting workload...")
+            workload = collect_workload(conn, args.top)
+            columns_by_table = table_columns(cur)
+            indexes = existing_indexes(cur)
+
+            statements = []
+            candidates = defaultdict(float)
+            unplanned = defaultdict(int)
+            for sql, calls, mean_ms, source in workload:
+                plan = explain(cur, sql)
+                if not plan:
+                    unplanned[source] += 1
+                    continue
+                statements.append((sql, calls, mean_ms, plan["Total Cost"]))
+                for table, columns in scan_candidates(plan, columns_by_table):
+                    if not is_covered(columns, indexes[table]):
+                        candidates[(table, columns)] += plan["Total Cost"] * calls
+            print(f"   - {len(statements)} statements planned, {len(candidates)} candidate indexes")
+            for source, count in sorted(unplanned.items()):
+                print(f"   [WARN] {count} statements from {source} could not be planned and were left out")
+
+            if not candidates:
+                print("\n[OK] No sequential scans worth indexing")
+                return 0
+
+            total_cost = sum(cost * calls for _, calls, _, cost in statements) or 1
+            recommendations = []
+            if has_hypopg(cur):
+                print("\nTrying candidates as hypothetical indexes...")
+                for (table, columns), _ in sorted(candidates.items(), key=lambda item: -item[1]):
+                    saved_cost, saved_ms, improved = evaluate(cur, table, columns, statements)
+                    percent = saved_cost / total_cost * 100
+                    if percent >= args.min_savings:
+                        recommendations.append({"table": table, "columns": columns, "percent": percent,
+                                                "saved_ms": saved_ms, "improved": improved})
+                recommendations.sort(key=lambda rec: -rec["percent"])
+            else:
+                print("\n[WARN] hypopg is not available; ranking by sequential scan weight without estimates")
+                for (table, columns), weight in sorted(candidates.items(), key=lambda item: -item[1]):
+                    recommendations.append({"table": table, "columns": columns, "percent": weight / total_cost * 100,
+                                            "saved_ms": 0.0, "improved": 0})
+
+            # Keep the widest useful index per table when one is a prefix of another
+            kept = []
+            for rec in recommendations:
+                if not any(other["table"] == rec["table"] and other["columns"][:len(rec["columns"])] == rec["columns"]
+                           for other in kept):
+                    kept.append(rec)
+            recommendations = kept[:args.limit]
+        conn.rollback()
+
+        print("\nRecommendations:")
+        for rank, rec in enumerate(recommendations, 1):
+            print(f"   {rank}. {rec['table']}({', '.join(rec['columns'])}): "
+                  f"{rec['percent']:.1f}% of workload cost, {rec['improved']} statements, "
+                  f"~{rec['saved_ms']:.0f} ms saved")
+
+        if args.write and recommendations:
+            base = write_migration(recommendations)
+            print(f"\n[OK] Wrote {base}.up.sql / .down.sql")
+    except Exception as e:
+        conn.rollback()
+        print(f"\n[ERROR] {e}")
+        return 1
+    finally:
+        conn.close()
+
+    print("\n" + "=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
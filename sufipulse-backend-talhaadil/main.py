@@ -1,12 +1,18 @@
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from api import auth_router,user_router,admin_router,vocalist_router,kalam_router,studio_router,notification_router,public_router,writer_router,blogger_router,youtube_router,recording_requests_router,cms_router
+from api import auth_router,user_router,admin_router,vocalist_router,kalam_router,studio_router,notification_router,public_router,writer_router,blogger_router,youtube_router,recording_requests_router,cms_router,media_router,metrics_router
 from db.connection import DBConnection
+from utils.auth_challenges import start_purger, stop_purger
+from utils.blog_rankings import start_refresher, stop_refresher
+from utils.engagement_partitions import start_maintenance, stop_maintenance
+from utils.instrumentation import TimingMiddleware
+from utils.logging_config import RequestIdMiddleware, configure_logging
+from utils.rate_limit import RateLimitMiddleware
 import os
 import logging
 
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 app = FastAPI(title="My App")
@@ -24,6 +30,23 @@ async def startup_db_client():
     except Exception as e:
         logger.error(f"❌ Database connection failed: {e}")
 
+    # Trending/popular blog scores (blog_rankings)
+    start_refresher()
+    # Monthly blog_views/blog_shares partitions, rollups and retention
+    start_maintenance()
+    # Expired and consumed one-time codes
+    start_purger()
+
+@app.on_event("shutdown")
+async def shutdown_background_jobs():
+    stop_refresher()
+    stop_maintenance()
+    stop_purger()
+
+# Throttling of auth and public write endpoints (utils/rate_limit.py). Added before
+# CORS so it runs inside it and 429 responses still carry the CORS headers
+app.add_middleware(RateLimitMiddleware)
+
 # CORS middleware - MUST BE ADDED FIRST before any other middleware/routers
 app.add_middleware(
     CORSMiddleware,
@@ -42,9 +65,18 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# Per-route wall/DB timing and Server-Timing header (outermost, so it covers CORS too)
+app.add_middleware(TimingMiddleware)
+
+# X-Request-ID correlation for every log line written while serving the request
+app.add_middleware(RequestIdMiddleware)
+
 # Create uploads directory if it doesn't exist
 os.makedirs("uploads/blog-images", exist_ok=True)
 
+# Recording reference audio gets range/caching support; must be registered before the mount
+app.include_router(media_router)
+
 # Mount static files for uploaded images
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
@@ -61,3 +93,4 @@ app.include_router(blogger_router)
 app.include_router(youtube_router)
 app.include_router(recording_requests_router)
 app.include_router(cms_router)
+app.include_router(metrics_router)
@@ -0,0 +1,349 @@
+"""
+Versioned schema migrations
+Applies migrations/NNNN_name.up.sql in order and records each one in
+schema_migrations (version, name, checksum, applied_at, duration). Rolls back with
+the matching .down.sql. The base schema (schema.sql and the sql/*_schema.sql files)
+must already be in place; every schema change after it ships as a migration.
+
+A migration runs in a single transaction together with its schema_migrations
+row, unless its first line is "-- migrate: no-transaction". In that case its
+statements run one by one in autocommit, which CREATE/DROP INDEX CONCURRENTLY
+requires. Such migrations must be idempotent (IF [NOT] EXISTS), because a failed
+run is simply re-run. Invalid indexes left by an interrupted CONCURRENTLY
+build are dropped before they are rebuilt.
+
+A session advisory lock keeps two deploys from migrating at once, and
+lock_timeout stops DDL from queueing behind long transactions and stalling traffic.
+
+Run this from the sufipulse-backend-talhaadil directory (uses DATABASE_URL):
+    python migrate.py status
+    python migrate.py up [--target 0006] [--dry-run]
+    python migrate.py down [--steps 1] [--dry-run]
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+import time
+
+import psycopg2
+from dotenv import load_dotenv
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+load_dotenv()
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+MIGRATION_FILE = re.compile(r"^(\d{4})_(\w+)\.(up|down)\.sql$")
+NO_TRANSACTION = "-- migrate: no-transaction"
+
+# Arbitrary constant shared by every runner (pg_try_advisory_lock key)
+ADVISORY_LOCK_ID = 720390001
+
+CONCURRENT_INDEX = re.compile(
+    r"CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", re.IGNORECASE)
+
+SCHEMA_MIGRATIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version VARCHAR(4) PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        checksum CHAR(64) NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        duration_ms INT
+    );
+"""
+
+
+class Migration:
+    def __init__(self, version, name):
+        self.version = version
+        self.name = name
+        self.up_path = None
+        self.down_path = None
+
+    @property
+    def label(self):
+        return f"{self.version}_{self.name}"
+
+    def read(self, direction):
+        path = self.up_path if direction == "up" else self.down_path
+        if not path:
+            raise FileNotFoundError(f"{self.label} has no .{direction}.sql")
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def checksum(self):
+        return hashlib.sha256(self.read("up").encode("utf-8")).hexdigest()
+
+
+def load_migrations() -> list:
+    migrations = {}
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = MIGRATION_FILE.match(filename)
+        if not match:
+            continue
+        version, name, direction = match.groups()
+        migration = migrations.setdefault(version, Migration(version, name))
+        if migration.name != name:
+            raise ValueError(f"Version {version} is used by both {migration.name} and {name}")
+        setattr(migration, f"{direction}_path", os.path.join(MIGRATIONS_DIR, filename))
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def split_statements(sql: str) -> list:
+    """Split a script on top-level semicolons, respecting quotes, comments and $$ bodies"""
+    statements = []
+    current = []
+    i = 0
+    quote = None
+    while i < len(sql):
+        char = sql[i]
+        if quote:
+            current.append(char)
+            if sql.startswith(quote, i):
+                current.append(sql[i + 1:i + len(quote)])
+                i += len(quote)
+                quote = None
+                continue
+        elif sql.startswith("--", i):
+            end = sql.find("\n", i)
+            i = len(sql) if end == -1 else end
+            continue
+        elif char in ("'", '"'):
+            quote = char
+            current.append(char)
+        elif char == "$":
+            tag = re.match(r"\$\w*\$", sql[i:])
+            if tag:
+                quote = tag.group(0)
+                current.append(quote)
+                i += len(quote)
+                continue
+            current.append(char)
+        elif char == ";":
+            statement = "".join(current).strip()
+            if statement:
+                statements.append(statement)
+            current = []
+        else:
+            current.append(char)
+        i += 1
+    statement = "".join(current).strip()
+    if statement:
+        statements.append(statement)
+    return statements
+
+
+def is_no_transaction(sql: str) -> bool:
+    return sql.lstrip().startswith(NO_TRANSACTION)
+
+
+def connect():
+    database_url = os.getenv("DATABASE_URL")
+    if database_url:
+        return psycopg2.connect(database_url)
+    return psycopg2.connect(
+        dbname=os.getenv('DB_NAME', 'sufipulse'),
+        user=os.getenv('DB_USER', 'postgres'),
+        password=os.getenv('DB_PASSWORD', 'postgres'),
+        host=os.getenv('DB_HOST', 'localhost'),
+        port=os.getenv('DB_PORT', '5432'),
+    )
+
+
+def applied_versions(conn) -> dict:
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass('schema_migrations')")
+        if cur.fetchone()[0] is None:
+            return {}
+        cur.execute("SELECT version, checksum FROM schema_migrations ORDER BY version")
+        return dict(cur.fetchall())
+
+
+def drop_invalid_indexes(cur, statements):
+    """Drop leftovers of an interrupted CREATE INDEX CONCURRENTLY so IF NOT EXISTS rebuilds them"""
+    names = [match.group(1) for match in map(CONCURRENT_INDEX.search, statements) if match]
+    if not names:
+        return
+    cur.execute("""
+        SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE NOT i.indisvalid AND c.relname = ANY(%s)
+    """, (names,))
+    for (name,) in cur.fetchall():
+        print(f"     dropping invalid index {name} from an earlier failed build")
+        cur.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+def run_migration(conn, migration, direction, lock_timeout):
+    sql = migration.read(direction)
+    statements = split_statements(sql)
+    start = time.perf_counter()
+
+    if is_no_transaction(sql):
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute("SET lock_timeout = %s", (lock_timeout,))
+            if direction == "up":
+                drop_invalid_indexes(cur, statements)
+            for statement in statements:
+                cur.execute(statement)
+            duration_ms = int((time.perf_counter() - start) * 1000)
+            record_migration(cur, migration, direction, duration_ms)
+        conn.autocommit = False
+    else:
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SET LOCAL lock_timeout = %s", (lock_timeout,))
+                cur.execute(sql)
+                duration_ms = int((time.perf_counter() - start) * 1000)
+                record_migration(cur, migration, direction, duration_ms)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return duration_ms
+
+
+def record_migration(cur, migration, direction, duration_ms):
+    if direction == "up":
+        cur.execute(
+            """
+            INSERT INTO schema_migrations (version, name, checksum, duration_ms)
+            VALUES (%s, %s, %s, %s)
+            """,
+            (migration.version, migration.name, migration.checksum(), duration_ms),
+        )
+    else:
+        cur.execute("DELETE FROM schema_migrations WHERE version = %s", (migration.version,))
+
+
+def apply_pending(conn, lock_timeout="5s") -> list:
+    """
+    Apply every pending migration (used by scripts that build a fresh database).
+    Holds the same advisory lock as the CLI, so it never races a deploy.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_try_advisory_lock(%s)", (ADVISORY_LOCK_ID,))
+        if not cur.fetchone()[0]:
+            conn.rollback()
+            raise RuntimeError("Another migration run holds the lock")
+    try:
+        with conn.cursor() as cur:
+            cur.execute(SCHEMA_MIGRATIONS_TABLE)
+        conn.commit()
+        applied = applied_versions(conn)
+        conn.commit()
+        plan = [m for m in load_migrations() if m.version not in applied]
+        for migration in plan:
+            run_migration(conn, migration, "up", lock_timeout)
+        return plan
+    finally:
+        if not conn.autocommit:
+            conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_unlock(%s)", (ADVISORY_LOCK_ID,))
+        conn.commit()
+
+
+def print_plan(migration, direction):
+    sql = migration.read(direction)
+    mode = "no transaction" if is_no_transaction(sql) else "transaction"
+    print(f"\n   {direction.upper()} {migration.label} ({mode})")
+    for statement in split_statements(sql):
+        first_line = " ".join(statement.split())
+        print(f"     - {first_line[:110]}{'...' if len(first_line) > 110 else ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Versioned schema migrations")
+    parser.add_argument("command", choices=["status", "up", "down"])
+    parser.add_argument("--target", help="Apply up to and including this version")
+    parser.add_argument("--steps", type=int, default=1, help="Migrations to roll back with down")
+    parser.add_argument("--dry-run", action="store_true", help="Print the plan without executing it")
+    parser.add_argument("--lock-timeout", default="5s", help="Postgres lock_timeout for DDL")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("SCHEMA MIGRATIONS")
+    print("=" * 60)
+
+    migrations = load_migrations()
+    try:
+        conn = connect()
+    except psycopg2.Error as e:
+        print(f"\n[ERROR] Could not connect: {e}")
+        return 1
+
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_try_advisory_lock(%s)", (ADVISORY_LOCK_ID,))
+            if not cur.fetchone()[0]:
+                print("\n[ERROR] Another migration run holds the lock")
+                return 1
+        if not args.dry_run:
+            with conn.cursor() as cur:
+                cur.execute(SCHEMA_MIGRATIONS_TABLE)
+        conn.commit()
+
+        applied = applied_versions(conn)
+        conn.commit()
+
+        if args.command == "status":
+            print()
+            for migration in migrations:
+                checksum = applied.get(migration.version)
+                if checksum is None:
+                    state = "pending"
+                elif checksum != migration.checksum():
+                    state = "applied (file changed since!)"
+                else:
+                    state = "applied"
+                print(f"   {migration.label}: {state}")
+            unknown = sorted(set(applied) - {m.version for m in migrations})
+            for version in unknown:
+                print(f"   {version}: applied, but no migration file")
+            return 0
+
+        if args.command == "up":
+            for migration in migrations:
+                if migration.version in applied and applied[migration.version] != migration.checksum():
+                    print(f"\n[WARN] {migration.label} was edited after it was applied")
+            plan = [m for m in migrations if m.version not in applied
+                    and (args.target is None or m.version <= args.target)]
+        else:
+            plan = [m for m in reversed(migrations) if m.version in applied][:args.steps]
+
+        if not plan:
+            print("\n[OK] Nothing to do")
+            return 0
+
+        if args.dry_run:
+            print("\nPlan:")
+            for migration in plan:
+                print_plan(migration, args.command)
+            return 0
+
+        for migration in plan:
+            print(f"\n{args.command.upper()} {migration.label}...")
+            duration_ms = run_migration(conn, migration, args.command, args.lock_timeout)
+            print(f"   [OK] {duration_ms} ms")
+
+        print(f"\n[OK] {len(plan)} migration(s) {'applied' if args.command == 'up' else 'rolled back'}")
+    except Exception as e:
+        if not conn.autocommit:
+            conn.rollback()
+        print(f"\n[ERROR] {e}")
+        return 1
+    finally:
+        conn.close()
+
+    print("\n" + "=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
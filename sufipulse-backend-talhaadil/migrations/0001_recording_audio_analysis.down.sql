@@ -0,0 +1,11 @@
+ALTER TABLE studio_recording_requests
+DROP COLUMN IF EXISTS audio_duration_seconds,
+DROP COLUMN IF EXISTS audio_sample_rate,
+DROP COLUMN IF EXISTS audio_waveform,
+DROP COLUMN IF EXISTS audio_analyzed_at;
+
+ALTER TABLE remote_recording_requests_new
+DROP COLUMN IF EXISTS audio_duration_seconds,
+DROP COLUMN IF EXISTS audio_sample_rate,
+DROP COLUMN IF EXISTS audio_waveform,
+DROP COLUMN IF EXISTS audio_analyzed_at;
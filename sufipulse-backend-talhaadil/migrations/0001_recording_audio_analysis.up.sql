@@ -0,0 +1,22 @@
+-- ========================================
+-- RECORDING REFERENCE AUDIO ANALYSIS
+-- ========================================
+-- Precomputed metadata for uploaded reference/sample audio so admin
+-- listings can render a preview without downloading the file.
+-- audio_waveform holds one unsigned byte (0-255) per peak bucket.
+-- ========================================
+
+ALTER TABLE studio_recording_requests
+ADD COLUMN IF NOT EXISTS audio_duration_seconds REAL,
+ADD COLUMN IF NOT EXISTS audio_sample_rate INT,
+ADD COLUMN IF NOT EXISTS audio_waveform BYTEA,
+ADD COLUMN IF NOT EXISTS audio_analyzed_at TIMESTAMP;
+
+ALTER TABLE remote_recording_requests_new
+ADD COLUMN IF NOT EXISTS audio_duration_seconds REAL,
+ADD COLUMN IF NOT EXISTS audio_sample_rate INT,
+ADD COLUMN IF NOT EXISTS audio_waveform BYTEA,
+ADD COLUMN IF NOT EXISTS audio_analyzed_at TIMESTAMP;
+
+COMMENT ON COLUMN studio_recording_requests.audio_waveform IS 'Downsampled peak waveform of the reference upload, one byte per bucket';
+COMMENT ON COLUMN remote_recording_requests_new.audio_waveform IS 'Downsampled peak waveform of the sample upload, one byte per bucket';
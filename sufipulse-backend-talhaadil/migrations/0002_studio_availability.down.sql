@@ -0,0 +1,2 @@
+DROP TABLE IF EXISTS studio_slot_bookings;
+DROP TABLE IF EXISTS recording_resources;
@@ -0,0 +1,100 @@
+-- ========================================
+-- STUDIO SESSION AVAILABILITY
+-- ========================================
+-- Every scheduled studio session (studio recording or studio visit)
+-- reserves a lane on a resource for a time period. The exclusion constraint
+-- guarantees that two bookings never hold the same lane for overlapping
+-- periods, so capacity cannot be exceeded even under concurrent requests.
+-- ========================================
+
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+-- Bookable resources with their parallel capacity
+CREATE TABLE IF NOT EXISTS recording_resources (
+    id SERIAL PRIMARY KEY,
+    slug VARCHAR(50) NOT NULL UNIQUE,
+    name VARCHAR(255) NOT NULL,
+    capacity SMALLINT NOT NULL DEFAULT 1 CHECK (capacity > 0),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO recording_resources (slug, name, capacity)
+VALUES ('studio', 'SufiPulse Studio', 1)
+ON CONFLICT (slug) DO NOTHING;
+
+CREATE TABLE IF NOT EXISTS studio_slot_bookings (
+    id SERIAL PRIMARY KEY,
+    resource_id INT NOT NULL REFERENCES recording_resources(id) ON DELETE CASCADE,
+    lane SMALLINT NOT NULL DEFAULT 1 CHECK (lane > 0),
+    request_type VARCHAR(50) NOT NULL CHECK (request_type IN ('studio_recording', 'studio_visit')),
+    request_id INT NOT NULL,
+    session_date DATE NOT NULL,
+    time_block VARCHAR(50) NOT NULL,
+    period_start TIMESTAMP NOT NULL,
+    period_end TIMESTAMP NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    CHECK (period_end > period_start),
+    UNIQUE (request_type, request_id),
+    CONSTRAINT studio_slot_bookings_no_overlap EXCLUDE USING gist (
+        resource_id WITH =,
+        lane WITH =,
+        tsrange(period_start, period_end) WITH &&
+    )
+);
+
+-- Calendar range scans
+CREATE INDEX IF NOT EXISTS idx_studio_slot_bookings_date ON studio_slot_bookings(session_date, resource_id);
+
+-- Backfill existing requests the way the app books them (utils/availability.py):
+-- a time matches a block when it starts with the block name, as the form labels
+-- do ("Morning (9:00 AM - 12:00 PM)"); a known duration books that many hours
+-- from the block start, anything else the block itself, capped at 21:00.
+-- Conflicting duplicates are skipped.
+INSERT INTO studio_slot_bookings (resource_id, lane, request_type, request_id, session_date, time_block, period_start, period_end)
+SELECT
+    r.id,
+    1,
+    'studio_recording',
+    s.id,
+    s.preferred_session_date,
+    b.time_block,
+    s.preferred_session_date + b.block_start,
+    LEAST(
+        s.preferred_session_date + b.block_start + COALESCE(
+            make_interval(hours => CASE s.estimated_studio_duration
+                WHEN '1 Hour' THEN 1
+                WHEN '2 Hours' THEN 2
+                WHEN 'Half Day' THEN 4
+                WHEN 'Full Day' THEN 8
+            END),
+            b.block_end - b.block_start
+        ),
+        s.preferred_session_date + TIME '21:00'
+    )
+FROM studio_recording_requests s
+JOIN recording_resources r ON r.slug = 'studio'
+JOIN (VALUES ('Morning', TIME '09:00', TIME '13:00'), ('Afternoon', TIME '13:00', TIME '17:00'), ('Evening', TIME '17:00', TIME '21:00'))
+    AS b(time_block, block_start, block_end) ON s.preferred_time_block ~* ('^\s*' || b.time_block || '\M')
+WHERE s.status <> 'rejected'
+ON CONFLICT DO NOTHING;
+
+-- Studio visits book their whole block ("Flexible" matches no block and books nothing)
+INSERT INTO studio_slot_bookings (resource_id, lane, request_type, request_id, session_date, time_block, period_start, period_end)
+SELECT
+    r.id,
+    1,
+    'studio_visit',
+    v.id,
+    v.preferred_date,
+    b.time_block,
+    v.preferred_date + b.block_start,
+    v.preferred_date + b.block_end
+FROM studio_visit_requests v
+JOIN recording_resources r ON r.slug = 'studio'
+JOIN (VALUES ('Morning', TIME '09:00', TIME '13:00'), ('Afternoon', TIME '13:00', TIME '17:00'), ('Evening', TIME '17:00', TIME '21:00'))
+    AS b(time_block, block_start, block_end) ON v.preferred_time ~* ('^\s*' || b.time_block || '\M')
+WHERE v.preferred_date IS NOT NULL AND v.status <> 'rejected'
+ON CONFLICT DO NOTHING;
+
+COMMENT ON TABLE recording_resources IS 'Bookable recording resources and how many sessions each can run in parallel';
+COMMENT ON TABLE studio_slot_bookings IS 'Reserved session periods; the exclusion constraint prevents double-booking a lane';
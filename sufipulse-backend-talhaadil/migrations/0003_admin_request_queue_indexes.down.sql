@@ -0,0 +1,22 @@
+-- migrate: no-transaction
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_studio_recording_created_at ON studio_recording_requests(created_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_remote_recording_new_created_at ON remote_recording_requests_new(created_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_studio_visit_created_at ON studio_visit_requests(created_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_remote_recording_created_at ON remote_recording_requests(created_at);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_studio_recording_queue;
+DROP INDEX CONCURRENTLY IF EXISTS idx_studio_recording_queue_status;
+DROP INDEX CONCURRENTLY IF EXISTS idx_studio_recording_queue_vocalist;
+DROP INDEX CONCURRENTLY IF EXISTS idx_studio_recording_queue_kalam;
+DROP INDEX CONCURRENTLY IF EXISTS idx_remote_recording_new_queue;
+DROP INDEX CONCURRENTLY IF EXISTS idx_remote_recording_new_queue_status;
+DROP INDEX CONCURRENTLY IF EXISTS idx_remote_recording_new_queue_vocalist;
+DROP INDEX CONCURRENTLY IF EXISTS idx_remote_recording_new_queue_kalam;
+DROP INDEX CONCURRENTLY IF EXISTS idx_studio_visit_queue;
+DROP INDEX CONCURRENTLY IF EXISTS idx_studio_visit_queue_status;
+DROP INDEX CONCURRENTLY IF EXISTS idx_studio_visit_queue_vocalist;
+DROP INDEX CONCURRENTLY IF EXISTS idx_studio_visit_queue_kalam;
+DROP INDEX CONCURRENTLY IF EXISTS idx_remote_recording_queue;
+DROP INDEX CONCURRENTLY IF EXISTS idx_remote_recording_queue_status;
+DROP INDEX CONCURRENTLY IF EXISTS idx_remote_recording_queue_vocalist;
+DROP INDEX CONCURRENTLY IF EXISTS idx_remote_recording_queue_kalam;
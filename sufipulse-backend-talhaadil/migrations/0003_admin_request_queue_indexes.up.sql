@@ -0,0 +1,38 @@
+-- migrate: no-transaction
+-- ========================================
+-- ADMIN REQUEST QUEUE INDEXES
+-- ========================================
+-- Back the unified admin queue (/recording-requests/admin/queue).
+-- Each queue branch reads newest-first with an optional status, vocalist or
+-- kalam filter, so every request table gets matching (filter, created_at, id)
+-- composites. They supersede the single-column created_at indexes.
+-- ========================================
+
+-- Studio recording requests
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_studio_recording_queue ON studio_recording_requests(created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_studio_recording_queue_status ON studio_recording_requests(status, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_studio_recording_queue_vocalist ON studio_recording_requests(vocalist_id, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_studio_recording_queue_kalam ON studio_recording_requests(kalam_id, created_at DESC, id DESC);
+
+-- Remote recording requests
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_remote_recording_new_queue ON remote_recording_requests_new(created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_remote_recording_new_queue_status ON remote_recording_requests_new(status, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_remote_recording_new_queue_vocalist ON remote_recording_requests_new(vocalist_id, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_remote_recording_new_queue_kalam ON remote_recording_requests_new(kalam_id, created_at DESC, id DESC);
+
+-- Studio visit requests
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_studio_visit_queue ON studio_visit_requests(created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_studio_visit_queue_status ON studio_visit_requests(status, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_studio_visit_queue_vocalist ON studio_visit_requests(vocalist_id, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_studio_visit_queue_kalam ON studio_visit_requests(kalam_id, created_at DESC, id DESC);
+
+-- Remote sessions (legacy remote recording requests)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_remote_recording_queue ON remote_recording_requests(created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_remote_recording_queue_status ON remote_recording_requests(status, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_remote_recording_queue_vocalist ON remote_recording_requests(vocalist_id, created_at DESC, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_remote_recording_queue_kalam ON remote_recording_requests(kalam_id, created_at DESC, id DESC);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_studio_recording_created_at;
+DROP INDEX CONCURRENTLY IF EXISTS idx_remote_recording_new_created_at;
+DROP INDEX CONCURRENTLY IF EXISTS idx_studio_visit_created_at;
+DROP INDEX CONCURRENTLY IF EXISTS idx_remote_recording_created_at;
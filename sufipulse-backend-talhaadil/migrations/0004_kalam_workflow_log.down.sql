@@ -0,0 +1,2 @@
+DROP TABLE IF EXISTS kalam_workflow_log;
+DROP FUNCTION IF EXISTS kalam_workflow_log_append_only();
@@ -0,0 +1,38 @@
+-- ========================================
+-- KALAM WORKFLOW TRANSITION LOG
+-- ========================================
+-- Every kalam workflow action (submit, admin review, writer response,
+-- vocalist assignment/response, publish) appends one row here in the same
+-- statement that changes kalam_submissions. Rows are never updated or deleted,
+-- so the log has no foreign keys and outlives deleted kalams.
+-- ========================================
+
+CREATE TABLE IF NOT EXISTS kalam_workflow_log (
+    id BIGSERIAL PRIMARY KEY,
+    kalam_id INT NOT NULL,
+    submission_id INT,
+    action VARCHAR(50) NOT NULL,
+    from_status VARCHAR(50),
+    to_status VARCHAR(50) NOT NULL,
+    actor_id INT,
+    actor_role VARCHAR(50),
+    comments TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_kalam_workflow_log_kalam_id ON kalam_workflow_log(kalam_id, id);
+
+-- Append-only: reject UPDATE and DELETE
+CREATE OR REPLACE FUNCTION kalam_workflow_log_append_only()
+RETURNS TRIGGER AS $$
+BEGIN
+    RAISE EXCEPTION 'kalam_workflow_log is append-only';
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_kalam_workflow_log_append_only ON kalam_workflow_log;
+CREATE TRIGGER trg_kalam_workflow_log_append_only
+    BEFORE UPDATE OR DELETE ON kalam_workflow_log
+    FOR EACH ROW EXECUTE FUNCTION kalam_workflow_log_append_only();
+
+COMMENT ON TABLE kalam_workflow_log IS 'Append-only history of kalam workflow transitions';
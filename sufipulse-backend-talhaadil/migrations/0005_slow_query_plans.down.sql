@@ -0,0 +1 @@
+DROP TABLE IF EXISTS slow_query_plans;
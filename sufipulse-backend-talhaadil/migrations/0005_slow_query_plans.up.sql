@@ -0,0 +1,24 @@
+-- ========================================
+-- SLOW QUERY PLANS
+-- ========================================
+-- Sampled slow statements (see utils/slow_queries.py) are re-run under
+-- EXPLAIN (ANALYZE, BUFFERS) on a side connection and stored here for review.
+-- Enable with SLOW_QUERY_EXPLAIN_RATE > 0; SLOW_QUERY_MS sets the threshold.
+-- ========================================
+
+CREATE TABLE IF NOT EXISTS slow_query_plans (
+    id BIGSERIAL PRIMARY KEY,
+    query_hash CHAR(40) NOT NULL,
+    normalized_sql TEXT NOT NULL,
+    caller VARCHAR(255),
+    route VARCHAR(255),
+    params_shape TEXT,
+    duration_ms DOUBLE PRECISION NOT NULL,
+    plan JSONB NOT NULL,
+    captured_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_slow_query_plans_captured_at ON slow_query_plans(captured_at DESC);
+CREATE INDEX IF NOT EXISTS idx_slow_query_plans_query_hash ON slow_query_plans(query_hash, captured_at DESC);
+
+COMMENT ON TABLE slow_query_plans IS 'EXPLAIN ANALYZE plans captured for sampled slow statements';
@@ -0,0 +1,11 @@
+-- migrate: no-transaction
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_blog_comments_parent_id ON blog_comments(parent_id);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_kalams_writer_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_kalams_vocalist_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_kalam_submissions_kalam_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_kalam_submissions_status;
+DROP INDEX CONCURRENTLY IF EXISTS idx_notifications_target_type;
+DROP INDEX CONCURRENTLY IF EXISTS idx_blog_comments_blog_top_level;
+DROP INDEX CONCURRENTLY IF EXISTS idx_blog_comments_parent_created;
+DROP INDEX CONCURRENTLY IF EXISTS idx_blog_submissions_status_created;
@@ -0,0 +1,28 @@
+-- migrate: no-transaction
+-- ========================================
+-- HOT PATH INDEXES
+-- ========================================
+-- Foreign keys and filters used on every page load that the base schema
+-- never indexed. Built CONCURRENTLY so writes continue during the build.
+-- ========================================
+
+-- Writer dashboards, vocalist assignments
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_kalams_writer_id ON kalams(writer_id, created_at DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_kalams_vocalist_id ON kalams(vocalist_id) WHERE vocalist_id IS NOT NULL;
+
+-- Every kalam read joins its latest submission; public listings filter on status
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_kalam_submissions_kalam_id ON kalam_submissions(kalam_id, id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_kalam_submissions_status ON kalam_submissions(status);
+
+-- Notification feed: broadcast rows by audience, newest first
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notifications_target_type ON notifications(target_type, created_at DESC);
+
+-- Blog comments: top-level page per blog, then replies per parent
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_blog_comments_blog_top_level ON blog_comments(blog_id, created_at DESC) WHERE parent_id IS NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_blog_comments_parent_created ON blog_comments(parent_id, created_at) WHERE parent_id IS NOT NULL;
+
+-- Public blog listing (status IN ('approved', 'posted') ORDER BY created_at DESC)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_blog_submissions_status_created ON blog_submissions(status, created_at DESC);
+
+-- Superseded by the composites above
+DROP INDEX CONCURRENTLY IF EXISTS idx_blog_comments_parent_id;
@@ -0,0 +1,8 @@
+-- migrate: no-transaction
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notifications_target_type ON notifications(target_type, created_at DESC);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_notifications_all_created;
+DROP INDEX CONCURRENTLY IF EXISTS idx_notifications_writers_created;
+DROP INDEX CONCURRENTLY IF EXISTS idx_notifications_vocalists_created;
+DROP INDEX CONCURRENTLY IF EXISTS idx_notifications_bloggers_created;
+DROP INDEX CONCURRENTLY IF EXISTS idx_notifications_target_user_ids;
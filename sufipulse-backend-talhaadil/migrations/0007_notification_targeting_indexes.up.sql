@@ -0,0 +1,19 @@
+-- migrate: no-transaction
+-- ========================================
+-- NOTIFICATION TARGETING INDEXES
+-- ========================================
+-- The feed is read as one branch per audience (broadcast, the user's role,
+-- and 'specific' rows naming the user), each walked newest first with a
+-- (created_at, id) keyset. Broadcast audiences get a partial index each;
+-- 'specific' rows are found through a GIN index on target_user_ids
+-- (queried with @>, which = ANY() cannot use).
+-- ========================================
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notifications_all_created ON notifications(created_at DESC, id DESC) WHERE target_type = 'all';
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notifications_writers_created ON notifications(created_at DESC, id DESC) WHERE target_type = 'writers';
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notifications_vocalists_created ON notifications(created_at DESC, id DESC) WHERE target_type = 'vocalists';
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notifications_bloggers_created ON notifications(created_at DESC, id DESC) WHERE target_type = 'bloggers';
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_notifications_target_user_ids ON notifications USING GIN (target_user_ids) WHERE target_type = 'specific';
+
+-- Superseded by the per-audience partial indexes
+DROP INDEX CONCURRENTLY IF EXISTS idx_notifications_target_type;
@@ -0,0 +1,7 @@
+DROP TRIGGER IF EXISTS trg_notification_reads_maintain_counts ON notification_reads;
+DROP TRIGGER IF EXISTS trg_notifications_maintain_counts ON notifications;
+DROP FUNCTION IF EXISTS notification_reads_maintain_counts();
+DROP FUNCTION IF EXISTS notifications_maintain_counts();
+DROP FUNCTION IF EXISTS notification_counts_apply(VARCHAR, INT[], INT);
+DROP TABLE IF EXISTS notification_user_counts;
+DROP TABLE IF EXISTS notification_audience_counts;
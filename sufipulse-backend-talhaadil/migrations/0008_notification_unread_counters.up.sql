@@ -0,0 +1,97 @@
+-- ========================================
+-- NOTIFICATION UNREAD COUNTERS
+-- ========================================
+-- Unread count = broadcasts to 'all' + broadcasts to the user's role
+--              + 'specific' notifications naming the user - the user's reads.
+-- Broadcast totals are kept per audience (one row each) so sending to
+-- everyone never fans out a write per user; 'specific' totals and read
+-- totals are kept per user. Triggers keep both in step with notifications
+-- and notification_reads, so /notifications/unread-count is a two-row lookup.
+-- ========================================
+
+CREATE TABLE IF NOT EXISTS notification_audience_counts (
+    target_type VARCHAR(50) PRIMARY KEY,
+    total INT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS notification_user_counts (
+    user_id INT PRIMARY KEY,
+    specific_count INT NOT NULL DEFAULT 0,
+    read_count INT NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION notification_counts_apply(audience VARCHAR, user_ids INT[], delta INT)
+RETURNS VOID AS $$
+BEGIN
+    IF audience = 'specific' THEN
+        INSERT INTO notification_user_counts (user_id, specific_count)
+        SELECT DISTINCT u, delta FROM unnest(user_ids) AS u WHERE u IS NOT NULL
+        ON CONFLICT (user_id) DO UPDATE
+            SET specific_count = notification_user_counts.specific_count + EXCLUDED.specific_count;
+    ELSE
+        INSERT INTO notification_audience_counts (target_type, total) VALUES (audience, delta)
+        ON CONFLICT (target_type) DO UPDATE
+            SET total = notification_audience_counts.total + EXCLUDED.total;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION notifications_maintain_counts()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM notification_counts_apply(OLD.target_type, OLD.target_user_ids, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM notification_counts_apply(NEW.target_type, NEW.target_user_ids, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION notification_reads_maintain_counts()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO notification_user_counts (user_id, read_count) VALUES (NEW.user_id, 1)
+        ON CONFLICT (user_id) DO UPDATE SET read_count = notification_user_counts.read_count + 1;
+    ELSE
+        UPDATE notification_user_counts SET read_count = read_count - 1 WHERE user_id = OLD.user_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Hold writers off while the triggers go in and the counters are backfilled
+LOCK TABLE notifications, notification_reads IN SHARE ROW EXCLUSIVE MODE;
+
+DROP TRIGGER IF EXISTS trg_notifications_maintain_counts ON notifications;
+CREATE TRIGGER trg_notifications_maintain_counts
+    AFTER INSERT OR DELETE OR UPDATE OF target_type, target_user_ids ON notifications
+    FOR EACH ROW EXECUTE FUNCTION notifications_maintain_counts();
+
+DROP TRIGGER IF EXISTS trg_notification_reads_maintain_counts ON notification_reads;
+CREATE TRIGGER trg_notification_reads_maintain_counts
+    AFTER INSERT OR DELETE ON notification_reads
+    FOR EACH ROW EXECUTE FUNCTION notification_reads_maintain_counts();
+
+TRUNCATE notification_audience_counts, notification_user_counts;
+
+INSERT INTO notification_audience_counts (target_type, total)
+SELECT target_type, COUNT(*) FROM notifications WHERE target_type <> 'specific' GROUP BY target_type;
+
+INSERT INTO notification_user_counts (user_id, specific_count, read_count)
+SELECT user_id, SUM(specific_count), SUM(read_count)
+FROM (
+    SELECT DISTINCT n.id, u AS user_id, 1 AS specific_count, 0 AS read_count
+    FROM notifications n, unnest(n.target_user_ids) AS u
+    WHERE n.target_type = 'specific' AND u IS NOT NULL
+    UNION ALL
+    SELECT nr.notification_id, nr.user_id, 0, 1
+    FROM notification_reads nr
+    WHERE nr.user_id IS NOT NULL
+) counts
+GROUP BY user_id;
+
+COMMENT ON TABLE notification_audience_counts IS 'Broadcast notifications sent per audience (trigger-maintained)';
+COMMENT ON TABLE notification_user_counts IS 'Per-user specific notification and read totals (trigger-maintained)';
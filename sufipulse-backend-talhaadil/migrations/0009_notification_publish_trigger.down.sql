@@ -0,0 +1,2 @@
+DROP TRIGGER IF EXISTS trg_notifications_publish ON notifications;
+DROP FUNCTION IF EXISTS notifications_publish();
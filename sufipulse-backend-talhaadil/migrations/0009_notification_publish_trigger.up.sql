@@ -0,0 +1,21 @@
+-- ========================================
+-- NOTIFICATION PUBLISH TRIGGER
+-- ========================================
+-- Announces every new notification on the "notifications" channel with its
+-- id as payload (NOTIFY payloads are capped at 8000 bytes, so the row itself
+-- is loaded by the listener). NOTIFY is delivered at commit, so listeners
+-- never see an id before its row is visible. See utils/notification_stream.py.
+-- ========================================
+
+CREATE OR REPLACE FUNCTION notifications_publish()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('notifications', NEW.id::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_notifications_publish ON notifications;
+CREATE TRIGGER trg_notifications_publish
+    AFTER INSERT ON notifications
+    FOR EACH ROW EXECUTE FUNCTION notifications_publish();
@@ -0,0 +1,2 @@
+-- Notifications covered only by a mark show as unread again after this
+DROP TABLE IF EXISTS notification_read_marks;
@@ -0,0 +1,23 @@
+-- ========================================
+-- NOTIFICATION READ MARKS
+-- ========================================
+-- Per-user read high-water mark: every notification with
+-- id <= last_read_notification_id is read. notification_reads only keeps the
+-- sparse exceptions above the mark (single reads); "mark all read" moves the
+-- mark and deletes the exceptions it covers, so read state stays constant-size
+-- per user however many broadcasts are sent.
+--
+-- read_below_mark is the number of the user's notifications the mark covered
+-- when it was set, so the unread count remains
+--   audience totals + specific_count - read_count - read_below_mark
+-- (see 0008_notification_unread_counters).
+-- ========================================
+
+CREATE TABLE IF NOT EXISTS notification_read_marks (
+    user_id INT PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    last_read_notification_id INT NOT NULL DEFAULT 0,
+    read_below_mark INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE notification_read_marks IS 'Per-user notification read high-water mark';
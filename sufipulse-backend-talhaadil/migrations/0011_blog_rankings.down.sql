@@ -0,0 +1,5 @@
+-- migrate: no-transaction
+DROP INDEX CONCURRENTLY IF EXISTS idx_blog_shares_shared_at;
+DROP INDEX CONCURRENTLY IF EXISTS idx_blog_likes_liked_at;
+DROP TABLE IF EXISTS blog_ranking_state;
+DROP TABLE IF EXISTS blog_rankings;
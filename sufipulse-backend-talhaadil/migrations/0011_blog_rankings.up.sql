@@ -0,0 +1,33 @@
+-- migrate: no-transaction
+-- ========================================
+-- BLOG RANKINGS
+-- ========================================
+-- Precomputed scores behind /public/blogs?sort=trending|popular, folded in
+-- incrementally from new engagement events by the ranking refresh job (see
+-- utils/blog_rankings.py); blog_ranking_state holds the event watermark.
+--
+-- trending_score is ln(sum of w * 2^((t - epoch) / half_life)) over every
+-- weighted event: with a fixed epoch, ordering by it is the same as ordering by
+-- exponentially decayed engagement now, so existing rows never need re-decaying.
+-- popular_score is the all-time weighted event total.
+-- ========================================
+
+CREATE TABLE IF NOT EXISTS blog_rankings (
+    blog_id INT PRIMARY KEY REFERENCES blog_submissions(id) ON DELETE CASCADE,
+    trending_score DOUBLE PRECISION NOT NULL,
+    popular_score DOUBLE PRECISION NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS blog_ranking_state (
+    id INT PRIMARY KEY CHECK (id = 1),
+    events_until TIMESTAMP NOT NULL,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_blog_rankings_trending ON blog_rankings(trending_score DESC, blog_id DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_blog_rankings_popular ON blog_rankings(popular_score DESC, blog_id DESC);
+
+-- The refresh job reads each engagement table by time window
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_blog_likes_liked_at ON blog_likes(liked_at);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_blog_shares_shared_at ON blog_shares(shared_at);
@@ -0,0 +1,3 @@
+-- Guest views recorded as sketches are lost; view_count keeps its last value
+DROP TABLE IF EXISTS blog_guest_view_totals;
+DROP TABLE IF EXISTS blog_guest_view_sketches;
@@ -0,0 +1,35 @@
+-- ========================================
+-- BLOG GUEST VIEW SKETCHES
+-- ========================================
+-- Guest (unauthenticated) views are no longer stored as one blog_views row per
+-- (blog, ip). Each guest view folds the IP into HyperLogLog sketches instead
+-- (2 KB bytea, ~2.3% error, see utils/hyperloglog.py): one per blog per day,
+-- mergeable into any window, plus an all-time sketch per blog. Registers only
+-- ever grow, so most repeat views change nothing and write nothing.
+--
+-- estimate caches each sketch's cardinality. ranked_estimate is the part of a
+-- day's estimate already folded into blog_rankings by the ranking refresh.
+-- ========================================
+
+CREATE TABLE IF NOT EXISTS blog_guest_view_sketches (
+    blog_id INT NOT NULL REFERENCES blog_submissions(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    registers BYTEA NOT NULL,
+    estimate INT NOT NULL DEFAULT 0,
+    ranked_estimate INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (blog_id, day)
+);
+
+-- Day sketches whose growth has not reached blog_rankings yet
+CREATE INDEX IF NOT EXISTS idx_blog_guest_view_sketches_unranked
+    ON blog_guest_view_sketches(updated_at) WHERE estimate > ranked_estimate;
+
+CREATE TABLE IF NOT EXISTS blog_guest_view_totals (
+    blog_id INT PRIMARY KEY REFERENCES blog_submissions(id) ON DELETE CASCADE,
+    registers BYTEA NOT NULL,
+    estimate INT NOT NULL DEFAULT 0
+);
+
+COMMENT ON TABLE blog_guest_view_sketches IS 'Per-blog, per-day HyperLogLog sketches of guest viewer IPs';
+COMMENT ON TABLE blog_guest_view_totals IS 'Per-blog all-time HyperLogLog sketch of guest viewer IPs';
@@ -0,0 +1,49 @@
+-- Raw rows of dropped partitions are gone; only the retained months come back
+LOCK TABLE blog_views, blog_shares IN ACCESS EXCLUSIVE MODE;
+
+CREATE TABLE blog_views_unpartitioned (
+    id INTEGER NOT NULL GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    blog_id INTEGER NOT NULL REFERENCES blog_submissions(id) ON DELETE CASCADE,
+    user_id INTEGER REFERENCES users(id) ON DELETE SET NULL,
+    ip_address VARCHAR(45),
+    user_agent TEXT,
+    viewed_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT blog_views_unique_view UNIQUE (blog_id, user_id, ip_address)
+);
+
+CREATE TABLE blog_shares_unpartitioned (
+    id INTEGER NOT NULL GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    blog_id INTEGER NOT NULL REFERENCES blog_submissions(id) ON DELETE CASCADE,
+    user_id INTEGER REFERENCES users(id) ON DELETE SET NULL,
+    ip_address VARCHAR(45),
+    share_platform VARCHAR(50) NOT NULL,
+    shared_at TIMESTAMP WITHOUT TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO blog_views_unpartitioned (id, blog_id, user_id, ip_address, user_agent, viewed_at)
+SELECT DISTINCT ON (blog_id, user_id, ip_address) id, blog_id, user_id, ip_address, user_agent, viewed_at
+FROM blog_views ORDER BY blog_id, user_id, ip_address, id;
+INSERT INTO blog_shares_unpartitioned (id, blog_id, user_id, ip_address, share_platform, shared_at)
+SELECT id, blog_id, user_id, ip_address, share_platform, shared_at FROM blog_shares;
+
+SELECT setval(pg_get_serial_sequence('blog_views_unpartitioned', 'id'), COALESCE((SELECT MAX(id) FROM blog_views_unpartitioned), 0) + 1, false);
+SELECT setval(pg_get_serial_sequence('blog_shares_unpartitioned', 'id'), COALESCE((SELECT MAX(id) FROM blog_shares_unpartitioned), 0) + 1, false);
+
+DROP TABLE blog_views;
+DROP TABLE blog_shares;
+DROP TABLE IF EXISTS blog_engagement_rollups;
+DROP TABLE IF EXISTS blog_engagement_daily;
+DROP FUNCTION IF EXISTS create_monthly_partition(TEXT, DATE);
+
+ALTER TABLE blog_views_unpartitioned RENAME TO blog_views;
+ALTER TABLE blog_shares_unpartitioned RENAME TO blog_shares;
+ALTER TABLE blog_views RENAME CONSTRAINT blog_views_unpartitioned_pkey TO blog_views_pkey;
+ALTER TABLE blog_shares RENAME CONSTRAINT blog_shares_unpartitioned_pkey TO blog_shares_pkey;
+
+CREATE INDEX IF NOT EXISTS idx_blog_views_blog_id ON blog_views(blog_id);
+CREATE INDEX IF NOT EXISTS idx_blog_views_user_id ON blog_views(user_id);
+CREATE INDEX IF NOT EXISTS idx_blog_views_ip_address ON blog_views(ip_address);
+CREATE INDEX IF NOT EXISTS idx_blog_views_viewed_at ON blog_views(viewed_at);
+CREATE INDEX IF NOT EXISTS idx_blog_shares_blog_id ON blog_shares(blog_id);
+CREATE INDEX IF NOT EXISTS idx_blog_shares_platform ON blog_shares(share_platform);
+CREATE INDEX IF NOT EXISTS idx_blog_shares_shared_at ON blog_shares(shared_at);
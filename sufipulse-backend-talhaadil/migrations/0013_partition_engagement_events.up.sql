@@ -0,0 +1,135 @@
+-- ========================================
+-- PARTITIONED ENGAGEMENT EVENTS
+-- ========================================
+-- blog_views and blog_shares become monthly RANGE partitions on their event
+-- time (blog_views_y2025m01, ...). A maintenance job (utils/engagement_partitions.py)
+-- keeps partitions ahead of time, rolls each closed month up into
+-- blog_engagement_daily, and drops raw months past ENGAGEMENT_RETENTION_MONTHS.
+-- Engagement totals read the rollups plus the months not rolled up yet.
+--
+-- blog_likes stays a plain table: a like is toggled state that must stay
+-- unique per (blog, user/ip) forever, not an event stream.
+--
+-- Runs in one transaction and rewrites both tables under an exclusive lock:
+-- schedule it in a quiet window on large databases.
+-- ========================================
+
+-- Creates the month's partition of blog_views/blog_shares if it does not exist yet
+CREATE OR REPLACE FUNCTION create_monthly_partition(parent TEXT, month DATE)
+RETURNS TEXT AS $$
+DECLARE
+    range_start DATE := date_trunc('month', month)::date;
+    partition_name TEXT := format('%s_y%sm%s', parent, to_char(range_start, 'YYYY'), to_char(range_start, 'MM'));
+BEGIN
+    IF to_regclass(partition_name) IS NULL THEN
+        EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                       partition_name, parent, range_start, (range_start + INTERVAL '1 month')::date);
+    END IF;
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+LOCK TABLE blog_views, blog_shares IN ACCESS EXCLUSIVE MODE;
+
+ALTER TABLE blog_views RENAME TO blog_views_unpartitioned;
+ALTER TABLE blog_shares RENAME TO blog_shares_unpartitioned;
+
+CREATE TABLE blog_views (
+    id INTEGER NOT NULL,
+    blog_id INTEGER NOT NULL,
+    user_id INTEGER,
+    ip_address VARCHAR(45),
+    user_agent TEXT,
+    viewed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+) PARTITION BY RANGE (viewed_at);
+
+CREATE TABLE blog_shares (
+    id INTEGER NOT NULL,
+    blog_id INTEGER NOT NULL,
+    user_id INTEGER,
+    ip_address VARCHAR(45),
+    share_platform VARCHAR(50) NOT NULL,
+    shared_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+) PARTITION BY RANGE (shared_at);
+
+-- Every month with data, through two months ahead
+DO $$
+DECLARE
+    source RECORD;
+    month DATE;
+BEGIN
+    FOR source IN
+        SELECT 'blog_views' AS parent, (SELECT MIN(viewed_at) FROM blog_views_unpartitioned) AS first_at
+        UNION ALL
+        SELECT 'blog_shares', (SELECT MIN(shared_at) FROM blog_shares_unpartitioned)
+    LOOP
+        month := date_trunc('month', LEAST(COALESCE(source.first_at, LOCALTIMESTAMP), LOCALTIMESTAMP))::date;
+        WHILE month <= (date_trunc('month', LOCALTIMESTAMP) + INTERVAL '2 months')::date LOOP
+            PERFORM create_monthly_partition(source.parent, month);
+            month := (month + INTERVAL '1 month')::date;
+        END LOOP;
+    END LOOP;
+END;
+$$;
+
+INSERT INTO blog_views (id, blog_id, user_id, ip_address, user_agent, viewed_at)
+SELECT id, blog_id, user_id, ip_address, user_agent, COALESCE(viewed_at, LOCALTIMESTAMP)
+FROM blog_views_unpartitioned;
+
+INSERT INTO blog_shares (id, blog_id, user_id, ip_address, share_platform, shared_at)
+SELECT id, blog_id, user_id, ip_address, share_platform, COALESCE(shared_at, LOCALTIMESTAMP)
+FROM blog_shares_unpartitioned;
+
+DROP TABLE blog_views_unpartitioned;
+DROP TABLE blog_shares_unpartitioned;
+
+-- Identity columns cannot be declared on partitioned tables before PostgreSQL 17
+CREATE SEQUENCE blog_views_id_seq OWNED BY blog_views.id;
+CREATE SEQUENCE blog_shares_id_seq OWNED BY blog_shares.id;
+SELECT setval('blog_views_id_seq', COALESCE((SELECT MAX(id) FROM blog_views), 0) + 1, false);
+SELECT setval('blog_shares_id_seq', COALESCE((SELECT MAX(id) FROM blog_shares), 0) + 1, false);
+ALTER TABLE blog_views ALTER COLUMN id SET DEFAULT nextval('blog_views_id_seq');
+ALTER TABLE blog_shares ALTER COLUMN id SET DEFAULT nextval('blog_shares_id_seq');
+
+-- Keys must include the partition column; uniqueness of a view is enforced by record_blog_view
+ALTER TABLE blog_views ADD CONSTRAINT blog_views_pkey PRIMARY KEY (id, viewed_at);
+ALTER TABLE blog_views ADD CONSTRAINT blog_views_blog_id_fkey
+    FOREIGN KEY (blog_id) REFERENCES blog_submissions(id) ON DELETE CASCADE;
+ALTER TABLE blog_views ADD CONSTRAINT blog_views_user_id_fkey
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL;
+CREATE INDEX idx_blog_views_blog_user ON blog_views(blog_id, user_id);
+CREATE INDEX idx_blog_views_user_id ON blog_views(user_id);
+CREATE INDEX idx_blog_views_viewed_at ON blog_views(viewed_at);
+
+ALTER TABLE blog_shares ADD CONSTRAINT blog_shares_pkey PRIMARY KEY (id, shared_at);
+ALTER TABLE blog_shares ADD CONSTRAINT blog_shares_blog_id_fkey
+    FOREIGN KEY (blog_id) REFERENCES blog_submissions(id) ON DELETE CASCADE;
+ALTER TABLE blog_shares ADD CONSTRAINT blog_shares_user_id_fkey
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL;
+CREATE INDEX idx_blog_shares_blog_id ON blog_shares(blog_id);
+CREATE INDEX idx_blog_shares_shared_at ON blog_shares(shared_at);
+
+-- Daily totals of rolled-up months
+CREATE TABLE IF NOT EXISTS blog_engagement_daily (
+    blog_id INT NOT NULL REFERENCES blog_submissions(id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    views INT NOT NULL DEFAULT 0,
+    shares INT NOT NULL DEFAULT 0,
+    share_platforms JSONB NOT NULL DEFAULT '{}',
+    PRIMARY KEY (blog_id, day)
+);
+
+-- One row per rolled-up partition; raw rows before MAX(range_end) are read from rollups
+CREATE TABLE IF NOT EXISTS blog_engagement_rollups (
+    partition_name VARCHAR(63) PRIMARY KEY,
+    parent VARCHAR(63) NOT NULL,
+    range_start DATE NOT NULL,
+    range_end DATE NOT NULL,
+    rolled_up_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    dropped_at TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_blog_engagement_rollups_parent ON blog_engagement_rollups(parent, range_end DESC);
+
+COMMENT ON TABLE blog_engagement_daily IS 'Per-blog daily views/shares from rolled-up blog_views/blog_shares partitions';
+COMMENT ON TABLE blog_engagement_rollups IS 'blog_views/blog_shares partitions already rolled up (and dropped)';
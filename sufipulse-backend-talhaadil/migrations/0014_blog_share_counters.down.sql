@@ -0,0 +1,3 @@
+ALTER TABLE blog_submissions
+    DROP COLUMN IF EXISTS share_platform_counts,
+    DROP COLUMN IF EXISTS share_count;
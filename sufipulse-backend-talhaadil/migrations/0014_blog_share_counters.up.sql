@@ -0,0 +1,45 @@
+-- ========================================
+-- BLOG SHARE COUNTERS
+-- ========================================
+-- share_count and share_platform_counts ({"whatsapp": 12, ...}) sit next to
+-- view_count, like_count and comment_count on blog_submissions, so a blog's
+-- engagement stats are one row read. record_blog_share bumps them in the
+-- same transaction as the blog_shares insert.
+-- ========================================
+
+ALTER TABLE blog_submissions
+    ADD COLUMN IF NOT EXISTS share_count INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS share_platform_counts JSONB NOT NULL DEFAULT '{}';
+
+COMMENT ON COLUMN blog_submissions.share_count IS 'Cached count of total shares';
+COMMENT ON COLUMN blog_submissions.share_platform_counts IS 'Cached share count per platform';
+
+-- Keep shares recorded during the backfill from being missed
+LOCK TABLE blog_shares IN SHARE MODE;
+
+-- Rolled-up months from blog_engagement_daily plus the raw rows not rolled up yet
+WITH rolled_up_until AS (
+    SELECT COALESCE(MAX(range_end), '-infinity'::date) AS until
+    FROM blog_engagement_rollups WHERE parent = 'blog_shares'
+),
+platforms AS (
+    SELECT blog_id, share_platform, SUM(n) AS n
+    FROM (
+        SELECT d.blog_id, p.key AS share_platform, p.value::int AS n
+        FROM blog_engagement_daily d, jsonb_each_text(d.share_platforms) p
+        UNION ALL
+        SELECT s.blog_id, s.share_platform, COUNT(*)
+        FROM blog_shares s, rolled_up_until r
+        WHERE s.shared_at >= r.until
+        GROUP BY s.blog_id, s.share_platform
+    ) counts
+    GROUP BY blog_id, share_platform
+)
+UPDATE blog_submissions bs
+SET share_count = totals.total, share_platform_counts = totals.by_platform
+FROM (
+    SELECT blog_id, SUM(n)::int AS total, jsonb_object_agg(share_platform, n) AS by_platform
+    FROM platforms
+    GROUP BY blog_id
+) totals
+WHERE totals.blog_id = bs.id;
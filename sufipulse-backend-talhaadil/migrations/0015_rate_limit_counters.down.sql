@@ -0,0 +1 @@
+DROP TABLE IF EXISTS rate_limit_counters;
@@ -0,0 +1,19 @@
+-- ========================================
+-- RATE LIMIT COUNTERS
+-- ========================================
+-- Fixed-window hit counters behind the sliding-window rate limiter
+-- (utils/rate_limit.py) when RATE_LIMIT_BACKEND=postgres, so every replica
+-- enforces the same limits. key is "<policy>:<ip, user id or email hash>",
+-- window_start the window's epoch second. Rows are disposable: the table is
+-- unlogged and expired windows are deleted by the limiter itself.
+-- ========================================
+
+CREATE UNLOGGED TABLE IF NOT EXISTS rate_limit_counters (
+    key TEXT NOT NULL,
+    window_start BIGINT NOT NULL,
+    hits INT NOT NULL DEFAULT 0,
+    expires_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (key, window_start)
+);
+
+CREATE INDEX IF NOT EXISTS idx_rate_limit_counters_expires_at ON rate_limit_counters(expires_at);
@@ -0,0 +1,2 @@
+-- Pending challenges are lost; users request a new code
+DROP TABLE IF EXISTS auth_challenges;
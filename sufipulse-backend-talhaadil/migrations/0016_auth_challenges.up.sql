@@ -0,0 +1,33 @@
+-- ========================================
+-- AUTH CHALLENGES
+-- ========================================
+-- One-time codes move out of users.otp / users.otp_expiry into their own
+-- table: one live challenge per user and purpose ('verify_email',
+-- 'reset_password'), replaced on resend. Only an HMAC of the code is stored
+-- (utils/hashing.hash_otp), wrong guesses are counted against max_attempts,
+-- and verification consumes the challenge in the same UPDATE that checks it.
+-- Expired and consumed rows are purged periodically (utils/auth_challenges.py).
+--
+-- Codes pending in users.otp when this runs are dropped: they lived five
+-- minutes and are re-issued by /auth/resend-otp or /auth/forgot-password.
+-- ========================================
+
+CREATE TABLE IF NOT EXISTS auth_challenges (
+    id BIGSERIAL PRIMARY KEY,
+    user_id INT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    purpose VARCHAR(20) NOT NULL CHECK (purpose IN ('verify_email', 'reset_password')),
+    code_hash VARCHAR(64) NOT NULL,
+    attempts SMALLINT NOT NULL DEFAULT 0,
+    max_attempts SMALLINT NOT NULL DEFAULT 5,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMPTZ NOT NULL,
+    consumed_at TIMESTAMPTZ,
+    UNIQUE (user_id, purpose)
+);
+
+-- Purge of expired challenges
+CREATE INDEX IF NOT EXISTS idx_auth_challenges_expires_at ON auth_challenges(expires_at);
+
+COMMENT ON TABLE auth_challenges IS 'Pending one-time codes (email verification, password reset)';
+
+UPDATE users SET otp = NULL, otp_expiry = NULL WHERE otp IS NOT NULL OR otp_expiry IS NOT NULL;
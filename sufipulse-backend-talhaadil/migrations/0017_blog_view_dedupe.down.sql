@@ -0,0 +1 @@
+DROP TABLE IF EXISTS blog_view_dedupe;
@@ -0,0 +1,28 @@
+-- ========================================
+-- BLOG VIEW DEDUPE
+-- ========================================
+-- The partitioned blog_views (0013) cannot carry a (blog_id, user_id)
+-- unique constraint: partition keys must include viewed_at. This small
+-- unpartitioned table holds one row per authenticated viewer and blog;
+-- record_blog_view claims it with INSERT ... ON CONFLICT DO NOTHING in the
+-- same statement that inserts the view, so concurrent views by the same
+-- user count once, and the dedupe outlives raw-partition retention.
+-- ========================================
+
+CREATE TABLE IF NOT EXISTS blog_view_dedupe (
+    blog_id INT NOT NULL REFERENCES blog_submissions(id) ON DELETE CASCADE,
+    user_id INT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    PRIMARY KEY (blog_id, user_id)
+);
+
+COMMENT ON TABLE blog_view_dedupe IS 'One row per (blog, authenticated viewer): the view uniqueness check';
+
+-- Keep views recorded during the backfill from slipping past it
+LOCK TABLE blog_views IN SHARE MODE;
+
+INSERT INTO blog_view_dedupe (blog_id, user_id)
+SELECT DISTINCT v.blog_id, v.user_id
+FROM blog_views v
+JOIN users u ON u.id = v.user_id
+WHERE v.user_id IS NOT NULL
+ON CONFLICT DO NOTHING;
@@ -0,0 +1,28 @@
+-- Rows caught by the default partitions go back into monthly partitions first
+ALTER TABLE blog_views DETACH PARTITION blog_views_default;
+ALTER TABLE blog_shares DETACH PARTITION blog_shares_default;
+
+CREATE OR REPLACE FUNCTION create_monthly_partition(parent TEXT, month DATE)
+RETURNS TEXT AS $$
+DECLARE
+    range_start DATE := date_trunc('month', month)::date;
+    partition_name TEXT := format('%s_y%sm%s', parent, to_char(range_start, 'YYYY'), to_char(range_start, 'MM'));
+BEGIN
+    IF to_regclass(partition_name) IS NULL THEN
+        EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                       partition_name, parent, range_start, (range_start + INTERVAL '1 month')::date);
+    END IF;
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT create_monthly_partition('blog_views', month)
+FROM (SELECT DISTINCT date_trunc('month', viewed_at)::date AS month FROM blog_views_default) months;
+SELECT create_monthly_partition('blog_shares', month)
+FROM (SELECT DISTINCT date_trunc('month', shared_at)::date AS month FROM blog_shares_default) months;
+
+INSERT INTO blog_views SELECT * FROM blog_views_default;
+INSERT INTO blog_shares SELECT * FROM blog_shares_default;
+
+DROP TABLE blog_views_default;
+DROP TABLE blog_shares_default;
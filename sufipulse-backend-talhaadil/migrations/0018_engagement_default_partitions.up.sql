@@ -0,0 +1,49 @@
+-- ========================================
+-- DEFAULT ENGAGEMENT PARTITIONS
+-- ========================================
+-- Without a DEFAULT partition, a view or share whose month has no partition
+-- yet (maintenance disabled, cron missing, clock skew) fails to insert.
+-- blog_views_default/blog_shares_default catch those rows; the maintenance
+-- job warns when they hold any and creates the missing months, which moves
+-- the rows out of the default partition.
+--
+-- A month cannot be created with PARTITION OF while the default partition
+-- holds rows in its range, so create_monthly_partition now builds the table,
+-- moves those rows into it and attaches it.
+-- ========================================
+
+CREATE OR REPLACE FUNCTION create_monthly_partition(parent TEXT, month DATE)
+RETURNS TEXT AS $$
+DECLARE
+    range_start DATE := date_trunc('month', month)::date;
+    range_end DATE := (date_trunc('month', month) + INTERVAL '1 month')::date;
+    partition_name TEXT := format('%s_y%sm%s', parent, to_char(range_start, 'YYYY'), to_char(range_start, 'MM'));
+    default_name TEXT := parent || '_default';
+    key_column TEXT;
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN partition_name;
+    END IF;
+
+    IF to_regclass(default_name) IS NULL THEN
+        EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                       partition_name, parent, range_start, range_end);
+        RETURN partition_name;
+    END IF;
+
+    SELECT a.attname INTO key_column
+    FROM pg_partitioned_table p
+    JOIN pg_attribute a ON a.attrelid = p.partrelid AND a.attnum = p.partattrs[0]
+    WHERE p.partrelid = parent::regclass;
+
+    EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS)', partition_name, parent);
+    EXECUTE format('WITH moved AS (DELETE FROM %I WHERE %I >= %L AND %I < %L RETURNING *) INSERT INTO %I SELECT * FROM moved',
+                   default_name, key_column, range_start, key_column, range_end, partition_name);
+    EXECUTE format('ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                   parent, partition_name, range_start, range_end);
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TABLE IF NOT EXISTS blog_views_default PARTITION OF blog_views DEFAULT;
+CREATE TABLE IF NOT EXISTS blog_shares_default PARTITION OF blog_shares DEFAULT;
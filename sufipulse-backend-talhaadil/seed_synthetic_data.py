@@ -0,0 +1,347 @@
+"""
+Seed a local Postgres with synthetic SufiPulse data for load tests and benchmarks
+Volumes come from a named scale (small / medium / large) and can be overridden per
+table. Engagement rows (views, likes) follow a skewed popularity curve so a few blogs
+get most of the traffic, like production. All synthetic users share the
+@bench.sufipulse.local email domain and the password "benchmark".
+
+Run this from the sufipulse-backend-talhaadil directory against a throwaway database:
+    python seed_synthetic_data.py --apply-schema --scale medium
+    python seed_synthetic_data.py --scale large --blog-views 20000000 --truncate
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import psycopg2
+from dotenv import load_dotenv
+
+from benchmark_admin_queue import SEED_STATEMENTS as RECORDING_REQUEST_SEEDS
+from migrate import apply_pending
+from utils.hashing import hash_password
+
+# Set UTF-8 encoding for Windows console
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+load_dotenv()
+
+# Database configuration
+DB_CONFIG = {
+    'dbname': os.getenv('DB_NAME', 'sufipulse'),
+    'user': os.getenv('DB_USER', 'postgres'),
+    'password': os.getenv('DB_PASSWORD', 'postgres'),
+    'host': os.getenv('DB_HOST', 'localhost'),
+    'port': os.getenv('DB_PORT', '5432'),
+}
+
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1", "db", "postgres")
+
+BENCH_EMAIL_DOMAIN = "bench.sufipulse.local"
+BENCH_PASSWORD = "benchmark"
+
+# Base schema files applied by --apply-schema, in order (the migrations follow)
+SCHEMA_FILES = (
+    "schema.sql",
+    "sql/blog_engagement_schema.sql",
+    "sql/recording_requests_schema.sql",
+    "sql/cms_pages_schema.sql",
+    "sql/cms_add_all_20_pages.sql",
+)
+
+SCALES = {
+    "small": {
+        "writers": 200, "vocalists": 100, "bloggers": 50, "kalams": 2_000, "blogs": 500,
+        "blog_views": 100_000, "blog_likes": 20_000, "blog_comments": 10_000,
+        "notifications": 500, "notification_reads": 20_000, "recording_requests": 10_000,
+    },
+    "medium": {
+        "writers": 2_000, "vocalists": 1_000, "bloggers": 500, "kalams": 50_000, "blogs": 10_000,
+        "blog_views": 2_000_000, "blog_likes": 400_000, "blog_comments": 200_000,
+        "notifications": 5_000, "notification_reads": 500_000, "recording_requests": 200_000,
+    },
+    "large": {
+        "writers": 20_000, "vocalists": 10_000, "bloggers": 5_000, "kalams": 500_000, "blogs": 100_000,
+        "blog_views": 10_000_000, "blog_likes": 2_000_000, "blog_comments": 1_000_000,
+        "notifications": 50_000, "notification_reads": 5_000_000, "recording_requests": 1_000_000,
+    },
+}
+
+# Tables cleared by --truncate
+SEEDED_TABLES = (
+    "blog_views", "blog_likes", "blog_comments", "blog_shares", "blog_submissions", "bloggers",
+    "notification_reads", "notifications", "kalam_submissions", "kalams", "writers", "vocalists",
+    "studio_recording_requests", "remote_recording_requests_new", "studio_visit_requests",
+    "remote_recording_requests",
+    # TRUNCATE skips the row triggers that keep these in step with the tables above
+    "notification_audience_counts", "notification_user_counts",
+    # Without its watermark the next ranking refresh rebuilds from the reseeded events
+    "blog_ranking_state",
+)
+
+KALAM_STATUSES = "ARRAY['draft','submitted','admin_approved','final_approved','complete_approved','posted','posted','posted']"
+BLOG_STATUSES = "ARRAY['pending','review','approved','posted','posted','posted','rejected']"
+
+# Picks a 1-based index into an array of n ids, skewed towards the start (cubic curve)
+SKEWED_INDEX = "1 + floor(power(random(), 3) * {n})::int"
+
+
+def seed_users(cur, role, count, password_hash):
+    cur.execute(
+        """
+        INSERT INTO users (email, name, password_hash, role, country, city, is_registered, created_at)
+        SELECT %s || g || '@' || %s, initcap(%s) || ' ' || g, %s, %s,
+            (ARRAY['Pakistan','India','Turkey','UK','USA'])[1 + g %% 5], 'City ' || (g %% 50), TRUE,
+            NOW() - (g * INTERVAL '7 minutes')
+        FROM generate_series(1, %s) g
+        """,
+        (role, BENCH_EMAIL_DOMAIN, role, password_hash, role, count),
+    )
+
+
+def seed_profiles(cur):
+    domain = "%@" + BENCH_EMAIL_DOMAIN
+    cur.execute("""
+        INSERT INTO writers (user_id, writing_styles, languages, sample_title)
+        SELECT id, ARRAY['Ghazal','Qawwali'], ARRAY['Urdu','Punjabi'], 'Sample'
+        FROM users WHERE role = 'writer' AND email LIKE %s
+    """, (domain,))
+    cur.execute("""
+        INSERT INTO vocalists (user_id, vocal_range, languages, sample_title, status)
+        SELECT id, 'Tenor', ARRAY['Urdu'], 'Sample', (ARRAY['pending','approved','approved'])[1 + id %% 3]
+        FROM users WHERE role = 'vocalist' AND email LIKE %s
+    """, (domain,))
+    cur.execute("""
+        INSERT INTO bloggers (user_id, author_name, short_bio, location)
+        SELECT id, name, 'Synthetic blogger', city
+        FROM users WHERE role = 'blogger' AND email LIKE %s
+    """, (domain,))
+
+
+def seed_kalams(cur, count):
+    domain = "%@" + BENCH_EMAIL_DOMAIN
+    cur.execute(f"""
+        WITH w AS (SELECT array_agg(id) AS ids FROM users WHERE role = 'writer' AND email LIKE %s),
+             v AS (SELECT array_agg(id) AS ids FROM users WHERE role = 'vocalist' AND email LIKE %s)
+        INSERT INTO kalams (title, language, theme, kalam_text, description, writer_id, vocalist_id,
+                            youtube_link, published_at, created_at)
+        SELECT 'Bench kalam ' || g, (ARRAY['Urdu','Punjabi','Persian','Arabic'])[1 + g %% 4],
+            (ARRAY['Love','Devotion','Unity','Longing'])[1 + g %% 4],
+            repeat('Ishq haqiqi ', 40), 'Synthetic kalam',
+            w.ids[1 + g %% array_length(w.ids, 1)],
+            CASE WHEN g %% 3 = 0 THEN v.ids[1 + g %% array_length(v.ids, 1)] END,
+            CASE WHEN g %% 8 >= 5 THEN 'https://youtu.be/bench' || g END,
+            CASE WHEN g %% 8 >= 5 THEN NOW() - (g * INTERVAL '3 minutes') END,
+            NOW() - (g * INTERVAL '3 minutes')
+        FROM generate_series(1, %s) g, w, v
+    """, (domain, domain, count))
+    cur.execute(f"""
+        INSERT INTO kalam_submissions (kalam_id, status, user_approval_status, vocalist_approval_status, created_at)
+        SELECT k.id, ({KALAM_STATUSES})[1 + k.id %% 8],
+            CASE WHEN k.id %% 8 >= 3 THEN 'approved' ELSE 'pending' END,
+            CASE WHEN k.id %% 8 >= 4 THEN 'approved' ELSE 'pending' END,
+            k.created_at
+        FROM kalams k
+        JOIN users u ON u.id = k.writer_id
+        WHERE u.email LIKE %s
+    """, (domain,))
+
+
+def seed_blogs(cur, count):
+    domain = "%@" + BENCH_EMAIL_DOMAIN
+    cur.execute(f"""
+        WITH b AS (SELECT array_agg(id) AS ids FROM users WHERE role = 'blogger' AND email LIKE %s)
+        INSERT INTO blog_submissions (title, excerpt, content, user_id, status, category, tags, language, created_at)
+        SELECT 'Bench blog ' || g, 'Synthetic excerpt ' || g, repeat('Sufi poetry and music. ', 200),
+            b.ids[1 + g %% array_length(b.ids, 1)], ({BLOG_STATUSES})[1 + g %% 7],
+            (ARRAY['Poetry','Music','History','Spirituality'])[1 + g %% 4],
+            ARRAY['sufi', 'tag' || (g %% 20)], 'English',
+            NOW() - (g * INTERVAL '11 minutes')
+        FROM generate_series(1, %s) g, b
+    """, (domain, count))
+
+
+def seed_engagement(cur, views, likes, comments):
+    """Views and likes are guest rows with one distinct IP per row, spread over blogs with a skew"""
+    blogs = "(SELECT array_agg(id ORDER BY id) AS ids FROM blog_submissions WHERE status IN ('approved', 'posted'))"
+    ip = "'10.' || (g / 65536) %% 256 || '.' || (g / 256) %% 256 || '.' || g %% 256"
+    pick = SKEWED_INDEX.format(n="(array_length(b.ids, 1) - 1)")
+
+    # blog_views is partitioned by month (migrations/0013); cover the 90-day spread
+    cur.execute("""
+        SELECT create_monthly_partition('blog_views', (date_trunc('month', LOCALTIMESTAMP) - make_interval(months => m))::date)
+        FROM generate_series(0, 3) m
+    """)
+    cur.execute(f"""
+        INSERT INTO blog_views (blog_id, ip_address, user_agent, viewed_at)
+        SELECT b.ids[{pick}], {ip}, 'bench-agent/1.0', NOW() - (random() * INTERVAL '90 days')
+        FROM generate_series(1, %s) g, {blogs} b
+    """, (views,))
+    cur.execute(f"""
+        INSERT INTO blog_likes (blog_id, ip_address, liked_at)
+        SELECT b.ids[{pick}], {ip}, NOW() - (random() * INTERVAL '90 days')
+        FROM generate_series(1, %s) g, {blogs} b
+    """, (likes,))
+
+    # Four top-level comments for every reply
+    top_level = comments * 4 // 5
+    cur.execute(f"""
+        INSERT INTO blog_comments (blog_id, commenter_name, commenter_email, comment_text, created_at)
+        SELECT b.ids[{pick}], 'Guest ' || g, 'guest' || g || '@{BENCH_EMAIL_DOMAIN}',
+            'Synthetic comment ' || g, NOW() - (random() * INTERVAL '90 days')
+        FROM generate_series(1, %s) g, {blogs} b
+    """, (top_level,))
+    cur.execute("""
+        INSERT INTO blog_comments (blog_id, parent_id, commenter_name, commenter_email, comment_text, created_at)
+        SELECT c.blog_id, c.id, 'Guest reply', c.commenter_email, 'Synthetic reply', c.created_at + INTERVAL '1 hour'
+        FROM blog_comments c
+        WHERE c.parent_id IS NULL AND c.commenter_email LIKE %s
+        ORDER BY c.id
+        LIMIT %s
+    """, ("%@" + BENCH_EMAIL_DOMAIN, comments - top_level))
+
+    cur.execute("""
+        UPDATE blog_submissions bs
+        SET view_count = COALESCE(v.n, 0), like_count = COALESCE(l.n, 0), comment_count = COALESCE(c.n, 0)
+        FROM blog_submissions b
+        LEFT JOIN (SELECT blog_id, COUNT(*) AS n FROM blog_views GROUP BY blog_id) v ON v.blog_id = b.id
+        LEFT JOIN (SELECT blog_id, COUNT(*) AS n FROM blog_likes GROUP BY blog_id) l ON l.blog_id = b.id
+        LEFT JOIN (SELECT blog_id, COUNT(*) AS n FROM blog_comments GROUP BY blog_id) c ON c.blog_id = b.id
+        WHERE bs.id = b.id
+    """)
+
+
+def seed_notifications(cur, count, reads):
+    domain = "%@" + BENCH_EMAIL_DOMAIN
+    cur.execute("""
+        WITH u AS (SELECT array_agg(id) AS ids FROM users WHERE email LIKE %s)
+        INSERT INTO notifications (title, message, target_type, target_user_ids, created_at)
+        SELECT 'Bench notification ' || g, 'Synthetic notification body ' || g,
+            (ARRAY['all','writers','vocalists','specific'])[1 + g %% 4],
+            CASE WHEN g %% 4 = 3 THEN ARRAY[u.ids[1 + g %% array_length(u.ids, 1)]] ELSE '{}' END,
+            NOW() - (g * INTERVAL '13 minutes')
+        FROM generate_series(1, %s) g, u
+    """, (domain, count))
+    # Distinct (notification, user) pairs while reads < notifications * users
+    cur.execute("""
+        WITH n AS (SELECT array_agg(id) AS ids FROM notifications WHERE title LIKE 'Bench notification %%'),
+             u AS (SELECT array_agg(id) AS ids FROM users WHERE email LIKE %s)
+        INSERT INTO notification_reads (notification_id, user_id)
+        SELECT n.ids[1 + g %% array_length(n.ids, 1)], u.ids[1 + (g / array_length(n.ids, 1)) %% array_length(u.ids, 1)]
+        FROM generate_series(1, %s) g, n, u
+    """, (domain, reads))
+
+
+def seed_admin(cur, password_hash):
+    cur.execute("""
+        INSERT INTO users (email, name, password_hash, role, is_registered)
+        SELECT %s, 'Bench Admin', %s, 'admin', TRUE
+        WHERE NOT EXISTS (SELECT 1 FROM users WHERE email = %s)
+    """, ("admin@" + BENCH_EMAIL_DOMAIN, password_hash, "admin@" + BENCH_EMAIL_DOMAIN))
+
+
+def apply_schema(conn):
+    with conn.cursor() as cur:
+        for path in SCHEMA_FILES:
+            with open(path, encoding="utf-8") as f:
+                cur.execute(f.read())
+            print(f"   - applied {path}")
+    conn.commit()
+    for migration in apply_pending(conn):
+        print(f"   - applied migration {migration.label}")
+
+
+def truncate(conn):
+    with conn.cursor() as cur:
+        cur.execute(f"TRUNCATE {', '.join(SEEDED_TABLES)} RESTART IDENTITY CASCADE")
+        cur.execute("DELETE FROM users WHERE email LIKE %s", ("%@" + BENCH_EMAIL_DOMAIN,))
+    conn.commit()
+
+
+def step(conn, label, func, *args):
+    start = time.perf_counter()
+    with conn.cursor() as cur:
+        func(cur, *args)
+    conn.commit()
+    print(f"   - {label} in {time.perf_counter() - start:.1f}s")
+
+
+def seed(conn, volumes: dict):
+    """Seed every table for the given volumes (a SCALES entry) and ANALYZE them"""
+    password_hash = hash_password(BENCH_PASSWORD)
+
+    step(conn, "admin user", seed_admin, password_hash)
+    for role in ("writer", "vocalist", "blogger"):
+        step(conn, f"{volumes[role + 's']:,} {role}s", seed_users, role, volumes[role + "s"], password_hash)
+    step(conn, "profiles", seed_profiles)
+    step(conn, f"{volumes['kalams']:,} kalams", seed_kalams, volumes["kalams"])
+    step(conn, f"{volumes['blogs']:,} blogs", seed_blogs, volumes["blogs"])
+    step(conn, f"{volumes['blog_views']:,} views, {volumes['blog_likes']:,} likes, "
+               f"{volumes['blog_comments']:,} comments",
+         seed_engagement, volumes["blog_views"], volumes["blog_likes"], volumes["blog_comments"])
+    step(conn, f"{volumes['notifications']:,} notifications", seed_notifications,
+         volumes["notifications"], volumes["notification_reads"])
+
+    per_table = volumes["recording_requests"] // len(RECORDING_REQUEST_SEEDS)
+    for table, statement in RECORDING_REQUEST_SEEDS.items():
+        step(conn, f"{per_table:,} {table}", lambda cur, s=statement: cur.execute(s, (per_table,)))
+
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        cur.execute("VACUUM ANALYZE")
+    conn.autocommit = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed synthetic SufiPulse data")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    for name in SCALES["small"]:
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, dest=name, help=f"Override {name}")
+    parser.add_argument("--apply-schema", action="store_true", help="Create the tables first")
+    parser.add_argument("--truncate", action="store_true", help="Remove previously seeded data first")
+    parser.add_argument("--allow-remote", action="store_true", help="Allow a non-local database host")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("SYNTHETIC DATA SEED")
+    print("=" * 60)
+
+    if DB_CONFIG["host"] not in LOCAL_HOSTS and not args.allow_remote:
+        print(f"\n[ERROR] Refusing to seed {DB_CONFIG['host']}; pass --allow-remote if this is really a throwaway database")
+        return 1
+
+    volumes = dict(SCALES[args.scale])
+    for name in volumes:
+        if getattr(args, name) is not None:
+            volumes[name] = getattr(args, name)
+
+    print(f"\nConnecting to database: {DB_CONFIG['dbname']}@{DB_CONFIG['host']}")
+    conn = psycopg2.connect(**DB_CONFIG)
+
+    try:
+        if args.apply_schema:
+            print("\nApplying schema...")
+            apply_schema(conn)
+        if args.truncate:
+            print("\nRemoving previous synthetic data...")
+            truncate(conn)
+
+        print(f"\nSeeding ({args.scale})...")
+        start = time.perf_counter()
+        seed(conn, volumes)
+        print(f"\n[OK] Seeded in {time.perf_counter() - start:.1f}s")
+    except Exception as e:
+        conn.rollback()
+        print(f"\n[ERROR] {e}")
+        return 1
+    finally:
+        conn.close()
+
+    print("\n" + "=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
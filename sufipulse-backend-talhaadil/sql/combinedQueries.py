@@ -1,9 +1,9 @@
 from psycopg2.extras import RealDictCursor
 from datetime import datetime, timezone
 from typing import Optional
-from sql.queries import AuthQueries,VocalistQueries,KalamQueries,StudioQueries,NotificationQueries,WriterQueries,BloggerQueries
+from sql.queries import AuthQueries,VocalistQueries,KalamQueries,StudioQueries,NotificationQueries,WriterQueries,BloggerQueries,RecordingRequestQueries,KalamWorkflowQueries,DiagnosticsQueries
 
-class Queries(AuthQueries,VocalistQueries,KalamQueries,StudioQueries,NotificationQueries,WriterQueries,BloggerQueries):
+class Queries(AuthQueries,VocalistQueries,KalamQueries,StudioQueries,NotificationQueries,WriterQueries,BloggerQueries,RecordingRequestQueries,KalamWorkflowQueries,DiagnosticsQueries):
     def __init__(self, conn):
         # Initialize both parent classes
         AuthQueries.__init__(self, conn)
@@ -13,3 +13,6 @@ class Queries(AuthQueries,VocalistQueries,KalamQueries,StudioQueries,Notificatio
         NotificationQueries.__init__(self, conn)
         WriterQueries.__init__(self, conn)
         BloggerQueries.__init__(self, conn)
+        RecordingRequestQueries.__init__(self, conn)
+        KalamWorkflowQueries.__init__(self, conn)
+        DiagnosticsQueries.__init__(self, conn)
@@ -4,4 +4,7 @@ from .kalamQueries import KalamQueries
 from .studioQueries import StudioQueries
 from .notificationQueries import NotificationQueries
 from .writerQueries import WriterQueries
-from .bloggerQueries import BloggerQueries
\ No newline at end of file
+from .bloggerQueries import BloggerQueries
+from .recordingRequestQueries import RecordingRequestQueries
+from .kalamWorkflowQueries import KalamWorkflowQueries
+from .diagnosticsQueries import DiagnosticsQueries
@@ -1,7 +1,12 @@
-from datetime import datetime,timezone
 from typing import Optional
 import json
 
+from utils.hashing import hash_otp
+
+# auth_challenges purposes (migrations/0016)
+OTP_VERIFY_EMAIL = "verify_email"
+OTP_RESET_PASSWORD = "reset_password"
+
 class AuthQueries:
     def __init__(self, conn):
         self.conn = conn
@@ -20,13 +25,23 @@ class AuthQueries:
 
 
     def create_user_with_otp(self, email, name, password_hash, role, country, city, otp, otp_expiry):
+        """Insert an unverified user together with its email verification challenge"""
         query = """
-        INSERT INTO users (email, name, password_hash, role, country, city, otp, otp_expiry, is_registered)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, FALSE)
-        RETURNING id, email, name, role, country, city, permissions, is_registered, created_at;
+        WITH new_user AS (
+            INSERT INTO users (email, name, password_hash, role, country, city, is_registered)
+            VALUES (%s, %s, %s, %s, %s, %s, FALSE)
+            RETURNING id, email, name, role, country, city, permissions, is_registered, created_at
+        ),
+        challenge AS (
+            INSERT INTO auth_challenges (user_id, purpose, code_hash, expires_at)
+            SELECT id, %s, %s, %s FROM new_user
+        )
+        SELECT * FROM new_user;
         """
+        code_hash = hash_otp(email, OTP_VERIFY_EMAIL, otp)
         with self.conn.cursor() as cur:
-            cur.execute(query, (email, name, password_hash, role, country, city, otp, otp_expiry))
+            cur.execute(query, (email, name, password_hash, role, country, city,
+                                OTP_VERIFY_EMAIL, code_hash, otp_expiry))
             user = cur.fetchone()
             self.conn.commit()
             return user
@@ -42,49 +57,84 @@ class AuthQueries:
             return {k: row[i] for i, k in enumerate(keys)}
 
 
-    def verify_otp_and_register(self, email, otp) -> tuple[Optional[dict], str]:
-        query = "SELECT otp, otp_expiry, id, email, name, role, country, city, permissions FROM users WHERE email = %s;"
+    def verify_otp_and_register(self, email, otp, purpose: str = OTP_VERIFY_EMAIL) -> tuple[Optional[dict], str]:
+        """
+        Consume the user's live challenge for purpose if otp matches, and mark
+        the user registered (the code proves the email), in one statement.
+        Only a failed check takes a second one, to count the attempt and say why.
+        """
+        params = {"email": email, "purpose": purpose, "code_hash": hash_otp(email, purpose, otp)}
+        query = """
+        WITH consumed AS (
+            UPDATE auth_challenges c SET consumed_at = CURRENT_TIMESTAMP
+            FROM users u
+            WHERE u.email = %(email)s AND c.user_id = u.id AND c.purpose = %(purpose)s
+              AND c.code_hash = %(code_hash)s AND c.expires_at > CURRENT_TIMESTAMP
+              AND c.consumed_at IS NULL AND c.attempts < c.max_attempts
+            RETURNING c.user_id
+        )
+        UPDATE users u SET is_registered = TRUE
+        FROM consumed
+        WHERE u.id = consumed.user_id
+        RETURNING u.id, u.email, u.name, u.role, u.country, u.city, u.permissions, u.is_registered;
+        """
+        failed_query = """
+        WITH failed AS (
+            UPDATE auth_challenges c SET attempts = c.attempts + 1
+            FROM users u
+            WHERE u.email = %(email)s AND c.user_id = u.id AND c.purpose = %(purpose)s AND c.consumed_at IS NULL
+            RETURNING c.expires_at > CURRENT_TIMESTAMP AS live, c.attempts > c.max_attempts AS exhausted
+        )
+        SELECT EXISTS (SELECT 1 FROM users WHERE email = %(email)s) AS user_exists, f.live, f.exhausted
+        FROM (SELECT 1) one
+        LEFT JOIN failed f ON TRUE;
+        """
         with self.conn.cursor() as cur:
-            cur.execute(query, (email,))
+            cur.execute(query, params)
             row = cur.fetchone()
-            if not row:
-                return None, "User not found"
-
-            stored_otp, expiry, user_id, email, name, role, country, city, permissions = row
-            if not expiry:
-                return None, "OTP expiry not found or not set"
+            if row:
+                self.conn.commit()
+                keys = ["id", "email", "name", "role", "country", "city", "permissions", "is_registered"]
+                return {k: row[i] for i, k in enumerate(keys)}, "OTP verified"
 
-            # Ensure both datetimes are timezone-aware for comparison
-            current_time = datetime.now(timezone.utc)
-            if expiry.tzinfo is None:
-                # If expiry is timezone-naive, assume it's in UTC
-                expiry = expiry.replace(tzinfo=timezone.utc)
-            
-            if current_time > expiry:
+            cur.execute(failed_query, params)
+            user_exists, live, exhausted = cur.fetchone()
+            self.conn.commit()
+            if not user_exists:
+                return None, "User not found"
+            if live is None:
+                return None, "No pending OTP. Please request a new one"
+            if not live:
                 return None, "OTP expired"
-            if stored_otp != otp:
-                return None, "Invalid OTP"
+            if exhausted:
+                return None, "Too many incorrect attempts. Please request a new OTP"
+            return None, "Invalid OTP"
 
-            update_query = "UPDATE users SET is_registered = TRUE, otp = NULL, otp_expiry = NULL WHERE email = %s;"
-            cur.execute(update_query, (email,))
+    def resend_otp(self, email, otp, otp_expiry, purpose: str = OTP_VERIFY_EMAIL):
+        """Replace the user's challenge for purpose with a new code (attempts start over)"""
+        query = """
+        INSERT INTO auth_challenges AS c (user_id, purpose, code_hash, expires_at)
+        SELECT id, %s, %s, %s FROM users WHERE email = %s
+        ON CONFLICT (user_id, purpose) DO UPDATE
+            SET code_hash = EXCLUDED.code_hash, expires_at = EXCLUDED.expires_at,
+                attempts = 0, consumed_at = NULL, created_at = CURRENT_TIMESTAMP;
+        """
+        with self.conn.cursor() as cur:
+            cur.execute(query, (purpose, hash_otp(email, purpose, otp), otp_expiry, email))
             self.conn.commit()
-            user_info = {
-                "id": user_id,
-                "email": email,
-                "name": name,
-                "role": role,
-                "country": country,
-                "city": city,
-                "permissions": permissions,
-                "is_registered": True
-            }
-            return user_info, "OTP verified"
-
-    def resend_otp(self, email, otp, otp_expiry):
-        query = "UPDATE users SET otp = %s, otp_expiry = %s WHERE email = %s;"
+
+    def purge_auth_challenges(self) -> int:
+        """Delete expired and consumed challenges; returns how many"""
+        query = """
+        DELETE FROM auth_challenges
+        WHERE expires_at < CURRENT_TIMESTAMP OR consumed_at IS NOT NULL;
+        """
         with self.conn.cursor() as cur:
-            cur.execute(query, (otp, otp_expiry, email))
+            cur.execute(query)
+            deleted = cur.rowcount
             self.conn.commit()
+            return deleted
+
     def update_password(self, email: str, new_password_hash: str):
         query = "UPDATE users SET password_hash = %s WHERE email = %s;"
         with self.conn.cursor() as cur:
@@ -1,7 +1,55 @@
 import json
+import re
+from datetime import date
 from psycopg2.extras import RealDictCursor
 from typing import List, Optional
 
+from utils.hyperloglog import REGISTERS, HyperLogLog, position
+
+# Allowed admin transitions for blog submissions
+BLOG_STATUS_TRANSITIONS = {
+    "draft": ("pending", "review"),
+    "pending": ("review", "approved", "revision", "rejected"),
+    "review": ("approved", "revision", "rejected"),
+    "revision": ("pending", "review", "approved", "rejected"),
+    "approved": ("posted", "revision", "rejected"),
+    "rejected": ("review", "revision"),
+    "posted": ("revision",),
+}
+
+# Engagement weights and decay for blog_rankings (see migrations/0011_blog_rankings)
+RANKING_WEIGHTS = {"view": 1.0, "like": 3.0, "comment": 5.0, "share": 8.0}
+RANKING_HALF_LIFE_HOURS = 24
+RANKING_EPOCH = "2025-01-01"
+# Events committed this long after their timestamp may still be missed by a refresh
+RANKING_EVENT_LAG_SECONDS = 5
+# pg_try_advisory_xact_lock key, so only one worker refreshes at a time
+RANKING_LOCK_ID = 720390002
+
+# Monthly-partitioned engagement tables and their partition column (migrations/0013)
+ENGAGEMENT_PARTITIONS = {"blog_views": "viewed_at", "blog_shares": "shared_at"}
+ENGAGEMENT_LOCK_ID = 720390003
+_PARTITION_MONTH = re.compile(r"_y(\d{4})m(\d{2})$")
+
+# Raw rows before this are read from blog_engagement_daily instead
+_ROLLED_UP_UNTIL = ("COALESCE((SELECT MAX(range_end) FROM blog_engagement_rollups WHERE parent = '{parent}'), "
+                    "'-infinity'::date)")
+VIEW_TOTAL_SQL = f"""
+    (SELECT COALESCE(SUM(views), 0) FROM blog_engagement_daily WHERE blog_id = %(blog_id)s)
+    + (SELECT COUNT(*) FROM blog_views
+       WHERE blog_id = %(blog_id)s AND viewed_at >= {_ROLLED_UP_UNTIL.format(parent="blog_views")})
+    + COALESCE((SELECT estimate FROM blog_guest_view_totals WHERE blog_id = %(blog_id)s), 0)
+"""
+SHARE_TOTAL_SQL = f"""
+    (SELECT COALESCE(SUM(shares), 0) FROM blog_engagement_daily WHERE blog_id = %(blog_id)s)
+    + (SELECT COUNT(*) FROM blog_shares
+       WHERE blog_id = %(blog_id)s AND shared_at >= {_ROLLED_UP_UNTIL.format(parent="blog_shares")})
+"""
+
+RANKED_SORTS = {
+    "trending": "r.trending_score",
+    "popular": "r.popular_score",
+}
 
 class BloggerQueries:
     def __init__(self, conn):
@@ -172,6 +220,48 @@ class BloggerQueries:
             self.conn.commit()
             return cur.fetchone()
 
+    def bulk_update_blog_submission_status(self, blog_ids: List[int], status: str, admin_comments: str = None):
+        """
+        Apply one status to many submissions in a single UPDATE ... RETURNING,
+        skipping rows whose current status does not allow the transition.
+        Returns (updated rows, per-id outcomes in request order).
+        """
+        allowed_from = [current for current, targets in BLOG_STATUS_TRANSITIONS.items() if status in targets]
+        update_query = """
+            UPDATE blog_submissions b
+            SET status = %s, admin_comments = %s, updated_at = CURRENT_TIMESTAMP
+            FROM (
+                SELECT id, status FROM blog_submissions
+                WHERE id = ANY(%s) AND COALESCE(status, 'draft') = ANY(%s)
+                FOR UPDATE
+            ) previous
+            WHERE b.id = previous.id
+            RETURNING b.id, b.user_id, b.title, b.status, previous.status AS previous_status;
+        """
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(update_query, (status, admin_comments, blog_ids, allowed_from))
+            updated = {row["id"]: row for row in cur.fetchall()}
+
+            skipped = [blog_id for blog_id in blog_ids if blog_id not in updated]
+            current = {}
+            if skipped:
+                cur.execute("SELECT id, status FROM blog_submissions WHERE id = ANY(%s);", (skipped,))
+                current = {row["id"]: row["status"] for row in cur.fetchall()}
+            self.conn.commit()
+
+        outcomes = []
+        for blog_id in blog_ids:
+            if blog_id in updated:
+                outcomes.append({"id": blog_id, "outcome": "updated",
+                                 "from": updated[blog_id]["previous_status"], "to": status})
+            elif blog_id in current:
+                outcomes.append({"id": blog_id, "outcome": "invalid_transition",
+                                 "from": current[blog_id], "to": status})
+            else:
+                outcomes.append({"id": blog_id, "outcome": "not_found"})
+
+        return list(updated.values()), outcomes
+
     def update_blog_submission(self, blog_id: int, title: str = None, excerpt: str = None,
                               featured_image_url: str = None, content: str = None,
                               category: str = None, tags: List[str] = None, language: str = None,
@@ -244,8 +334,14 @@ class BloggerQueries:
             result = cur.fetchone()
             return result['count'] if result else 0
 
-    def fetch_approved_blogs(self, skip: int = 0, limit: int = 6, category: str = None, search: str = None) -> List[dict]:
-        query = """
+    def fetch_approved_blogs(self, skip: int = 0, limit: int = 6, category: str = None, search: str = None,
+                             sort: str = "latest") -> List[dict]:
+        """
+        sort: latest (created_at), or trending/popular from the precomputed
+        blog_rankings; ranked listings only include blogs with engagement.
+        """
+        ranked = sort in RANKED_SORTS
+        query = f"""
             SELECT
                 bs.*,
                 u.name AS author_name,
@@ -253,7 +349,7 @@ class BloggerQueries:
                 b.author_name AS blogger_name,
                 b.author_image_url,
                 b.short_bio
-            FROM blog_submissions bs
+            FROM {"blog_rankings r JOIN blog_submissions bs ON bs.id = r.blog_id" if ranked else "blog_submissions bs"}
             JOIN users u ON bs.user_id = u.id
             LEFT JOIN bloggers b ON bs.user_id = b.user_id
             WHERE bs.status IN ('approved', 'posted')
@@ -270,7 +366,10 @@ class BloggerQueries:
             search_param = f"%{search}%"
             params.extend([search_param, search_param, search_param])
 
-        query += " ORDER BY bs.created_at DESC OFFSET %s LIMIT %s"
+        if ranked:
+            query += f" ORDER BY {RANKED_SORTS[sort]} DESC, r.blog_id DESC OFFSET %s LIMIT %s"
+        else:
+            query += " ORDER BY bs.created_at DESC OFFSET %s LIMIT %s"
         params.extend([skip, limit])
 
         with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
@@ -305,46 +404,106 @@ class BloggerQueries:
         """
         Record a blog view. Returns True if view was counted (unique), False if duplicate.
         For authenticated users: checks (blog_id, user_id)
-        For guests: checks (blog_id, ip_address)
+        For guests: folds the IP into HyperLogLog sketches; True if the estimate may have grown
         """
-        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            if user_id:
-                # For authenticated users, check if they already viewed this blog
-                cur.execute("""
-                    SELECT id FROM blog_views 
-                    WHERE blog_id = %s AND user_id = %s
-                """, (blog_id, user_id))
-            else:
-                # For guests, check if this IP already viewed this blog
-                cur.execute("""
-                    SELECT id FROM blog_views 
-                    WHERE blog_id = %s AND ip_address = %s AND user_id IS NULL
-                """, (blog_id, ip_address))
-            
-            existing_view = cur.fetchone()
-            
-            if existing_view:
-                # Already viewed - don't count again
-                print(f"View already exists for blog {blog_id}, user_id {user_id}, IP {ip_address}")
-                return False
-            
-            # Insert new view
-            cur.execute("""
-                INSERT INTO blog_views (blog_id, user_id, ip_address, user_agent)
-                VALUES (%s, %s, %s, %s)
-                RETURNING id
-            """, (blog_id, user_id, ip_address, user_agent))
-            
-            result = cur.fetchone()
-            if result:
+        if not user_id:
+            return self._record_guest_view(blog_id, ip_address or "unknown")
+
+        # Claiming the (blog, user) dedupe row and inserting the view is one
+        # statement, so concurrent views by the same user count once
+        query = """
+            WITH claimed AS (
+                INSERT INTO blog_view_dedupe (blog_id, user_id)
+                VALUES (%(blog_id)s, %(user_id)s)
+                ON CONFLICT DO NOTHING
+                RETURNING blog_id
+            )
+            INSERT INTO blog_views (blog_id, user_id, ip_address, user_agent)
+            SELECT %(blog_id)s, %(user_id)s, %(ip_address)s, %(user_agent)s FROM claimed
+            RETURNING id
+        """
+        try:
+            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(query, {
+                    "blog_id": blog_id, "user_id": user_id, "ip_address": ip_address, "user_agent": user_agent,
+                })
+                if cur.fetchone() is None:
+                    # Already viewed - don't count again
+                    self.conn.commit()
+                    return False
+
                 # Update the cached view count
                 self._update_blog_count(blog_id, 'view_count')
-                self.conn.commit()
-                print(f"New view recorded for blog {blog_id}")
-                return True
-            
             self.conn.commit()
-            return False
+            return True
+        except Exception as e:
+            self.conn.rollback()
+            raise e
+
+    def _record_guest_view(self, blog_id: int, ip_address: str) -> bool:
+        """
+        Raise the IP's register in today's and the all-time sketch, in place.
+        The upserts only write when the register grows, so repeat and most new
+        views write nothing once a sketch has warmed up.
+        """
+        index, rank = position(ip_address)
+        query = """
+            WITH day_sketch AS (
+                INSERT INTO blog_guest_view_sketches AS s (blog_id, day, registers)
+                VALUES (%(blog_id)s, CURRENT_DATE, set_byte(decode(repeat('00', %(registers)s), 'hex'), %(index)s, %(rank)s))
+                ON CONFLICT (blog_id, day) DO UPDATE
+                    SET registers = set_byte(s.registers, %(index)s, %(rank)s), updated_at = CURRENT_TIMESTAMP
+                    WHERE get_byte(s.registers, %(index)s) < %(rank)s
+                RETURNING registers
+            ),
+            total_sketch AS (
+                INSERT INTO blog_guest_view_totals AS t (blog_id, registers)
+                VALUES (%(blog_id)s, set_byte(decode(repeat('00', %(registers)s), 'hex'), %(index)s, %(rank)s))
+                ON CONFLICT (blog_id) DO UPDATE
+                    SET registers = set_byte(t.registers, %(index)s, %(rank)s)
+                    WHERE get_byte(t.registers, %(index)s) < %(rank)s
+                RETURNING registers
+            )
+            SELECT (SELECT registers FROM day_sketch) AS day_registers,
+                   (SELECT registers FROM total_sketch) AS total_registers
+        """
+        try:
+            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(query, {"blog_id": blog_id, "registers": REGISTERS, "index": index, "rank": rank})
+                changed = cur.fetchone()
+
+                if changed["day_registers"] is not None:
+                    cur.execute("""
+                        UPDATE blog_guest_view_sketches SET estimate = %s
+                        WHERE blog_id = %s AND day = CURRENT_DATE
+                    """, (HyperLogLog(bytes(changed["day_registers"])).estimate(), blog_id))
+
+                if changed["total_registers"] is None:
+                    self.conn.commit()
+                    return False
+
+                cur.execute(
+                    "UPDATE blog_guest_view_totals SET estimate = %s WHERE blog_id = %s",
+                    (HyperLogLog(bytes(changed["total_registers"])).estimate(), blog_id)
+                )
+                self._update_blog_count(blog_id, 'view_count')
+            self.conn.commit()
+            return True
+        except Exception as e:
+            self.conn.rollback()
+            raise e
+
+    def get_guest_unique_views(self, blog_id: int, date_from: date = None, date_to: date = None) -> int:
+        """Estimated distinct guest IPs over the day sketches in [date_from, date_to]"""
+        query = """
+            SELECT registers FROM blog_guest_view_sketches
+            WHERE blog_id = %s
+              AND (%s::date IS NULL OR day >= %s::date)
+              AND (%s::date IS NULL OR day <= %s::date)
+        """
+        with self.conn.cursor() as cur:
+            cur.execute(query, (blog_id, date_from, date_from, date_to, date_to))
+            return HyperLogLog.union(row[0] for row in cur.fetchall()).estimate()
 
     def record_blog_like(self, blog_id: int, user_id: int = None, ip_address: str = None) -> dict:
         """
@@ -426,10 +585,7 @@ class BloggerQueries:
             cur.execute(query, (blog_id,))
             comments = cur.fetchall()
             
-            # Get replies for each comment
-            for comment in comments:
-                comment['replies'] = self._get_comment_replies(comment['id'], only_approved)
-            
+            self._attach_comment_replies(comments, only_approved)
             return comments
 
     def get_blog_comments_paginated(self, blog_id: int, skip: int, limit: int, only_approved: bool = True) -> list:
@@ -450,14 +606,16 @@ class BloggerQueries:
             cur.execute(query, (blog_id, limit, skip))
             comments = cur.fetchall()
             
-            # Get replies for each comment
-            for comment in comments:
-                comment['replies'] = self._get_comment_replies(comment['id'], only_approved)
-            
+            self._attach_comment_replies(comments, only_approved)
+            return comments
+
+    def _attach_comment_replies(self, comments: list, only_approved: bool = True) -> list:
+        """Attach replies to each comment, fetched for all of them in one query"""
+        for comment in comments:
+            comment['replies'] = []
+        if not comments:
             return comments
 
-    def _get_comment_replies(self, parent_id: int, only_approved: bool = True) -> list:
-        """Get replies to a specific comment"""
         query = """
             SELECT 
                 bc.*,
@@ -465,13 +623,16 @@ class BloggerQueries:
                 u.email as user_email
             FROM blog_comments bc
             LEFT JOIN users u ON bc.user_id = u.id
-            WHERE bc.parent_id = %s
+            WHERE bc.parent_id = ANY(%s)
             """ + ("AND bc.is_approved = TRUE " if only_approved else "") + """
             ORDER BY bc.created_at ASC
         """
+        by_id = {comment['id']: comment for comment in comments}
         with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(query, (parent_id,))
-            return cur.fetchall()
+            cur.execute(query, (list(by_id),))
+            for reply in cur.fetchall():
+                by_id[reply['parent_id']]['replies'].append(reply)
+        return comments
 
     def approve_comment(self, comment_id: int) -> bool:
         """Approve a comment"""
@@ -511,7 +672,7 @@ class BloggerQueries:
             return False
 
     def record_blog_share(self, blog_id: int, platform: str, user_id: int = None, ip_address: str = None) -> bool:
-        """Record a blog share event"""
+        """Record a blog share event and bump the blog's share counters"""
         query = """
             INSERT INTO blog_shares (blog_id, user_id, ip_address, share_platform)
             VALUES (%s, %s, %s, %s)
@@ -520,32 +681,65 @@ class BloggerQueries:
         with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute(query, (blog_id, user_id, ip_address, platform))
             result = cur.fetchone()
+            if result:
+                cur.execute("""
+                    UPDATE blog_submissions
+                    SET share_count = share_count + 1,
+                        share_platform_counts = share_platform_counts
+                            || jsonb_build_object(%(platform)s, COALESCE((share_platform_counts ->> %(platform)s)::int, 0) + 1)
+                    WHERE id = %(blog_id)s
+                """, {"blog_id": blog_id, "platform": platform})
             self.conn.commit()
             return result is not None
 
+    def get_blog_engagement_counts(self, blog_ids: List[int]) -> List[dict]:
+        """
+        Cached engagement counters for public blogs, in the order of blog_ids.
+        One row read per blog; unknown or unpublished ids are left out.
+        """
+        query = """
+            SELECT id AS blog_id, COALESCE(view_count, 0) AS views, COALESCE(like_count, 0) AS likes,
+                   COALESCE(comment_count, 0) AS comments,
+                   share_count AS shares, share_platform_counts AS share_breakdown
+            FROM blog_submissions
+            WHERE id = ANY(%s) AND status IN ('approved', 'posted')
+        """
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(query, (list(blog_ids),))
+            by_id = {row['blog_id']: row for row in cur.fetchall()}
+        return [by_id[blog_id] for blog_id in dict.fromkeys(blog_ids) if blog_id in by_id]
+
     def get_blog_engagement_stats(self, blog_id: int) -> dict:
         """Get comprehensive engagement statistics for a blog"""
         query = """
             SELECT 
-                (SELECT COUNT(*) FROM blog_views WHERE blog_id = %s) as total_views,
-                (SELECT COUNT(*) FROM blog_likes WHERE blog_id = %s) as total_likes,
-                (SELECT COUNT(*) FROM blog_comments WHERE blog_id = %s AND is_approved = TRUE) as total_comments,
-                (SELECT COUNT(*) FROM blog_shares WHERE blog_id = %s) as total_shares
-        """
+                {VIEW_TOTAL_SQL} as total_views,
+                (SELECT COUNT(*) FROM blog_likes WHERE blog_id = %(blog_id)s) as total_likes,
+                (SELECT COUNT(*) FROM blog_comments WHERE blog_id = %(blog_id)s AND is_approved = TRUE) as total_comments,
+                {SHARE_TOTAL_SQL} as total_shares
+        """.format(VIEW_TOTAL_SQL=VIEW_TOTAL_SQL, SHARE_TOTAL_SQL=SHARE_TOTAL_SQL)
         with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(query, (blog_id, blog_id, blog_id, blog_id))
+            cur.execute(query, {"blog_id": blog_id})
             return cur.fetchone()
 
     def get_blog_share_stats(self, blog_id: int) -> dict:
         """Get share statistics broken down by platform"""
-        query = """
-            SELECT share_platform, COUNT(*) as share_count
-            FROM blog_shares
-            WHERE blog_id = %s
+        query = f"""
+            SELECT share_platform, SUM(n) as share_count
+            FROM (
+                SELECT p.key AS share_platform, p.value::int AS n
+                FROM blog_engagement_daily d, jsonb_each_text(d.share_platforms) p
+                WHERE d.blog_id = %(blog_id)s
+                UNION ALL
+                SELECT share_platform, COUNT(*)
+                FROM blog_shares
+                WHERE blog_id = %(blog_id)s AND shared_at >= {_ROLLED_UP_UNTIL.format(parent="blog_shares")}
+                GROUP BY share_platform
+            ) platforms
             GROUP BY share_platform
         """
         with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(query, (blog_id,))
+            cur.execute(query, {"blog_id": blog_id})
             results = cur.fetchall()
             return {row['share_platform']: row['share_count'] for row in results}
 
@@ -568,12 +762,15 @@ class BloggerQueries:
         
         # For comments, only count approved ones
         if count_type == 'comment_count':
-            count_query = f"SELECT COUNT(*) as count FROM {source_table} WHERE blog_id = %s AND is_approved = TRUE"
+            count_query = f"SELECT COUNT(*) as count FROM {source_table} WHERE blog_id = %(blog_id)s AND is_approved = TRUE"
+        elif count_type == 'view_count':
+            # Rolled-up and recent authenticated views plus the guest sketch estimate
+            count_query = f"SELECT {VIEW_TOTAL_SQL} as count"
         else:
-            count_query = f"SELECT COUNT(*) as count FROM {source_table} WHERE blog_id = %s"
+            count_query = f"SELECT COUNT(*) as count FROM {source_table} WHERE blog_id = %(blog_id)s"
         
         with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            cur.execute(count_query, (blog_id,))
+            cur.execute(count_query, {"blog_id": blog_id})
             result = cur.fetchone()
             new_count = result['count'] if result else 0
             
@@ -583,4 +780,223 @@ class BloggerQueries:
                 SET {count_type} = %s, updated_at = CURRENT_TIMESTAMP
                 WHERE id = %s
             """
-            cur.execute(update_query, (new_count, blog_id))
\ No newline at end of file
+            cur.execute(update_query, (new_count, blog_id))
+
+    # ==================== BLOG RANKINGS ====================
+
+    def refresh_blog_rankings(self, rebuild: bool = False) -> Optional[int]:
+        """
+        Fold engagement events since the last refresh into blog_rankings.
+        rebuild recomputes every score from all events (drops unlikes and deleted
+        comments, which incremental refreshes never subtract). Returns the number
+        of blogs updated, or None if another worker is already refreshing.
+        """
+        events_query = """
+            WITH guest_views AS (
+                -- Guest views live in sketches: take each day sketch's growth since the last refresh
+                UPDATE blog_guest_view_sketches s SET ranked_estimate = s.estimate
+                FROM (
+                    SELECT blog_id, day, ranked_estimate FROM blog_guest_view_sketches
+                    WHERE estimate > ranked_estimate
+                    FOR UPDATE
+                ) old
+                WHERE s.blog_id = old.blog_id AND s.day = old.day
+                RETURNING s.blog_id, s.updated_at, %(view)s * (s.estimate - old.ranked_estimate) AS w
+            ),
+            events AS (
+                SELECT blog_id, viewed_at AS at, %(view)s AS w FROM blog_views
+                WHERE viewed_at > %(since)s AND viewed_at <= %(until)s AND viewed_at >= %(views_raw_from)s
+                UNION ALL
+                -- On rebuild, months whose raw rows were rolled up count from the daily totals
+                SELECT blog_id, day + INTERVAL '12 hours', %(view)s * views FROM blog_engagement_daily
+                WHERE day < %(views_raw_from)s AND views > 0
+                UNION ALL
+                SELECT blog_id, day + INTERVAL '12 hours', %(share)s * shares FROM blog_engagement_daily
+                WHERE day < %(shares_raw_from)s AND shares > 0
+                UNION ALL
+                SELECT blog_id, liked_at, %(like)s FROM blog_likes
+                WHERE liked_at > %(since)s AND liked_at <= %(until)s
+                UNION ALL
+                SELECT blog_id, created_at, %(comment)s FROM blog_comments
+                WHERE created_at > %(since)s AND created_at <= %(until)s AND is_approved = TRUE
+                UNION ALL
+                SELECT blog_id, shared_at, %(share)s FROM blog_shares
+                WHERE shared_at > %(since)s AND shared_at <= %(until)s AND shared_at >= %(shares_raw_from)s
+                UNION ALL
+                SELECT blog_id, updated_at, w FROM guest_views
+            ),
+            scored AS (
+                -- ln of each event's weight at the epoch scale; summed with log-sum-exp below
+                SELECT blog_id, w,
+                    ln(w) + EXTRACT(EPOCH FROM at - %(epoch)s::timestamp) / %(half_life)s * ln(2) AS x
+                FROM events
+                WHERE at IS NOT NULL
+            ),
+            peaks AS (
+                SELECT blog_id, w, x, MAX(x) OVER (PARTITION BY blog_id) AS m FROM scored
+            ),
+            deltas AS (
+                SELECT blog_id, MAX(m) + ln(SUM(exp(x - m))) AS trending, SUM(w) AS popular
+                FROM peaks
+                GROUP BY blog_id
+            )
+            INSERT INTO blog_rankings AS r (blog_id, trending_score, popular_score)
+            SELECT d.blog_id, d.trending, d.popular
+            FROM deltas d
+            JOIN blog_submissions bs ON bs.id = d.blog_id AND bs.status IN ('approved', 'posted')
+            ON CONFLICT (blog_id) DO UPDATE SET
+                trending_score = GREATEST(r.trending_score, EXCLUDED.trending_score)
+                    + ln(1 + exp(-abs(r.trending_score - EXCLUDED.trending_score))),
+                popular_score = r.popular_score + EXCLUDED.popular_score,
+                updated_at = CURRENT_TIMESTAMP
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("SELECT pg_try_advisory_xact_lock(%s)", (RANKING_LOCK_ID,))
+                if not cur.fetchone()[0]:
+                    self.conn.rollback()
+                    return None
+
+                cur.execute("SELECT events_until FROM blog_ranking_state WHERE id = 1 FOR UPDATE")
+                state = cur.fetchone()
+                # Incremental refreshes stay within raw retention; a rebuild also reads the rollups
+                raw_from = {"views_raw_from": "-infinity", "shares_raw_from": "-infinity"}
+                if rebuild or not state:
+                    cur.execute("TRUNCATE blog_rankings")
+                    cur.execute("UPDATE blog_guest_view_sketches SET ranked_estimate = 0 WHERE ranked_estimate > 0")
+                    since = "-infinity"
+                    cur.execute(f"""
+                        SELECT {_ROLLED_UP_UNTIL.format(parent="blog_views")},
+                               {_ROLLED_UP_UNTIL.format(parent="blog_shares")}
+                    """)
+                    raw_from["views_raw_from"], raw_from["shares_raw_from"] = cur.fetchone()
+                else:
+                    since = state[0]
+
+                cur.execute("SELECT LOCALTIMESTAMP - make_interval(secs => %s)", (RANKING_EVENT_LAG_SECONDS,))
+                until = cur.fetchone()[0]
+
+                cur.execute(events_query, {
+                    **RANKING_WEIGHTS,
+                    **raw_from,
+                    "since": since,
+                    "until": until,
+                    "epoch": RANKING_EPOCH,
+                    "half_life": RANKING_HALF_LIFE_HOURS * 3600,
+                })
+                updated = cur.rowcount
+
+                # Blogs taken down since they were ranked
+                cur.execute("""
+                    DELETE FROM blog_rankings r
+                    USING blog_submissions bs
+                    WHERE bs.id = r.blog_id AND bs.status NOT IN ('approved', 'posted')
+                """)
+
+                cur.execute("""
+                    INSERT INTO blog_ranking_state (id, events_until, refreshed_at)
+                    VALUES (1, %s, CURRENT_TIMESTAMP)
+                    ON CONFLICT (id) DO UPDATE
+                        SET events_until = EXCLUDED.events_until, refreshed_at = EXCLUDED.refreshed_at
+                """, (until,))
+            self.conn.commit()
+            return updated
+        except Exception as e:
+            self.conn.rollback()
+            raise e
+
+    # ==================== ENGAGEMENT PARTITIONS ====================
+
+    def maintain_engagement_partitions(self, retention_months: int = 0, months_ahead: int = 2) -> Optional[dict]:
+        """
+        Create the coming months' partitions (and the months of any rows caught
+        by the default partitions), roll every closed month up into
+        blog_engagement_daily, and drop rolled-up months older than
+        retention_months (0 keeps raw rows forever). Returns what was done, or
+        None if another worker is already maintaining the partitions.
+        """
+        rollups = {
+            "blog_views": """
+                INSERT INTO blog_engagement_daily AS d (blog_id, day, views)
+                SELECT blog_id, viewed_at::date, COUNT(*) FROM {partition} GROUP BY 1, 2
+                ON CONFLICT (blog_id, day) DO UPDATE SET views = d.views + EXCLUDED.views
+            """,
+            "blog_shares": """
+                INSERT INTO blog_engagement_daily AS d (blog_id, day, shares, share_platforms)
+                SELECT blog_id, day, SUM(n), jsonb_object_agg(share_platform, n)
+                FROM (
+                    SELECT blog_id, shared_at::date AS day, share_platform, COUNT(*) AS n
+                    FROM {partition} GROUP BY 1, 2, 3
+                ) platforms
+                GROUP BY blog_id, day
+                ON CONFLICT (blog_id, day) DO UPDATE
+                    SET shares = d.shares + EXCLUDED.shares, share_platforms = EXCLUDED.share_platforms
+            """,
+        }
+        done = {"rolled_up": [], "dropped": [], "defaulted": {}}
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("SELECT pg_try_advisory_xact_lock(%s)", (ENGAGEMENT_LOCK_ID,))
+                if not cur.fetchone()[0]:
+                    self.conn.rollback()
+                    return None
+                cur.execute("SET LOCAL lock_timeout = '5s'")
+                cur.execute("SELECT date_trunc('month', LOCALTIMESTAMP)::date")
+                current_month = cur.fetchone()[0]
+
+                for parent, column in ENGAGEMENT_PARTITIONS.items():
+                    # Rows in the default partition mean a month was missing when they
+                    # were inserted; creating their months moves them out of it
+                    cur.execute(f"""
+                        SELECT date_trunc('month', {column})::date, COUNT(*) FROM "{parent}_default" GROUP BY 1
+                    """)
+                    stranded = cur.fetchall()
+                    if stranded:
+                        done["defaulted"][parent] = sum(row[1] for row in stranded)
+                    cur.execute("""
+                        SELECT create_monthly_partition(%s, month)
+                        FROM unnest(%s::date[] || ARRAY(
+                            SELECT (%s + make_interval(months => m))::date FROM generate_series(0, %s) m
+                        )) month
+                    """, (parent, [row[0] for row in stranded], current_month, months_ahead))
+
+                    cur.execute("""
+                        SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+                        WHERE i.inhparent = %s::regclass ORDER BY c.relname
+                    """, (parent,))
+                    partitions = [row[0] for row in cur.fetchall()]
+                    cur.execute("SELECT partition_name FROM blog_engagement_rollups WHERE parent = %s", (parent,))
+                    rolled_up = {row[0] for row in cur.fetchall()}
+
+                    for partition in partitions:
+                        match = _PARTITION_MONTH.search(partition)
+                        if not match or partition in rolled_up:
+                            continue
+                        range_start = date(int(match.group(1)), int(match.group(2)), 1)
+                        range_end = date(range_start.year + range_start.month // 12, range_start.month % 12 + 1, 1)
+                        if range_end > current_month:
+                            continue
+                        cur.execute(rollups[parent].format(partition=f'"{partition}"'))
+                        cur.execute("""
+                            INSERT INTO blog_engagement_rollups (partition_name, parent, range_start, range_end)
+                            VALUES (%s, %s, %s, %s)
+                        """, (partition, parent, range_start, range_end))
+                        done["rolled_up"].append(partition)
+
+                    if retention_months > 0:
+                        cur.execute("""
+                            SELECT partition_name FROM blog_engagement_rollups
+                            WHERE parent = %s AND dropped_at IS NULL
+                              AND range_end <= (%s - make_interval(months => %s))::date
+                        """, (parent, current_month, retention_months))
+                        for (partition,) in cur.fetchall():
+                            cur.execute(f'DROP TABLE IF EXISTS "{partition}"')
+                            cur.execute(
+                                "UPDATE blog_engagement_rollups SET dropped_at = CURRENT_TIMESTAMP WHERE partition_name = %s",
+                                (partition,))
+                            done["dropped"].append(partition)
+            self.conn.commit()
+            return done
+        except Exception as e:
+            self.conn.rollback()
+            raise e
@@ -0,0 +1,36 @@
+from psycopg2.extras import RealDictCursor
+from typing import List, Optional
+
+
+class DiagnosticsQueries:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def get_slow_query_plans(self, limit: int = 50, caller: Optional[str] = None) -> List[dict]:
+        """Most recent captured plans, one row per capture"""
+        query = """
+            SELECT id, query_hash, normalized_sql, caller, route, params_shape,
+                   duration_ms, plan, captured_at
+            FROM slow_query_plans
+            WHERE (%s::text IS NULL OR caller = %s)
+            ORDER BY captured_at DESC
+            LIMIT %s;
+        """
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(query, (caller, caller, limit))
+            return cur.fetchall()
+
+    def get_slow_query_summary(self, limit: int = 50) -> List[dict]:
+        """Captured statement shapes ranked by their worst observed duration"""
+        query = """
+            SELECT query_hash, MIN(normalized_sql) AS normalized_sql, MIN(caller) AS caller,
+                   COUNT(*) AS captures, MAX(duration_ms) AS max_duration_ms,
+                   AVG(duration_ms) AS avg_duration_ms, MAX(captured_at) AS last_captured_at
+            FROM slow_query_plans
+            GROUP BY query_hash
+            ORDER BY max_duration_ms DESC
+            LIMIT %s;
+        """
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(query, (limit,))
+            return cur.fetchall()
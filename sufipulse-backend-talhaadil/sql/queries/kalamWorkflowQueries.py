@@ -0,0 +1,243 @@
+from psycopg2.extras import RealDictCursor
+from typing import Optional
+from fastapi import HTTPException
+
+ADMIN_ROLES = ("admin", "sub-admin")
+
+# Kalam lifecycle. Each action lists who may run it, which submission statuses it
+# can start from (None = no submission yet) and what it writes:
+#   owners       -> role -> kalams column that must hold the actor's user id
+#                   (roles not listed, i.e. admins, may act on any kalam)
+#   submission   -> fixed kalam_submissions columns
+#   comments     -> kalam_submissions column that receives the actor's comments
+#   kalam        -> fixed kalams columns
+#   kalam_params -> kalams columns taken from the caller's values
+KALAM_TRANSITIONS = {
+    "submit": {
+        "roles": ("writer",),
+        "owners": {"writer": "writer_id"},
+        "from": (None, "draft", "submitted", "changes_requested", "admin_rejected"),
+        "to": "submitted",
+        "submission": {"user_approval_status": "pending"},
+        "comments": "writer_comments",
+    },
+    "reopen": {
+        "roles": ADMIN_ROLES,
+        "from": ("draft", "changes_requested", "admin_approved", "admin_rejected"),
+        "to": "submitted",
+        "comments": "admin_comments",
+    },
+    "admin_approve": {
+        "roles": ADMIN_ROLES,
+        "from": ("submitted", "changes_requested", "admin_rejected"),
+        "to": "admin_approved",
+        "comments": "admin_comments",
+    },
+    "admin_reject": {
+        "roles": ADMIN_ROLES,
+        "from": ("submitted", "changes_requested", "admin_approved"),
+        "to": "admin_rejected",
+        "comments": "admin_comments",
+    },
+    "request_changes": {
+        "roles": ADMIN_ROLES,
+        "from": ("submitted", "admin_approved", "admin_rejected"),
+        "to": "changes_requested",
+        "submission": {"user_approval_status": "pending"},
+        "comments": "admin_comments",
+    },
+    "admin_finalize": {
+        "roles": ADMIN_ROLES,
+        "from": ("admin_approved",),
+        "to": "final_approved",
+        "submission": {"user_approval_status": "approved"},
+        "comments": "admin_comments",
+    },
+    "writer_approve": {
+        "roles": ("writer",),
+        "owners": {"writer": "writer_id"},
+        "from": ("admin_approved", "changes_requested"),
+        "to": "final_approved",
+        "submission": {"user_approval_status": "approved"},
+        "comments": "writer_comments",
+    },
+    "writer_reject": {
+        "roles": ("writer",),
+        "owners": {"writer": "writer_id"},
+        "from": ("admin_approved", "changes_requested"),
+        "to": "submitted",
+        "submission": {"user_approval_status": "rejected"},
+        "comments": "writer_comments",
+    },
+    "assign_vocalist": {
+        "roles": ADMIN_ROLES,
+        "from": ("final_approved",),
+        "to": "final_approved",
+        "submission": {"vocalist_approval_status": "pending"},
+        "kalam_params": ("vocalist_id",),
+    },
+    "vocalist_approve": {
+        "roles": ("vocalist",) + ADMIN_ROLES,
+        "owners": {"vocalist": "vocalist_id"},
+        "from": ("final_approved",),
+        "to": "complete_approved",
+        "submission": {"vocalist_approval_status": "approved"},
+    },
+    "vocalist_reject": {
+        "roles": ("vocalist",) + ADMIN_ROLES,
+        "owners": {"vocalist": "vocalist_id"},
+        "from": ("final_approved", "complete_approved"),
+        "to": "final_approved",
+        "submission": {"vocalist_approval_status": "rejected", "user_approval_status": "pending"},
+        "kalam": {"vocalist_id": None},
+    },
+    "publish": {
+        "roles": ADMIN_ROLES,
+        "from": ("complete_approved",),
+        "to": "posted",
+        "kalam_params": ("youtube_link",),
+        "kalam_published": True,
+    },
+}
+
+# Target statuses admins may set through the generic status endpoint
+ADMIN_STATUS_ACTIONS = {
+    "submitted": "reopen",
+    "admin_approved": "admin_approve",
+    "admin_rejected": "admin_reject",
+    "changes_requested": "request_changes",
+    "final_approved": "admin_finalize",
+}
+
+
+class KalamWorkflowQueries:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def apply_kalam_transition(self, kalam_id: int, action: str, actor_id: int, actor_role: str,
+                               comments: Optional[str] = None, **kalam_values) -> dict:
+        """
+        Run one workflow action on a kalam.
+        The kalam row is locked with SELECT ... FOR UPDATE, the transition is checked
+        against KALAM_TRANSITIONS (role, ownership of the kalam, current status), then the submission update, the optional kalams
+        update and the log entry are written by a single statement and committed.
+        Returns the updated submission row with the updated kalam (if any) under "kalam".
+        """
+        transition = KALAM_TRANSITIONS[action]
+        if actor_role not in transition["roles"]:
+            raise HTTPException(status_code=403, detail=f"Not authorized to {action.replace('_', ' ')} this kalam")
+
+        lock_query = """
+            SELECT k.id, k.writer_id, k.vocalist_id, ks.id AS submission_id, ks.status
+            FROM kalams k
+            LEFT JOIN kalam_submissions ks ON ks.kalam_id = k.id
+            WHERE k.id = %s
+            ORDER BY ks.id DESC
+            LIMIT 1
+            FOR UPDATE OF k;
+        """
+
+        try:
+            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(lock_query, (kalam_id,))
+                current = cur.fetchone()
+                if not current:
+                    raise HTTPException(status_code=404, detail="Kalam not found")
+
+                owner_column = transition.get("owners", {}).get(actor_role)
+                if owner_column and current[owner_column] != int(actor_id):
+                    raise HTTPException(
+                        status_code=403, detail=f"Not authorized to {action.replace('_', ' ')} this kalam"
+                    )
+
+                from_status = current["status"]
+                if from_status not in transition["from"]:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Cannot {action.replace('_', ' ')} a kalam in {from_status or 'unsubmitted'} status"
+                    )
+
+                query, params = self._build_transition_statement(
+                    kalam_id, current["submission_id"], action, transition, from_status,
+                    actor_id, actor_role, comments, kalam_values
+                )
+                cur.execute(query, params)
+                result = cur.fetchone()
+            self.conn.commit()
+            return result
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    def _build_transition_statement(self, kalam_id: int, submission_id: Optional[int], action: str,
+                                    transition: dict, from_status: Optional[str], actor_id: int,
+                                    actor_role: str, comments: Optional[str], kalam_values: dict) -> tuple:
+        submission_fields = {"status": transition["to"], **transition.get("submission", {})}
+        if transition.get("comments"):
+            submission_fields[transition["comments"]] = comments
+
+        params = []
+        if submission_id is None:
+            columns = ["kalam_id"] + list(submission_fields)
+            submission_sql = f"""
+                INSERT INTO kalam_submissions ({', '.join(columns)})
+                VALUES ({', '.join(['%s'] * len(columns))})
+                RETURNING *
+            """
+            params.extend([kalam_id] + list(submission_fields.values()))
+        else:
+            assignments = ", ".join(f"{column} = %s" for column in submission_fields)
+            submission_sql = f"""
+                UPDATE kalam_submissions
+                SET {assignments}, updated_at = CURRENT_TIMESTAMP
+                WHERE id = %s
+                RETURNING *
+            """
+            params.extend(list(submission_fields.values()) + [submission_id])
+
+        kalam_fields = dict(transition.get("kalam", {}))
+        for column in transition.get("kalam_params", ()):
+            kalam_fields[column] = kalam_values[column]
+
+        kalam_sql = ""
+        if kalam_fields or transition.get("kalam_published"):
+            assignments = [f"{column} = %s" for column in kalam_fields] + ["updated_at = CURRENT_TIMESTAMP"]
+            if transition.get("kalam_published"):
+                assignments.append("published_at = CURRENT_TIMESTAMP")
+            kalam_sql = f"""
+                , updated_kalam AS (
+                    UPDATE kalams
+                    SET {', '.join(assignments)}
+                    WHERE id = %s
+                    RETURNING *
+                )
+            """
+            params.extend(list(kalam_fields.values()) + [kalam_id])
+
+        query = f"""
+            WITH submission AS ({submission_sql})
+            {kalam_sql}
+            , log AS (
+                INSERT INTO kalam_workflow_log
+                    (kalam_id, submission_id, action, from_status, to_status, actor_id, actor_role, comments)
+                SELECT %s, submission.id, %s, %s, submission.status, %s, %s, %s
+                FROM submission
+            )
+            SELECT submission.*,
+                   {'(SELECT row_to_json(updated_kalam) FROM updated_kalam)' if kalam_sql else 'NULL'} AS kalam
+            FROM submission;
+        """
+        params.extend([kalam_id, action, from_status, actor_id, actor_role, comments])
+        return query, params
+
+    def get_kalam_workflow_log(self, kalam_id: int):
+        query = """
+            SELECT l.*, u.name AS actor_name
+            FROM kalam_workflow_log l
+            LEFT JOIN users u ON u.id = l.actor_id
+            WHERE l.kalam_id = %s
+            ORDER BY l.id;
+        """
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(query, (kalam_id,))
+            return cur.fetchall()
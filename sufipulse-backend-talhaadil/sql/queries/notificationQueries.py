@@ -1,5 +1,5 @@
 from typing import List
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
 from pydantic import BaseModel
 class SpecialRecognitionCreate(BaseModel):
     title: str
@@ -7,6 +7,14 @@ class SpecialRecognitionCreate(BaseModel):
     description: str | None = None
     achievement: str | None = None
 
+# users.role -> notifications.target_type of broadcasts to that role
+NOTIFICATION_AUDIENCES = {
+    "writer": "writers",
+    "vocalist": "vocalists",
+    "blogger": "bloggers",
+}
+
+
 class NotificationQueries:
     def __init__(self, conn):
         self.conn = conn
@@ -23,51 +31,190 @@ class NotificationQueries:
             self.conn.commit()
         return notification
 
-    def get_user_notifications(self, user_id):
-        user = self.get_user_by_id(user_id)
-        if not user or user["role"] == "admin":
+    def create_specific_notifications(self, notifications):
+        """Insert many (title, message, user_id) notifications in one round trip"""
+        if not notifications:
             return []
+        query = """
+        INSERT INTO notifications (title, message, target_type, target_user_ids)
+        VALUES %s
+        RETURNING id;
+        """
+        rows = [(title, message, 'specific', [user_id]) for title, message, user_id in notifications]
+        with self.conn.cursor() as cur:
+            created = execute_values(cur, query, rows, fetch=True)
+            self.conn.commit()
+        return created
 
-        user_role = user["role"]
-        # Handle role to target_type mapping
-        if user_role == "blogger":
-            target_role = "bloggers"
-        elif user_role == "writer":
-            target_role = "writers"
-        elif user_role == "vocalist":
-            target_role = "vocalists"
-        else:
-            target_role = user_role + "s"  # Fallback for other roles
+    def get_notification_audience(self, user_id, role=None):
+        """target_type broadcast to the user's role; role comes from the token when available"""
+        if role is None:
+            user = self.get_user_by_id(user_id)
+            role = user["role"] if user else None
+        if not role or role == "admin":
+            return None
+        return NOTIFICATION_AUDIENCES.get(role, role + "s")  # Fallback for other roles
 
-        query = """
+    def get_user_notifications(self, user_id, role=None, cursor=None, limit=None):
+        """
+        Newest first. Each audience (all, the user's role, specific rows naming
+        the user) is its own index-backed branch; cursor is (created_at, id) of
+        the last row of the previous page. Fetch limit + 1 to detect more pages.
+        """
+        audience = self.get_notification_audience(user_id, role)
+        if audience is None:
+            return []
+
+        keyset = "AND (created_at, id) < (%s, %s)" if cursor else ""
+        page = "LIMIT %s" if limit else ""
+        branch_params = list(cursor or ()) + ([limit] if limit else [])
+
+        query = f"""
         SELECT n.id, n.title, n.message, n.target_type, n.target_user_ids, n.created_at,
-            CASE WHEN nr.id IS NULL THEN FALSE ELSE TRUE END AS is_read
-        FROM notifications n
+            (n.id <= COALESCE(rm.last_read_notification_id, 0) OR nr.id IS NOT NULL) AS is_read
+        FROM (
+            (SELECT * FROM notifications
+             WHERE target_type = 'all' {keyset}
+             ORDER BY created_at DESC, id DESC {page})
+            UNION ALL
+            (SELECT * FROM notifications
+             WHERE target_type = %s {keyset}
+             ORDER BY created_at DESC, id DESC {page})
+            UNION ALL
+            (SELECT * FROM notifications
+             WHERE target_type = 'specific' AND target_user_ids @> ARRAY[%s]::integer[] {keyset}
+             ORDER BY created_at DESC, id DESC {page})
+        ) n
+        LEFT JOIN notification_read_marks rm ON rm.user_id = %s
         LEFT JOIN notification_reads nr
             ON nr.notification_id = n.id AND nr.user_id = %s
-        WHERE n.target_type = 'all'
-        OR n.target_type = %s
-        OR (n.target_type = 'specific' AND %s = ANY(n.target_user_ids))
-        ORDER BY n.created_at DESC;
+        ORDER BY n.created_at DESC, n.id DESC
+        {page};
         """
+        params = (branch_params + [audience] + branch_params + [user_id] + branch_params
+                  + [user_id, user_id] + ([limit] if limit else []))
         with self.conn.cursor() as cur:
-            cur.execute(query, (user_id, target_role, user_id))
+            cur.execute(query, params)
             notifications = cur.fetchall()
         return notifications
 
-    def mark_as_read(self, notification_id, user_id):
+    def get_user_notifications_after(self, user_id, audience, after_id, limit=100):
+        """
+        Notifications addressed to the user with id > after_id, oldest first (stream
+        resume); audience is the resolved target_type from get_notification_audience
+        """
+        query = """
+        SELECT n.id, n.title, n.message, n.target_type, n.target_user_ids, n.created_at
+        FROM notifications n
+        WHERE n.id > %s
+          AND (n.target_type IN ('all', %s)
+               OR (n.target_type = 'specific' AND n.target_user_ids @> ARRAY[%s]::integer[]))
+        ORDER BY n.id
+        LIMIT %s;
+        """
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(query, (after_id, audience, user_id, limit))
+            return cur.fetchall()
+
+    def get_latest_notification_id(self):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT COALESCE(MAX(id), 0) FROM notifications;")
+            return cur.fetchone()[0]
+
+    def get_unread_notification_count(self, user_id, role=None):
+        """Answered from the trigger-maintained counters and the read mark, not from the notifications table"""
+        audience = self.get_notification_audience(user_id, role)
+        if audience is None:
+            return 0
+
+        query = """
+        SELECT GREATEST(
+            COALESCE((SELECT SUM(total) FROM notification_audience_counts
+                      WHERE target_type IN ('all', %s)), 0)
+            + COALESCE(c.specific_count, 0) - COALESCE(c.read_count, 0)
+            - COALESCE(rm.read_below_mark, 0), 0)
+        FROM (SELECT 1) AS one
+        LEFT JOIN notification_user_counts c ON c.user_id = %s
+        LEFT JOIN notification_read_marks rm ON rm.user_id = %s;
+        """
+        with self.conn.cursor() as cur:
+            cur.execute(query, (audience, user_id, user_id))
+            return cur.fetchone()[0]
+
+    def mark_as_read(self, notification_id, user_id, role=None):
+        """
+        Only notifications addressed to the user and above their read mark are
+        recorded, which keeps the unread counter exact
+        """
+        audience = self.get_notification_audience(user_id, role)
         query = """
         INSERT INTO notification_reads (notification_id, user_id)
-        VALUES (%s, %s)
+        SELECT n.id, %s FROM notifications n
+        WHERE n.id = %s
+          AND n.id > COALESCE((SELECT last_read_notification_id FROM notification_read_marks
+                               WHERE user_id = %s), 0)
+          AND (n.target_type IN ('all', %s)
+               OR (n.target_type = 'specific' AND n.target_user_ids @> ARRAY[%s]::integer[]))
         ON CONFLICT (notification_id, user_id) DO NOTHING
         RETURNING id;
         """
         with self.conn.cursor() as cur:
-            cur.execute(query, (notification_id, user_id))
+            cur.execute(query, (user_id, notification_id, user_id, audience, user_id))
             read_entry = cur.fetchone()
             self.conn.commit()
         return read_entry
 
+    def mark_all_as_read(self, user_id, role=None):
+        """
+        Move the user's read mark to the newest notification and drop the single
+        reads it now covers. Returns the new mark, or None for users without a feed.
+        """
+        audience = self.get_notification_audience(user_id, role)
+        if audience is None:
+            return None
+
+        # read_below_mark comes from the trigger-maintained counters rather than a
+        # count over notifications. Locking the user's counter rows first waits for
+        # inserts that already bumped them and holds new ones off until commit, so
+        # the mark and the counters read next agree. The gap left: an insert that
+        # took its id but had not reached its trigger yet can commit below the mark
+        # without being counted in read_below_mark.
+        lock_query = """
+        SELECT target_type FROM notification_audience_counts
+        WHERE target_type IN ('all', %s)
+        ORDER BY target_type
+        FOR SHARE;
+        SELECT user_id FROM notification_user_counts WHERE user_id = %s FOR SHARE;
+        """
+        mark_query = """
+        INSERT INTO notification_read_marks (user_id, last_read_notification_id, read_below_mark)
+        SELECT %s,
+            (SELECT COALESCE(MAX(id), 0) FROM notifications),
+            COALESCE((SELECT SUM(total) FROM notification_audience_counts
+                      WHERE target_type IN ('all', %s)), 0)
+            + COALESCE((SELECT specific_count FROM notification_user_counts WHERE user_id = %s), 0)
+        ON CONFLICT (user_id) DO UPDATE
+            SET last_read_notification_id = EXCLUDED.last_read_notification_id,
+                read_below_mark = EXCLUDED.read_below_mark,
+                updated_at = CURRENT_TIMESTAMP
+        RETURNING last_read_notification_id;
+        """
+        compact_query = """
+        DELETE FROM notification_reads
+        WHERE user_id = %s AND notification_id <= %s;
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(lock_query, (audience, user_id))
+                cur.execute(mark_query, (user_id, audience, user_id))
+                mark = cur.fetchone()[0]
+                cur.execute(compact_query, (user_id, mark))
+                self.conn.commit()
+            return mark
+        except Exception as e:
+            self.conn.rollback()
+            raise e
+
 
 
     def create_guest_post(
@@ -0,0 +1,308 @@
+from psycopg2.extras import RealDictCursor
+from typing import List, Optional
+
+# request_type -> (table, upload column prefix)
+RECORDING_REQUEST_TABLES = {
+    "studio": ("studio_recording_requests", "reference"),
+    "remote": ("remote_recording_requests_new", "sample"),
+}
+
+# Normalized queue statuses; each table spells "waiting for review" differently
+QUEUE_STATUSES = ("pending", "approved", "rejected", "completed")
+PENDING_STATUS_ALIASES = ("pending_review", "under_review")
+
+# Allowed admin transitions between normalized statuses
+RECORDING_STATUS_TRANSITIONS = {
+    "pending": ("approved", "rejected"),
+    "approved": ("completed", "rejected"),
+    "rejected": ("pending", "approved"),
+    "completed": (),
+}
+
+# What "pending" is stored as in each recording request table
+RECORDING_PENDING_STATUS = {
+    "studio": "pending_review",
+    "remote": "under_review",
+}
+
+# Sources of the unified admin queue. rank breaks created_at ties deterministically.
+# The new tables reference vocalists.id, the older studio tables store the vocalist's user id.
+ADMIN_QUEUE_SOURCES = {
+    "studio_recording": {
+        "rank": 4,
+        "table": "studio_recording_requests",
+        "joins": "LEFT JOIN vocalists v ON v.id = t.vocalist_id",
+        "vocalist_is_profile_id": True,
+        "vocalist_user_expr": "v.user_id",
+        "title_expr": "t.lyric_title",
+        "name_expr": "t.submitter_name",
+        "email_expr": "t.submitter_email",
+        "session_date_expr": "t.preferred_session_date",
+        "status_map": {"pending": "pending_review"},
+    },
+    "remote_recording": {
+        "rank": 3,
+        "table": "remote_recording_requests_new",
+        "joins": "LEFT JOIN vocalists v ON v.id = t.vocalist_id",
+        "vocalist_is_profile_id": True,
+        "vocalist_user_expr": "v.user_id",
+        "title_expr": "t.lyric_title",
+        "name_expr": "t.submitter_name",
+        "email_expr": "t.submitter_email",
+        "session_date_expr": "t.target_submission_date",
+        "status_map": {"pending": "under_review"},
+    },
+    "studio_visit": {
+        "rank": 2,
+        "table": "studio_visit_requests",
+        "joins": "LEFT JOIN kalams k ON k.id = t.kalam_id",
+        "vocalist_is_profile_id": False,
+        "vocalist_user_expr": "t.vocalist_id",
+        "title_expr": "k.title",
+        "name_expr": "t.name",
+        "email_expr": "t.email",
+        "session_date_expr": "t.preferred_date",
+        "status_map": {},
+    },
+    "remote_session": {
+        "rank": 1,
+        "table": "remote_recording_requests",
+        "joins": "LEFT JOIN kalams k ON k.id = t.kalam_id",
+        "vocalist_is_profile_id": False,
+        "vocalist_user_expr": "t.vocalist_id",
+        "title_expr": "k.title",
+        "name_expr": "t.name",
+        "email_expr": "t.email",
+        "session_date_expr": "NULL::date",
+        "status_map": {},
+    },
+}
+
+
+def normalize_request_status(status: str) -> str:
+    return "pending" if status in PENDING_STATUS_ALIASES else status
+
+
+class RecordingRequestQueries:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def save_recording_upload(self, request_type: str, request_id: int, vocalist_id: int,
+                              upload_url: str, file_type: str, file_size: int) -> Optional[dict]:
+        """Attach an uploaded reference/sample file to the vocalist's own request"""
+        table, prefix = RECORDING_REQUEST_TABLES[request_type]
+        query = f"""
+            UPDATE {table}
+            SET {prefix}_upload_url = %s, {prefix}_file_type = %s, {prefix}_file_size = %s,
+                audio_duration_seconds = NULL, audio_sample_rate = NULL,
+                audio_waveform = NULL, audio_analyzed_at = NULL,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = %s AND vocalist_id = %s
+            RETURNING *;
+        """
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(query, (upload_url, file_type, file_size, request_id, vocalist_id))
+            self.conn.commit()
+            return cur.fetchone()
+
+    def save_audio_analysis(self, request_type: str, request_id: int, upload_url: str,
+                            duration_seconds: Optional[float], sample_rate: Optional[int],
+                            waveform: Optional[bytes]) -> bool:
+        """
+        Store analysis results. The upload_url guard drops stale results when the
+        file was replaced while the analysis was still running.
+        """
+        table, prefix = RECORDING_REQUEST_TABLES[request_type]
+        query = f"""
+            UPDATE {table}
+            SET audio_duration_seconds = %s, audio_sample_rate = %s,
+                audio_waveform = %s, audio_analyzed_at = CURRENT_TIMESTAMP
+            WHERE id = %s AND {prefix}_upload_url = %s
+            RETURNING id;
+        """
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(query, (duration_seconds, sample_rate, waveform, request_id, upload_url))
+            self.conn.commit()
+            return cur.fetchone() is not None
+
+    def bulk_update_request_status(self, request_type: str, request_ids: List[int], status: str,
+                                   admin_comments: Optional[str] = None) -> tuple:
+        """
+        Move many requests to `status` in one UPDATE ... RETURNING.
+        Only rows whose current status allows the transition are touched; the rest
+        are reported as not_found / invalid_transition. Does not commit.
+        Returns (updated rows, per-id outcomes in request order).
+        """
+        table, _ = RECORDING_REQUEST_TABLES[request_type]
+
+        def stored(normalized):
+            return RECORDING_PENDING_STATUS[request_type] if normalized == "pending" else normalized
+
+        allowed_from = [stored(current) for current, targets in RECORDING_STATUS_TRANSITIONS.items()
+                        if status in targets]
+
+        update_query = f"""
+            UPDATE {table} t
+            SET status = %s, admin_comments = %s, updated_at = CURRENT_TIMESTAMP
+            FROM (
+                SELECT id, status FROM {table}
+                WHERE id = ANY(%s) AND status = ANY(%s)
+                FOR UPDATE
+            ) previous
+            WHERE t.id = previous.id
+            RETURNING t.id, t.lyric_title, t.submitter_name, t.submitter_email,
+                      t.status, previous.status AS previous_status;
+        """
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(update_query, (stored(status), admin_comments, request_ids, allowed_from))
+            updated = {row["id"]: row for row in cur.fetchall()}
+
+            skipped = [request_id for request_id in request_ids if request_id not in updated]
+            current = {}
+            if skipped:
+                cur.execute(f"SELECT id, status FROM {table} WHERE id = ANY(%s);", (skipped,))
+                current = {row["id"]: row["status"] for row in cur.fetchall()}
+
+        outcomes = []
+        for request_id in request_ids:
+            if request_id in updated:
+                outcomes.append({
+                    "id": request_id,
+                    "outcome": "updated",
+                    "from": normalize_request_status(updated[request_id]["previous_status"]),
+                    "to": status,
+                })
+            elif request_id in current:
+                outcomes.append({
+                    "id": request_id,
+                    "outcome": "invalid_transition",
+                    "from": normalize_request_status(current[request_id]),
+                    "to": status,
+                })
+            else:
+                outcomes.append({"id": request_id, "outcome": "not_found"})
+
+        return list(updated.values()), outcomes
+
+    # ==================== ADMIN REQUEST QUEUE ====================
+
+    def _queue_branch_filters(self, source: dict, status: Optional[str], vocalist_user_id: Optional[int],
+                              kalam_id: Optional[int], date_from, date_to) -> tuple:
+        """Build the WHERE clauses shared by the queue page and the status counts"""
+        clauses = []
+        params = []
+
+        if status:
+            clauses.append("t.status = %s")
+            params.append(source["status_map"].get(status, status))
+        if vocalist_user_id is not None:
+            if source["vocalist_is_profile_id"]:
+                clauses.append("t.vocalist_id = (SELECT id FROM vocalists WHERE user_id = %s)")
+            else:
+                clauses.append("t.vocalist_id = %s")
+            params.append(vocalist_user_id)
+        if kalam_id is not None:
+            clauses.append("t.kalam_id = %s")
+            params.append(kalam_id)
+        if date_from:
+            clauses.append("t.created_at >= %s")
+            params.append(date_from)
+        if date_to:
+            clauses.append("t.created_at < %s")
+            params.append(date_to)
+
+        return clauses, params
+
+    def get_admin_request_queue(self, request_types: List[str], status: Optional[str] = None,
+                                vocalist_user_id: Optional[int] = None, kalam_id: Optional[int] = None,
+                                date_from=None, date_to=None, cursor: Optional[tuple] = None,
+                                limit: int = 25) -> List[dict]:
+        """
+        One page of the unified admin queue, newest first.
+        Every branch applies its own filters, keyset predicate and LIMIT so each
+        table is read through its (status, created_at, id) / (created_at, id) index;
+        the outer query only merges at most limit+1 rows per table.
+        cursor is (created_at, source_rank, id) of the last row of the previous page.
+        """
+        branches = []
+        params = []
+
+        for request_type in request_types:
+            source = ADMIN_QUEUE_SOURCES[request_type]
+            clauses, branch_params = self._queue_branch_filters(
+                source, status, vocalist_user_id, kalam_id, date_from, date_to
+            )
+
+            if cursor:
+                cursor_created_at, cursor_rank, cursor_id = cursor
+                if source["rank"] < cursor_rank:
+                    clauses.append("t.created_at <= %s")
+                    branch_params.append(cursor_created_at)
+                elif source["rank"] == cursor_rank:
+                    clauses.append("(t.created_at, t.id) < (%s, %s)")
+                    branch_params.extend([cursor_created_at, cursor_id])
+                else:
+                    clauses.append("t.created_at < %s")
+                    branch_params.append(cursor_created_at)
+
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+            branches.append(f"""
+                (SELECT
+                    '{request_type}' AS request_type,
+                    {source['rank']} AS source_rank,
+                    t.id,
+                    t.kalam_id,
+                    {source['vocalist_user_expr']} AS vocalist_user_id,
+                    {source['title_expr']} AS title,
+                    {source['name_expr']} AS submitter_name,
+                    {source['email_expr']} AS submitter_email,
+                    {source['session_date_expr']} AS session_date,
+                    t.status AS raw_status,
+                    t.created_at,
+                    t.updated_at
+                FROM {source['table']} t
+                {source['joins']}
+                {where}
+                ORDER BY t.created_at DESC, t.id DESC
+                LIMIT %s)
+            """)
+            params.extend(branch_params)
+            params.append(limit + 1)
+
+        query = " UNION ALL ".join(branches) + """
+            ORDER BY created_at DESC, source_rank DESC, id DESC
+            LIMIT %s;
+        """
+        params.append(limit + 1)
+
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(query, params)
+            rows = cur.fetchall()
+
+        for row in rows:
+            row["status"] = normalize_request_status(row["raw_status"])
+        return rows
+
+    def get_admin_request_status_counts(self, request_types: List[str], vocalist_user_id: Optional[int] = None,
+                                        kalam_id: Optional[int] = None, date_from=None, date_to=None) -> dict:
+        """Per normalized status counts for the queue filters (status filter excluded)"""
+        branches = []
+        params = []
+        for request_type in request_types:
+            source = ADMIN_QUEUE_SOURCES[request_type]
+            clauses, branch_params = self._queue_branch_filters(
+                source, None, vocalist_user_id, kalam_id, date_from, date_to
+            )
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+            branches.append(f"SELECT t.status, COUNT(*) AS count FROM {source['table']} t {where} GROUP BY t.status")
+            params.extend(branch_params)
+
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(" UNION ALL ".join(branches), params)
+            rows = cur.fetchall()
+
+        counts = {status: 0 for status in QUEUE_STATUSES}
+        for row in rows:
+            status = normalize_request_status(row["status"])
+            counts[status] = counts.get(status, 0) + row["count"]
+        return counts
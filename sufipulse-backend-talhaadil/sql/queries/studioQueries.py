@@ -1,8 +1,17 @@
 from psycopg2.extras import RealDictCursor
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, timezone
 from fastapi import HTTPException
 from datetime import date
+from psycopg2 import errors
+from utils.availability import resolve_time_block, session_period
+
+# request_type -> (table, date column, time column, duration column) of requests holding studio slots
+SLOT_REQUEST_COLUMNS = {
+    'studio_visit': ('studio_visit_requests', 'preferred_date', 'preferred_time', None),
+    'studio_recording': ('studio_recording_requests', 'preferred_session_date', 'preferred_time_block',
+                         'estimated_studio_duration'),
+}
 
 class StudioQueries:
     def __init__(self, conn):
@@ -70,8 +79,10 @@ class StudioQueries:
                     status_code=400,
                     detail="The preferred date cannot be in the past."
                 )
-        # Check for scheduling conflict
-        if data.get('preferred_date') and data.get('preferred_time'):
+        # Times that map onto a studio block are reserved below; anything else
+        # falls back to the exact-match conflict check
+        time_block = resolve_time_block(data.get('preferred_time')) if data.get('preferred_date') else None
+        if not time_block and data.get('preferred_date') and data.get('preferred_time'):
             if self.check_studio_visit_conflict_datetime(
                 data['preferred_date'],
                 data['preferred_time']
@@ -102,8 +113,16 @@ class StudioQueries:
                 'pending', datetime.now(timezone.utc),
                 datetime.now(timezone.utc)
             ))
-            self.conn.commit()
-            return cur.fetchone()
+            result = cur.fetchone()
+
+        if time_block:
+            preferred_date = data['preferred_date']
+            if isinstance(preferred_date, str):
+                preferred_date = datetime.strptime(preferred_date, "%Y-%m-%d").date()
+            self.reserve_session_slot('studio', 'studio_visit', result['id'], preferred_date, time_block)
+
+        self.conn.commit()
+        return result
 
     def get_all_studio_visit_requests(self) -> list:
         query = "SELECT * FROM studio_visit_requests ORDER BY created_at DESC;"
@@ -196,3 +215,108 @@ class StudioQueries:
         with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute(query, (vocalist_id, kalam_id))
             return cur.fetchone() is not None
+
+    # ==================== SESSION AVAILABILITY ====================
+
+    def get_recording_resources(self) -> list:
+        query = "SELECT id, slug, name, capacity FROM recording_resources ORDER BY id;"
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(query)
+            return cur.fetchall()
+
+    def get_slot_bookings_in_range(self, start_date: date, end_date: date) -> list:
+        """All bookings in the date range, fetched in one index-backed range scan"""
+        query = """
+            SELECT resource_id, lane, period_start, period_end
+            FROM studio_slot_bookings
+            WHERE session_date BETWEEN %s AND %s;
+        """
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(query, (start_date, end_date))
+            return cur.fetchall()
+
+    def reserve_session_slot(self, resource_slug: str, request_type: str, request_id: int,
+                             session_date: date, time_block: str, duration: Optional[str] = None) -> dict:
+        """
+        Reserve the lowest free lane for the session period. Does not commit, so the
+        booking lands in the same transaction as the request it belongs to.
+        The exclusion constraint on studio_slot_bookings settles concurrent races.
+        """
+        period_start, period_end = session_period(session_date, time_block, duration)
+        slot_taken = HTTPException(
+            status_code=400,
+            detail="The selected time slot is already taken. Please choose another time."
+        )
+
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute("SELECT id, capacity FROM recording_resources WHERE slug = %s;", (resource_slug,))
+            resource = cur.fetchone()
+            if not resource:
+                raise HTTPException(status_code=500, detail=f"Recording resource '{resource_slug}' is not configured")
+
+            cur.execute("""
+                SELECT lane FROM studio_slot_bookings
+                WHERE resource_id = %s AND tsrange(period_start, period_end) && tsrange(%s, %s);
+            """, (resource['id'], period_start, period_end))
+            used = {row['lane'] for row in cur.fetchall()}
+            lane = next((l for l in range(1, resource['capacity'] + 1) if l not in used), None)
+            if lane is None:
+                self.conn.rollback()
+                raise slot_taken
+
+            try:
+                cur.execute("""
+                    INSERT INTO studio_slot_bookings (
+                        resource_id, lane, request_type, request_id,
+                        session_date, time_block, period_start, period_end
+                    )
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    RETURNING *;
+                """, (resource['id'], lane, request_type, request_id,
+                      session_date, time_block, period_start, period_end))
+            except errors.ExclusionViolation:
+                # Another request took the lane between our read and insert
+                self.conn.rollback()
+                raise slot_taken
+            return cur.fetchone()
+
+    def restore_session_slots(self, request_type: str, request_ids: List[int]):
+        """
+        Reserve the slots of requests coming back from rejected (their slot was
+        released then). Requests without a placeable time, in the past, or still
+        holding a booking are skipped. Does not commit; raises like
+        reserve_session_slot if a slot was taken in the meantime.
+        """
+        table, date_column, time_column, duration_column = SLOT_REQUEST_COLUMNS[request_type]
+        duration = f"r.{duration_column}" if duration_column else "NULL"
+        query = f"""
+            SELECT r.id, r.{date_column} AS session_date, r.{time_column} AS preferred_time,
+                   {duration} AS duration
+            FROM {table} r
+            WHERE r.id = ANY(%s) AND r.{date_column} >= CURRENT_DATE
+              AND NOT EXISTS (
+                  SELECT 1 FROM studio_slot_bookings b WHERE b.request_type = %s AND b.request_id = r.id
+              )
+            ORDER BY r.id;
+        """
+        with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(query, (request_ids, request_type))
+            rows = cur.fetchall()
+
+        for row in rows:
+            time_block = resolve_time_block(row['preferred_time'])
+            if time_block:
+                self.reserve_session_slot('studio', request_type, row['id'], row['session_date'],
+                                          time_block, row['duration'])
+
+    def release_session_slot(self, request_type: str, request_id: int):
+        """Free the booking held by a request. Does not commit."""
+        query = "DELETE FROM studio_slot_bookings WHERE request_type = %s AND request_id = %s;"
+        with self.conn.cursor() as cur:
+            cur.execute(query, (request_type, request_id))
+
+    def release_session_slots(self, request_type: str, request_ids: List[int]):
+        """Free the bookings held by several requests. Does not commit."""
+        query = "DELETE FROM studio_slot_bookings WHERE request_type = %s AND request_id = ANY(%s);"
+        with self.conn.cursor() as cur:
+            cur.execute(query, (request_type, request_ids))
@@ -113,51 +113,6 @@ class VocalistQueries:
         with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
             cur.execute(query, (vocalist_id,))
             return cur.fetchall()
-    def approve_or_reject_kalam(self, kalam_id: int, status: str, comments: str = None, vocalist_id: int = None):
-        if status == "approved":
-            query = """
-            UPDATE kalam_submissions
-            SET vocalist_approval_status = 'approved',
-                status = 'complete_approved',
-                updated_at = CURRENT_TIMESTAMP
-            WHERE kalam_id = %s
-            RETURNING *;
-            """
-            values = (kalam_id,)
-    
-
-           
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, values)
-                submission_result = cur.fetchone()
-                self.conn.commit()
-                print("submission_result:", submission_result)
-                return submission_result
-
-        elif status == "rejected":
-            query = """
-            UPDATE kalam_submissions
-            SET vocalist_approval_status = 'rejected',
-                user_approval_status = 'pending',
-                updated_at = CURRENT_TIMESTAMP
-            WHERE kalam_id = %s
-            RETURNING *;
-            """
-            values = (kalam_id,)
-
-            update_kalam_query = """
-            UPDATE kalams
-            SET vocalist_id = NULL
-            WHERE id = %s;
-            """
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute(query, values)
-                submission_result = cur.fetchone()
-                cur.execute(update_kalam_query, (kalam_id,))
-                self.conn.commit()
-                return submission_result
-
-
 
     def fetch_vocalists(self, skip: int, limit: int) -> List[dict]:
         query = """
@@ -0,0 +1,61 @@
+"""
+Unit tests for utils/availability.py (no database needed).
+Run this from the sufipulse-backend-talhaadil directory:
+    python -m pytest tests
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from utils.availability import resolve_time_block, session_period
+
+# Options offered by the frontend forms (StudioVisit.tsx, StudioRecordingRequestForm.tsx)
+STUDIO_VISIT_TIMES = {
+    "Morning (9:00 AM - 12:00 PM)": "Morning",
+    "Afternoon (1:00 PM - 4:00 PM)": "Afternoon",
+    "Evening (5:00 PM - 8:00 PM)": "Evening",
+    "Flexible": None,
+}
+RECORDING_TIME_BLOCKS = ["Morning", "Afternoon", "Evening"]
+
+
+@pytest.mark.parametrize("preferred_time, block", STUDIO_VISIT_TIMES.items())
+def test_studio_visit_form_times(preferred_time, block):
+    assert resolve_time_block(preferred_time) == block
+
+
+@pytest.mark.parametrize("block", RECORDING_TIME_BLOCKS)
+def test_recording_form_blocks(block):
+    assert resolve_time_block(block) == block
+
+
+@pytest.mark.parametrize("preferred_time, block", [
+    ("morning", "Morning"),
+    ("  evening (5:00 PM - 8:00 PM) ", "Evening"),
+    ("10:30", "Morning"),
+    ("3 pm", "Afternoon"),
+    ("17:00", "Evening"),
+    ("flexible", None),
+    ("Mornings only", None),
+    ("7 am", None),
+    ("", None),
+    (None, None),
+])
+def test_free_text_times(preferred_time, block):
+    assert resolve_time_block(preferred_time) == block
+
+
+def test_full_day_matches_form():
+    # "Full Day (8 hours)" on the recording form
+    start, end = session_period(date(2030, 1, 7), "Morning", "Full Day")
+    assert (start, end) == (datetime(2030, 1, 7, 9), datetime(2030, 1, 7, 17))
+
+
+def test_durations_capped_at_day_end():
+    start, end = session_period(date(2030, 1, 7), "Evening", "Full Day")
+    assert (start, end) == (datetime(2030, 1, 7, 17), datetime(2030, 1, 7, 21))
+
+
+def test_block_without_duration_covers_block():
+    assert session_period(date(2030, 1, 7), "Afternoon") == (datetime(2030, 1, 7, 13), datetime(2030, 1, 7, 17))
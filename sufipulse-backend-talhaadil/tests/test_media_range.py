@@ -0,0 +1,56 @@
+"""
+Unit tests for utils/media.parse_range_header (no database needed).
+Malformed headers are ignored (full 200 response); only well-formed ranges
+that cannot be satisfied raise (416).
+"""
+
+import pytest
+
+from utils.media import parse_range_header
+
+SIZE = 100
+
+
+@pytest.mark.parametrize("header, byte_range", [
+    (None, None),
+    ("", None),
+    ("bytes=0-9", (0, 9)),
+    ("bytes=90-", (90, 99)),
+    ("bytes=-10", (90, 99)),
+    ("bytes=-500", (0, 99)),
+    ("bytes=50-500", (50, 99)),
+    ("BYTES = 1-2", (1, 2)),
+])
+def test_satisfiable_ranges(header, byte_range):
+    assert parse_range_header(header, SIZE) == byte_range
+
+
+@pytest.mark.parametrize("header", [
+    "bytes=abc",
+    "bytes=1",
+    "bytes=-",
+    "bytes=5-3",
+    "bytes=+1-2",
+    "bytes=1-+2",
+    "bytes= -1-2",
+    "bytes=1_0-20",
+    "bytes=\xb2-",
+    "bytes=1-٣",
+    "bytes=１-2",
+    "items=0-1",
+    "bytes=0-1,5-6",
+])
+def test_malformed_headers_are_ignored(header):
+    assert parse_range_header(header, SIZE) is None
+
+
+@pytest.mark.parametrize("header, size", [
+    ("bytes=100-", SIZE),
+    ("bytes=150-200", SIZE),
+    ("bytes=-0", SIZE),
+    ("bytes=0-", 0),
+    ("bytes=-5", 0),
+])
+def test_unsatisfiable_ranges_raise(header, size):
+    with pytest.raises(ValueError):
+        parse_range_header(header, size)
@@ -0,0 +1,105 @@
+"""
+N+1 detection: a per-row query loop is caught, the batched comment replies
+are not. The loops run on the app's instrumented connection against
+TEST_DATABASE_URL (see conftest.py); the detector itself is tested without it.
+"""
+
+import asyncio
+
+import pytest
+
+import utils.instrumentation as instrumentation
+import utils.n_plus_one as n_plus_one
+from sql.combinedQueries import Queries
+from utils.n_plus_one import NPLUS1_THRESHOLD, NPlusOneError, detect_n_plus_one, record_statement
+
+REPLY_QUERY = "SELECT * FROM blog_comments WHERE parent_id = %s"
+
+
+def replies_per_row(conn, comment_ids):
+    """The shape the detector exists for: one query per parent row"""
+    with conn.cursor() as cur:
+        for comment_id in comment_ids:
+            cur.execute(REPLY_QUERY, (comment_id,))
+            cur.fetchall()
+
+
+@pytest.fixture
+def blog_with_comments(db_conn):
+    """A blog with more top-level comments than the threshold, each with one reply"""
+    with db_conn.cursor() as cur:
+        cur.execute("""
+            INSERT INTO users (email, name, password_hash, role, is_registered)
+            VALUES ('n-plus-one-test@example.com', 'N+1 test', 'test', 'blogger', TRUE) RETURNING id
+        """)
+        user_id = cur.fetchone()[0]
+        cur.execute("""
+            INSERT INTO blog_submissions (title, excerpt, content, user_id, status, category, tags, language)
+            VALUES ('N+1 test', 'test', 'test', %s, 'posted', 'Poetry', ARRAY['test'], 'English') RETURNING id
+        """, (user_id,))
+        blog_id = cur.fetchone()[0]
+        comment_ids = []
+        for n in range(NPLUS1_THRESHOLD * 2):
+            cur.execute("""
+                INSERT INTO blog_comments (blog_id, commenter_name, commenter_email, comment_text, is_approved)
+                VALUES (%s, 'Guest', 'guest@example.com', %s, TRUE) RETURNING id
+            """, (blog_id, f"comment {n}"))
+            comment_ids.append(cur.fetchone()[0])
+            cur.execute("""
+                INSERT INTO blog_comments (blog_id, parent_id, commenter_name, commenter_email, comment_text, is_approved)
+                VALUES (%s, %s, 'Guest', 'guest@example.com', %s, TRUE)
+            """, (blog_id, comment_ids[-1], f"reply {n}"))
+    return db_conn, blog_id, comment_ids
+
+
+def test_detector_counts_statement_shapes():
+    # What the timed cursor records: the SQL before its parameters are bound
+    with pytest.raises(NPlusOneError, match=r"3x SELECT"):
+        with detect_n_plus_one("fake loop", threshold=3):
+            for _ in range(3):
+                record_statement(REPLY_QUERY)
+
+    with detect_n_plus_one("fake loop", threshold=3) as detector:
+        for _ in range(2):
+            record_statement(REPLY_QUERY)
+        record_statement("SELECT * FROM blog_comments WHERE id = %s")
+    assert not detector.violations()
+
+
+def test_per_row_query_loop_raises(blog_with_comments):
+    conn, _, comment_ids = blog_with_comments
+    with pytest.raises(NPlusOneError) as error:
+        with detect_n_plus_one("replies per row"):
+            replies_per_row(conn, comment_ids)
+    assert f"{len(comment_ids)}x" in str(error.value)
+    assert "replies_per_row" in str(error.value)
+
+
+def test_comment_replies_are_fetched_in_one_query(blog_with_comments):
+    conn, blog_id, comment_ids = blog_with_comments
+    with detect_n_plus_one("blog comments") as detector:
+        comments = Queries(conn).get_blog_comments(blog_id)
+    assert max(detector.counts.values()) == 1
+    assert sorted(comment["id"] for comment in comments) == sorted(comment_ids)
+    assert all(len(comment["replies"]) == 1 for comment in comments)
+
+
+def test_request_raises_with_nplus1_raise(blog_with_comments, monkeypatch):
+    conn, _, comment_ids = blog_with_comments
+    monkeypatch.setattr(instrumentation, "NPLUS1_DETECT", True)
+    monkeypatch.setattr(n_plus_one, "NPLUS1_RAISE", True)
+
+    async def app(scope, receive, send):
+        replies_per_row(conn, comment_ids)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "GET", "path": "/comments", "headers": []}
+    with pytest.raises(NPlusOneError, match="N\\+1 queries in GET"):
+        asyncio.run(instrumentation.TimingMiddleware(app)(scope, receive, send))
@@ -0,0 +1,108 @@
+"""
+mark_all_as_read against a local Postgres: the unread counter stays exact and
+only inserts into the user's own feed wait for the mark. Needs
+TEST_DATABASE_URL (see conftest.py); mark_all_as_read commits, so the rows
+are deleted again after each test.
+"""
+
+import threading
+
+import psycopg2
+import pytest
+from psycopg2.extras import DictCursor
+
+from sql.combinedQueries import Queries
+from tests.conftest import TEST_DATABASE_URL
+
+TITLE = "read-mark-test"
+EMAIL = "read-mark-test@example.com"
+# Only a notification target; read marks need a real user
+OTHER_ID = 990102
+
+
+@pytest.fixture
+def writer():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    conn = psycopg2.connect(TEST_DATABASE_URL, cursor_factory=DictCursor)
+    with conn.cursor() as cur:
+        cur.execute("""
+            INSERT INTO users (email, name, password_hash, role, is_registered)
+            VALUES (%s, 'Read mark test', 'test', 'writer', TRUE) RETURNING id
+        """, (EMAIL,))
+        writer_id = cur.fetchone()[0]
+    conn.commit()
+    try:
+        yield Queries(conn), writer_id
+    finally:
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM notifications WHERE title = %s", (TITLE,))
+            cur.execute("DELETE FROM notification_read_marks WHERE user_id = %s", (writer_id,))
+            cur.execute("DELETE FROM notification_user_counts WHERE user_id IN (%s, %s)", (writer_id, OTHER_ID))
+            cur.execute("DELETE FROM users WHERE id = %s", (writer_id,))
+        conn.commit()
+        conn.close()
+
+
+def notify(conn, target_type, target_user_ids=None, commit=True) -> int:
+    with conn.cursor() as cur:
+        cur.execute("""
+            INSERT INTO notifications (title, message, target_type, target_user_ids)
+            VALUES (%s, 'test', %s, %s) RETURNING id
+        """, (TITLE, target_type, target_user_ids))
+        notification_id = cur.fetchone()[0]
+    if commit:
+        conn.commit()
+    return notification_id
+
+
+def unread(db, writer_id) -> int:
+    return db.get_unread_notification_count(writer_id, role="writer")
+
+
+def test_unread_count_is_exact_around_the_mark(writer):
+    db, writer_id = writer
+    before = unread(db, writer_id)
+    notify(db.conn, "writers")
+    notify(db.conn, "specific", [writer_id])
+    notify(db.conn, "specific", [OTHER_ID])
+    notify(db.conn, "vocalists")
+    assert unread(db, writer_id) == before + 2
+
+    mark = db.mark_all_as_read(writer_id, role="writer")
+    assert unread(db, writer_id) == 0
+    assert not db.mark_as_read(mark, writer_id, role="writer")
+
+    above = notify(db.conn, "specific", [writer_id])
+    notify(db.conn, "all")
+    assert unread(db, writer_id) == 2
+    assert db.mark_as_read(above, writer_id, role="writer")
+    assert unread(db, writer_id) == 1
+
+
+def test_only_inserts_into_the_users_feed_are_waited_for(writer):
+    db, writer_id = writer
+    pending = psycopg2.connect(TEST_DATABASE_URL)
+    try:
+        # Another audience's insert does not hold the mark up
+        notify(pending, "vocalists", commit=False)
+        with db.conn.cursor() as cur:
+            cur.execute("SET lock_timeout = '2s'")
+        db.mark_all_as_read(writer_id, role="writer")
+        pending.commit()
+
+        # One into the user's feed is waited for, then counted as read
+        notify(pending, "writers", commit=False)
+        marked = threading.Thread(target=db.mark_all_as_read, args=(writer_id,), kwargs={"role": "writer"})
+        marked.start()
+        marked.join(0.5)
+        assert marked.is_alive()
+        pending.commit()
+        marked.join(10)
+        assert not marked.is_alive()
+    finally:
+        pending.rollback()
+        pending.close()
+
+    assert unread(db, writer_id) == 0
@@ -0,0 +1,250 @@
+"""
+/notifications/stream against a local Postgres: LISTEN fan-out, resume,
+heartbeats and catching up after lag or a lost connection. Needs
+TEST_DATABASE_URL (see conftest.py). Notifications are committed (NOTIFY is
+only delivered at commit) and deleted again after each test.
+"""
+
+import asyncio
+import json
+
+import psycopg2
+import pytest
+
+import api.notifications as notifications_api
+import utils.notification_stream as notification_stream
+from tests.conftest import TEST_DATABASE_URL
+from utils.notification_stream import DeliveredWindow, broker
+
+TITLE = "stream-test"
+# Users that exist only as notification targets
+WRITER_ID = 990001
+VOCALIST_ID = 990002
+
+# Seconds to wait for an event before failing
+EVENT_TIMEOUT = 10
+
+
+class ConnectedRequest:
+    """The route only asks the request whether the client went away"""
+
+    async def is_disconnected(self):
+        return False
+
+
+@pytest.fixture
+def stream_db(monkeypatch):
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    # The route and the broker connect through DATABASE_URL
+    monkeypatch.setenv("DATABASE_URL", TEST_DATABASE_URL)
+    conn = psycopg2.connect(TEST_DATABASE_URL)
+    conn.autocommit = True
+    try:
+        yield conn
+    finally:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM notifications WHERE title LIKE %s", (TITLE + "%",))
+        conn.close()
+
+
+def notify(conn, message, target_type, target_user_ids=None) -> int:
+    with conn.cursor() as cur:
+        cur.execute("""
+            INSERT INTO notifications (title, message, target_type, target_user_ids)
+            VALUES (%s, %s, %s, %s) RETURNING id
+        """, (TITLE, message, target_type, target_user_ids))
+        return cur.fetchone()[0]
+
+
+async def open_stream(user_id, role, last_event_id=None):
+    response = await notifications_api.stream_notifications(
+        ConnectedRequest(), after=None, last_event_id=last_event_id, current_user=(user_id, role))
+    return response.body_iterator
+
+
+async def next_event(stream) -> dict:
+    """The next notification event, skipping heartbeats"""
+    while True:
+        chunk = await asyncio.wait_for(stream.__anext__(), EVENT_TIMEOUT)
+        if not chunk.startswith(":"):
+            lines = dict(line.split(": ", 1) for line in chunk.strip().split("\n"))
+            return {"sse_id": int(lines["id"]), **json.loads(lines["data"])}
+
+
+async def next_messages(stream, count) -> list:
+    return [(await next_event(stream))["message"] for _ in range(count)]
+
+
+async def wait_for(condition):
+    for _ in range(EVENT_TIMEOUT * 20):
+        if condition():
+            return
+        await asyncio.sleep(0.05)
+    raise AssertionError("condition not reached")
+
+
+def subscriber_of(user_id):
+    with broker._lock:
+        return next(s for s in broker._subscribers if s.user_id == user_id)
+
+
+def test_fan_out_by_audience_and_specific_user(stream_db):
+    async def scenario():
+        writer = await open_stream(WRITER_ID, "writer")
+        vocalist = await open_stream(VOCALIST_ID, "vocalist")
+        writer_events = asyncio.ensure_future(next_messages(writer, 3))
+        vocalist_events = asyncio.ensure_future(next_messages(vocalist, 2))
+        await wait_for(lambda: len(broker._subscribers) >= 2)
+
+        notify(stream_db, "to writers", "writers")
+        notify(stream_db, "to vocalists", "vocalists")
+        notify(stream_db, "to the writer", "specific", [WRITER_ID])
+        notify(stream_db, "to everyone", "all")
+
+        try:
+            return await writer_events, await vocalist_events
+        finally:
+            await writer.aclose()
+            await vocalist.aclose()
+
+    writer_messages, vocalist_messages = asyncio.run(scenario())
+    assert writer_messages == ["to writers", "to the writer", "to everyone"]
+    assert vocalist_messages == ["to vocalists", "to everyone"]
+
+
+def test_resume_from_last_event_id(stream_db):
+    seen = notify(stream_db, "seen", "specific", [WRITER_ID])
+    notify(stream_db, "missed 1", "specific", [WRITER_ID])
+    last = notify(stream_db, "missed 2", "specific", [WRITER_ID])
+
+    async def scenario():
+        stream = await open_stream(WRITER_ID, "writer", last_event_id=seen)
+        try:
+            return [await next_event(stream) for _ in range(2)]
+        finally:
+            await stream.aclose()
+
+    events = asyncio.run(scenario())
+    assert [event["message"] for event in events] == ["missed 1", "missed 2"]
+    assert events[-1]["sse_id"] == last
+
+
+def test_heartbeat_while_idle(stream_db, monkeypatch):
+    monkeypatch.setattr(notifications_api, "HEARTBEAT_SECONDS", 0.1)
+
+    async def scenario():
+        stream = await open_stream(WRITER_ID, "writer")
+        try:
+            return await asyncio.wait_for(stream.__anext__(), EVENT_TIMEOUT)
+        finally:
+            await stream.aclose()
+
+    assert asyncio.run(scenario()) == ": heartbeat\n\n"
+
+
+def test_lagging_subscriber_catches_up_from_the_database(stream_db, monkeypatch):
+    monkeypatch.setattr(notification_stream, "SUBSCRIBER_BUFFER", 2)
+
+    async def scenario():
+        stream = await open_stream(WRITER_ID, "writer")
+        try:
+            first = asyncio.ensure_future(next_event(stream))
+            await wait_for(lambda: broker._subscribers)
+            notify(stream_db, "first", "specific", [WRITER_ID])
+            await first
+
+            # The stream is paused after yielding: five events overflow its buffer of two
+            with stream_db.cursor() as cur:
+                cur.execute("BEGIN")
+                for n in range(5):
+                    cur.execute("""
+                        INSERT INTO notifications (title, message, target_type, target_user_ids)
+                        VALUES (%s, %s, 'specific', %s)
+                    """, (TITLE, f"burst {n}", [WRITER_ID]))
+                cur.execute("COMMIT")
+            subscriber = subscriber_of(WRITER_ID)
+            await wait_for(lambda: subscriber.lagging)
+            return await next_messages(stream, 5)
+        finally:
+            await stream.aclose()
+
+    assert asyncio.run(scenario()) == [f"burst {n}" for n in range(5)]
+
+
+def test_resync_replays_what_the_listener_missed(stream_db):
+    async def scenario():
+        stream = await open_stream(WRITER_ID, "writer")
+        try:
+            first = asyncio.ensure_future(next_event(stream))
+            await wait_for(lambda: broker._subscribers)
+            notify(stream_db, "live", "specific", [WRITER_ID])
+            await first
+
+            # As if the LISTEN connection dropped: the NOTIFY never reaches the stream
+            subscriber = subscriber_of(WRITER_ID)
+            broker.unsubscribe(subscriber)
+            notify(stream_db, "while away", "specific", [WRITER_ID])
+            with broker._lock:
+                broker._subscribers.add(subscriber)
+            broker._dispatch(notification_stream.RESYNC)
+            return await next_messages(stream, 1)
+        finally:
+            await stream.aclose()
+
+    assert asyncio.run(scenario()) == ["while away"]
+
+
+def insert_uncommitted(conn, message):
+    # A broadcast: the counter row it locks is not the one the specific insert needs
+    with conn.cursor() as cur:
+        cur.execute("""
+            INSERT INTO notifications (title, message, target_type)
+            VALUES (%s, %s, 'writers')
+        """, (TITLE, message))
+
+
+@pytest.mark.parametrize("listener_misses_it", [False, True])
+def test_lower_id_committed_after_a_higher_one_is_delivered(stream_db, listener_misses_it):
+    async def scenario():
+        stream = await open_stream(WRITER_ID, "writer")
+        slow = psycopg2.connect(TEST_DATABASE_URL)
+        try:
+            higher = asyncio.ensure_future(next_event(stream))
+            await wait_for(lambda: broker._subscribers)
+            insert_uncommitted(slow, "lower id")
+            notify(stream_db, "higher id", "specific", [WRITER_ID])
+            messages = [(await higher)["message"]]
+
+            lower = asyncio.ensure_future(next_event(stream))
+            subscriber = subscriber_of(WRITER_ID)
+            if listener_misses_it:
+                broker.unsubscribe(subscriber)
+            slow.commit()
+            if listener_misses_it:
+                # Give the NOTIFY time to go by, then resync as after a reconnect
+                await asyncio.sleep(0.5)
+                with broker._lock:
+                    broker._subscribers.add(subscriber)
+                broker._dispatch(notification_stream.RESYNC)
+            event = await lower
+            messages.append(event["message"])
+            return messages, event["sse_id"]
+        finally:
+            slow.close()
+            await stream.aclose()
+
+    messages, sse_id = asyncio.run(scenario())
+    assert messages == ["higher id", "lower id"]
+    # Reconnecting resumes after the newest id delivered, not the last one sent
+    with stream_db.cursor() as cur:
+        cur.execute("SELECT MAX(id) FROM notifications WHERE title = %s", (TITLE,))
+        assert sse_id == cur.fetchone()[0]
+
+
+def test_delivered_window_sends_each_id_once():
+    window = DeliveredWindow(100)
+    assert window.add(105) and window.add(103)
+    assert not window.add(105)
+    assert window.last_id == 105
+    assert window.replay_after() == 100
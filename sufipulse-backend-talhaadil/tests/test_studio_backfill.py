@@ -0,0 +1,105 @@
+"""
+The studio_slot_bookings backfill in migrations/0002 must book existing
+requests the way utils/availability.py books new ones. Needs TEST_DATABASE_URL
+(see conftest.py); everything runs in a transaction that is rolled back.
+"""
+
+from datetime import date
+
+import pytest
+
+from migrate import split_statements
+from utils.availability import resolve_time_block, session_period
+from tests.test_availability import STUDIO_VISIT_TIMES
+
+MIGRATION = "migrations/0002_studio_availability.up.sql"
+
+
+def backfill_statements():
+    with open(MIGRATION, encoding="utf-8") as f:
+        return [s for s in split_statements(f.read()) if s.lstrip().startswith("INSERT INTO studio_slot_bookings")]
+
+
+def run_backfill(cur):
+    statements = backfill_statements()
+    assert len(statements) == 2
+    for statement in statements:
+        cur.execute(statement)
+
+
+def bookings_for(cur, request_type, request_ids):
+    cur.execute("""
+        SELECT request_id, time_block, period_start, period_end FROM studio_slot_bookings
+        WHERE request_type = %s AND request_id = ANY(%s)
+    """, (request_type, request_ids))
+    return {row["request_id"]: row for row in cur.fetchall()}
+
+
+def test_backfill_books_studio_visit_form_labels(db_conn):
+    # One day per label, far enough ahead not to meet real bookings
+    visits = {}
+    with db_conn.cursor() as cur:
+        for offset, preferred_time in enumerate(STUDIO_VISIT_TIMES):
+            session_date = date(2031, 3, 3 + offset)
+            cur.execute("""
+                INSERT INTO studio_visit_requests (name, email, preferred_date, preferred_time, status)
+                VALUES ('Backfill Test', 'backfill@example.com', %s, %s, 'pending') RETURNING id
+            """, (session_date, preferred_time))
+            visits[cur.fetchone()["id"]] = (session_date, preferred_time)
+
+        run_backfill(cur)
+        booked = bookings_for(cur, "studio_visit", list(visits))
+
+    for request_id, (session_date, preferred_time) in visits.items():
+        block = resolve_time_block(preferred_time)
+        if block is None:
+            assert request_id not in booked, preferred_time
+            continue
+        row = booked[request_id]
+        assert row["time_block"] == block
+        assert (row["period_start"], row["period_end"]) == session_period(session_date, block)
+
+
+@pytest.mark.parametrize("time_block, duration", [
+    ("Morning", "Full Day"),
+    ("Afternoon", "Half Day"),
+    ("Evening", "Full Day"),
+    ("Morning", "1 Hour"),
+])
+def test_backfill_matches_runtime_durations(db_conn, time_block, duration):
+    session_date = date(2031, 4, 7)
+    with db_conn.cursor() as cur:
+        cur.execute("""
+            INSERT INTO studio_recording_requests (
+                lyric_title, preferred_session_date, preferred_time_block,
+                estimated_studio_duration, performance_direction, status
+            )
+            VALUES ('Backfill Test', %s, %s, %s, 'n/a', 'pending_review') RETURNING id
+        """, (session_date, time_block, duration))
+        request_id = cur.fetchone()["id"]
+
+        run_backfill(cur)
+        row = bookings_for(cur, "studio_recording", [request_id])[request_id]
+
+    assert (row["period_start"], row["period_end"]) == session_period(session_date, time_block, duration)
+
+
+def test_full_day_backfill_leaves_evening_free(db_conn):
+    session_date = date(2031, 4, 8)
+    with db_conn.cursor() as cur:
+        cur.execute("""
+            INSERT INTO studio_recording_requests (
+                lyric_title, preferred_session_date, preferred_time_block,
+                estimated_studio_duration, performance_direction, status
+            )
+            VALUES ('Backfill Test', %s, 'Morning', 'Full Day', 'n/a', 'pending_review')
+        """, (session_date,))
+        cur.execute("""
+            INSERT INTO studio_visit_requests (name, email, preferred_date, preferred_time, status)
+            VALUES ('Backfill Test', 'backfill@example.com', %s, 'Evening (5:00 PM - 8:00 PM)', 'pending')
+            RETURNING id
+        """, (session_date,))
+        visit_id = cur.fetchone()["id"]
+
+        run_backfill(cur)
+        assert visit_id in bookings_for(cur, "studio_visit", [visit_id])
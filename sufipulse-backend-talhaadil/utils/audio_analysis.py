@@ -0,0 +1,186 @@
+import os
+import shutil
+import subprocess
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+# Number of peak buckets stored per file (one byte each)
+WAVEFORM_BUCKETS = 200
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_analysis_executor() -> ProcessPoolExecutor:
+    """Lazily created process pool so decoding never blocks the event loop or the GIL"""
+    global _executor
+    if _executor is None:
+        workers = int(os.getenv("AUDIO_ANALYSIS_WORKERS", "2"))
+        _executor = ProcessPoolExecutor(max_workers=workers)
+    return _executor
+
+
+def compute_peaks(samples: np.ndarray, buckets: int = WAVEFORM_BUCKETS) -> bytes:
+    """
+    Downsample normalized mono samples (-1..1) into `buckets` absolute peaks,
+    quantized to one unsigned byte each.
+    """
+    if samples.size == 0:
+        return b""
+
+    magnitudes = np.abs(samples)
+    bucket_size = -(-magnitudes.size // buckets)  # ceil division
+    padded = np.zeros(bucket_size * buckets, dtype=magnitudes.dtype)
+    padded[:magnitudes.size] = magnitudes
+    peaks = padded.reshape(buckets, bucket_size).max(axis=1)
+    return np.clip(np.rint(peaks * 255), 0, 255).astype(np.uint8).tobytes()
+
+
+def _pcm_to_mono(raw: bytes, sample_width: int, channels: int) -> np.ndarray:
+    """Convert interleaved PCM bytes to normalized mono float32 samples"""
+    if sample_width == 1:
+        data = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif sample_width == 2:
+        data = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif sample_width == 3:
+        triplets = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = triplets[:, 0] | (triplets[:, 1] << 8) | (triplets[:, 2] << 16)
+        ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+        data = ints.astype(np.float32) / 8388608.0
+    elif sample_width == 4:
+        data = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported sample width: {sample_width}")
+
+    if channels > 1:
+        frames = data.size // channels
+        data = np.abs(data[:frames * channels].reshape(frames, channels)).max(axis=1)
+    return data
+
+
+def _analyze_wav(path: str) -> dict:
+    with wave.open(path, "rb") as wav:
+        channels = wav.getnchannels()
+        sample_width = wav.getsampwidth()
+        sample_rate = wav.getframerate()
+        frames = wav.getnframes()
+        raw = wav.readframes(frames)
+
+    samples = _pcm_to_mono(raw, sample_width, channels)
+    return {
+        "duration_seconds": frames / sample_rate if sample_rate else None,
+        "sample_rate": sample_rate,
+        "waveform": compute_peaks(samples),
+    }
+
+
+# MPEG audio header lookup tables (kbps / Hz), indexed by version and layer
+_MP3_BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLE_RATES = {1: [44100, 48000, 32000], 2: [22050, 24000, 16000], 2.5: [11025, 12000, 8000]}
+
+
+def _scan_mp3_frames(data: bytes) -> tuple:
+    """Walk MPEG frame headers and return (total_samples, sample_rate) without decoding"""
+    pos = 0
+    if data[:3] == b"ID3" and len(data) >= 10:
+        tag_size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        pos = 10 + tag_size
+
+    total_samples = 0
+    sample_rate = None
+    end = len(data) - 4
+    while pos < end:
+        if data[pos] != 0xFF or (data[pos + 1] & 0xE0) != 0xE0:
+            pos += 1
+            continue
+
+        b1, b2 = data[pos + 1], data[pos + 2]
+        version_bits = (b1 >> 3) & 0x03
+        layer_bits = (b1 >> 1) & 0x03
+        bitrate_index = (b2 >> 4) & 0x0F
+        rate_index = (b2 >> 2) & 0x03
+        if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or rate_index == 3:
+            pos += 1
+            continue
+
+        version = {3: 1, 2: 2, 0: 2.5}[version_bits]
+        layer = 4 - layer_bits
+        bitrate = _MP3_BITRATES[(1 if version == 1 else 2, layer)][bitrate_index] * 1000
+        rate = _MP3_SAMPLE_RATES[version][rate_index]
+        padding = (b2 >> 1) & 0x01
+
+        if layer == 1:
+            frame_samples = 384
+            frame_length = (12 * bitrate // rate + padding) * 4
+        else:
+            frame_samples = 1152 if (layer == 2 or version == 1) else 576
+            frame_length = frame_samples // 8 * bitrate // rate + padding
+
+        if frame_length <= 4:
+            pos += 1
+            continue
+
+        sample_rate = sample_rate or rate
+        total_samples += frame_samples
+        pos += frame_length
+
+    return total_samples, sample_rate
+
+
+def _decode_with_ffmpeg(path: str, sample_rate: int) -> Optional[np.ndarray]:
+    """Decode to mono 16-bit PCM through ffmpeg when it is installed"""
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        return None
+    result = subprocess.run(
+        [ffmpeg, "-v", "error", "-i", path, "-ac", "1", "-ar", str(sample_rate),
+         "-f", "s16le", "-acodec", "pcm_s16le", "-"],
+        capture_output=True,
+        timeout=60,
+    )
+    if result.returncode != 0:
+        return None
+    return np.frombuffer(result.stdout, dtype="<i2").astype(np.float32) / 32768.0
+
+
+def _analyze_mp3(path: str) -> dict:
+    with open(path, "rb") as f:
+        data = f.read()
+
+    total_samples, sample_rate = _scan_mp3_frames(data)
+    if not sample_rate:
+        raise ValueError("No MPEG audio frames found")
+
+    samples = _decode_with_ffmpeg(path, sample_rate)
+    return {
+        "duration_seconds": total_samples / sample_rate,
+        "sample_rate": sample_rate,
+        "waveform": compute_peaks(samples) if samples is not None else None,
+    }
+
+
+def analyze_audio_file(path: str) -> dict:
+    """
+    Extract duration, sample rate and a downsampled peak waveform.
+    Runs inside the process pool, so it must stay a plain top-level function.
+    """
+    extension = path.rsplit(".", 1)[-1].lower() if "." in path else ""
+    if extension == "mp3":
+        return _analyze_mp3(path)
+    return _analyze_wav(path)
+
+
+def waveform_to_list(waveform) -> Optional[list]:
+    """Expand the stored bytea peaks into a JSON-friendly list of 0-255 ints"""
+    if waveform is None:
+        return None
+    return list(bytes(waveform))
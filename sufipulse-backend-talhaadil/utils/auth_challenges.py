@@ -0,0 +1,48 @@
+import logging
+import os
+import threading
+from typing import Optional
+
+import psycopg2
+
+from db.connection import DBConnection
+from sql.combinedQueries import Queries
+
+logger = logging.getLogger(__name__)
+
+# Seconds between purges of expired and consumed auth_challenges; 0 disables the in-process job
+PURGE_SECONDS = float(os.getenv("AUTH_CHALLENGE_PURGE_SECONDS", "3600"))
+
+_stop = threading.Event()
+_worker: Optional[threading.Thread] = None
+
+
+def purge_once() -> int:
+    with DBConnection.get_db_connection() as conn:
+        return Queries(conn).purge_auth_challenges()
+
+
+def _purge_loop():
+    while not _stop.wait(PURGE_SECONDS):
+        try:
+            deleted = purge_once()
+            if deleted:
+                logger.debug("Purged %s auth challenges", deleted)
+        except psycopg2.Error as e:
+            logger.warning("Auth challenge purge failed: %s", e)
+        except Exception:
+            logger.exception("Auth challenge purge failed")
+
+
+def start_purger():
+    """Start the periodic purge in this worker; concurrent purges from other workers are harmless"""
+    global _worker
+    if PURGE_SECONDS <= 0 or (_worker and _worker.is_alive()):
+        return
+    _stop.clear()
+    _worker = threading.Thread(target=_purge_loop, name="auth-challenges", daemon=True)
+    _worker.start()
+
+
+def stop_purger():
+    _stop.set()
@@ -0,0 +1,133 @@
+from bisect import bisect_left
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+import re
+
+# Bookable time blocks per day (start, end), in studio local time
+TIME_BLOCKS = {
+    "Morning": (time(9, 0), time(13, 0)),
+    "Afternoon": (time(13, 0), time(17, 0)),
+    "Evening": (time(17, 0), time(21, 0)),
+}
+
+DAY_END = time(21, 0)
+
+# estimated_studio_duration -> hours booked from the start of the chosen block
+# (the recording form offers "Half Day (4 hours)" and "Full Day (8 hours)")
+DURATION_HOURS = {
+    "1 Hour": 1,
+    "2 Hours": 2,
+    "Half Day": 4,
+    "Full Day": 8,
+}
+
+# The longest booking; bounds how far back an overlapping interval can start
+MAX_BOOKING = timedelta(hours=max(max(DURATION_HOURS.values()), 4))
+
+# Studio visit time a visitor leaves to the studio: no slot is reserved for it,
+# the admin fixes the time when confirming the visit
+FLEXIBLE_TIME = "flexible"
+
+
+def resolve_time_block(preferred_time: Optional[str]) -> Optional[str]:
+    """
+    Map a preferred time onto a time block: a block name, optionally followed by
+    its hours as the forms label it ("Morning (9:00 AM - 12:00 PM)"), or a clock
+    time ("14:30", "3 pm"). Returns None when the value cannot be placed in any
+    block, including FLEXIBLE_TIME.
+    """
+    if not preferred_time:
+        return None
+
+    value = preferred_time.strip()
+    if value.lower() == FLEXIBLE_TIME:
+        return None
+    for block in TIME_BLOCKS:
+        if re.match(rf"^{block}\b", value, re.IGNORECASE):
+            return block
+
+    match = re.match(r"^(\d{1,2})(?::(\d{2}))?\s*([ap]\.?m\.?)?$", value.lower())
+    if not match:
+        return None
+
+    hour = int(match.group(1))
+    meridiem = match.group(3)
+    if meridiem:
+        if hour > 12:
+            return None
+        hour = hour % 12 + (12 if meridiem.startswith("p") else 0)
+
+    for block, (start, end) in TIME_BLOCKS.items():
+        if start.hour <= hour < end.hour:
+            return block
+    return None
+
+
+def session_period(session_date: date, time_block: str, duration: Optional[str] = None) -> Tuple[datetime, datetime]:
+    """Return the [start, end) period a booking occupies, capped at the end of the day"""
+    block_start, block_end = TIME_BLOCKS[time_block]
+    start = datetime.combine(session_date, block_start)
+    if duration in DURATION_HOURS:
+        end = start + timedelta(hours=DURATION_HOURS[duration])
+    else:
+        end = datetime.combine(session_date, block_end)
+    return start, min(end, datetime.combine(session_date, DAY_END))
+
+
+class SlotIntervalIndex:
+    """
+    Booked intervals of one resource, sorted by start.
+    Overlap lookups bisect on the start times; because no booking is longer
+    than MAX_BOOKING, only intervals starting in [start - MAX_BOOKING, end) can overlap.
+    """
+
+    def __init__(self, bookings: Iterable[Tuple[datetime, datetime, int]]):
+        self._intervals = sorted(bookings)
+        self._starts = [interval[0] for interval in self._intervals]
+
+    def lanes_in_use(self, start: datetime, end: datetime) -> set:
+        lo = bisect_left(self._starts, start - MAX_BOOKING)
+        hi = bisect_left(self._starts, end)
+        return {
+            lane
+            for booked_start, booked_end, lane in self._intervals[lo:hi]
+            if booked_end > start
+        }
+
+
+def build_availability_calendar(start_date: date, end_date: date, resources: List[dict],
+                                bookings: List[dict]) -> List[dict]:
+    """
+    Compute per-day, per-block free capacity for every resource from one set of
+    booking rows (resource_id, period_start, period_end, lane).
+    """
+    per_resource: Dict[int, list] = {resource["id"]: [] for resource in resources}
+    for booking in bookings:
+        per_resource.setdefault(booking["resource_id"], []).append(
+            (booking["period_start"], booking["period_end"], booking["lane"])
+        )
+    indexes = {resource_id: SlotIntervalIndex(rows) for resource_id, rows in per_resource.items()}
+
+    days = []
+    current = start_date
+    while current <= end_date:
+        blocks = []
+        for block in TIME_BLOCKS:
+            start, end = session_period(current, block)
+            slots = {}
+            for resource in resources:
+                booked = len(indexes[resource["id"]].lanes_in_use(start, end))
+                slots[resource["slug"]] = {
+                    "capacity": resource["capacity"],
+                    "booked": booked,
+                    "available": max(resource["capacity"] - booked, 0),
+                }
+            blocks.append({
+                "time_block": block,
+                "start": start.time().isoformat("minutes"),
+                "end": end.time().isoformat("minutes"),
+                "resources": slots,
+            })
+        days.append({"date": current.isoformat(), "blocks": blocks})
+        current += timedelta(days=1)
+    return days
@@ -0,0 +1,49 @@
+import logging
+import os
+import threading
+from typing import Optional
+
+import psycopg2
+
+from db.connection import DBConnection
+from sql.combinedQueries import Queries
+
+logger = logging.getLogger(__name__)
+
+# Seconds between blog_rankings refreshes; 0 disables the in-process job (e.g. when cron runs it)
+REFRESH_SECONDS = float(os.getenv("BLOG_RANKING_REFRESH_SECONDS", "300"))
+
+_stop = threading.Event()
+_worker: Optional[threading.Thread] = None
+
+
+def refresh_once(rebuild: bool = False) -> Optional[int]:
+    """One refresh on a fresh connection; None when another worker holds the refresh lock"""
+    with DBConnection.get_db_connection() as conn:
+        return Queries(conn).refresh_blog_rankings(rebuild=rebuild)
+
+
+def _refresh_loop():
+    while not _stop.wait(REFRESH_SECONDS):
+        try:
+            updated = refresh_once()
+            if updated is not None:
+                logger.debug("Blog rankings refreshed (%s blogs updated)", updated)
+        except psycopg2.Error as e:
+            logger.warning("Blog ranking refresh failed: %s", e)
+        except Exception:
+            logger.exception("Blog ranking refresh failed")
+
+
+def start_refresher():
+    """Start the periodic refresh in this worker; workers that lose the advisory lock skip the round"""
+    global _worker
+    if REFRESH_SECONDS <= 0 or (_worker and _worker.is_alive()):
+        return
+    _stop.clear()
+    _worker = threading.Thread(target=_refresh_loop, name="blog-rankings", daemon=True)
+    _worker.start()
+
+
+def stop_refresher():
+    _stop.set()
@@ -0,0 +1,131 @@
+import ipaddress
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Request
+
+from utils.metrics import engagement_events_total
+
+# Comma-separated CIDRs of the proxies/load balancers in front of the app. Only
+# X-Forwarded-For hops added by these are trusted; with none configured the
+# peer address is the client.
+TRUSTED_PROXY_CIDRS = os.getenv("TRUSTED_PROXY_CIDRS", "127.0.0.1/32,::1/128")
+# Engagement events (views, shares) each client IP may record: a burst, refilled per minute
+ENGAGEMENT_BURST = int(os.getenv("ENGAGEMENT_BURST", "20"))
+ENGAGEMENT_PER_MINUTE = float(os.getenv("ENGAGEMENT_PER_MINUTE", "30"))
+# Token buckets held in memory; the least recently seen IPs are evicted past this
+ENGAGEMENT_TRACKED_IPS = int(os.getenv("ENGAGEMENT_TRACKED_IPS", "10000"))
+
+# Crawlers, link previewers, monitors and scripted clients
+BOT_USER_AGENT = re.compile(
+    r"bot\b|bot/|crawl|spider|slurp|scrap|archiver|"
+    r"facebookexternalhit|embedly|preview|^whatsapp/|"
+    r"headless|phantomjs|puppeteer|playwright|selenium|lighthouse|pingdom|uptime|monitor|"
+    r"curl/|wget/|python-requests|python-urllib|aiohttp|httpx|okhttp|go-http-client|java/|libwww|"
+    r"node-fetch|axios/|postman",
+    re.IGNORECASE,
+)
+
+ACCEPTED = "accepted"
+REJECTED_BOT = "bot"
+REJECTED_RATE_LIMITED = "rate_limited"
+
+
+def _parse_networks(cidrs: str) -> tuple:
+    return tuple(ipaddress.ip_network(cidr.strip(), strict=False) for cidr in cidrs.split(",") if cidr.strip())
+
+
+_TRUSTED_NETWORKS = _parse_networks(TRUSTED_PROXY_CIDRS)
+
+
+def _is_trusted(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in _TRUSTED_NETWORKS)
+
+
+def client_ip(request: Request) -> str:
+    """
+    Client address, honouring X-Forwarded-For only through trusted proxies:
+    walk the chain from the nearest hop and stop at the first untrusted one.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if not _is_trusted(peer):
+        return peer
+    forwarded = request.headers.get("X-Forwarded-For")
+    if not forwarded:
+        return peer
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+def is_bot(user_agent: Optional[str]) -> bool:
+    """Missing user agents count as bots: browsers always send one"""
+    return not user_agent or BOT_USER_AGENT.search(user_agent) is not None
+
+
+class TokenBuckets:
+    """Per-key token buckets in a bounded LRU; evicted keys come back with a full bucket"""
+
+    def __init__(self, burst: int, per_minute: float, max_keys: int):
+        self.burst = burst
+        self.rate = per_minute / 60
+        self.max_keys = max_keys
+        self._buckets: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return allowed
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+@dataclass
+class Verdict:
+    ip: str
+    result: str
+
+    @property
+    def accepted(self) -> bool:
+        return self.result == ACCEPTED
+
+
+_buckets = TokenBuckets(ENGAGEMENT_BURST, ENGAGEMENT_PER_MINUTE, ENGAGEMENT_TRACKED_IPS)
+
+
+def check_engagement(request: Request, kind: str) -> Verdict:
+    """
+    Ingestion filter for engagement events (kind: "view", "share"): drops
+    crawler traffic and clients over their token bucket before anything is
+    written, and counts the outcome in sufipulse_engagement_events_total.
+    """
+    ip = client_ip(request)
+    if is_bot(request.headers.get("user-agent")):
+        result = REJECTED_BOT
+    elif not _buckets.take(ip):
+        result = REJECTED_RATE_LIMITED
+    else:
+        result = ACCEPTED
+    engagement_events_total.labels(kind, result).inc()
+    return Verdict(ip, result)
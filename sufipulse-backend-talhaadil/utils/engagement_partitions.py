@@ -0,0 +1,56 @@
+import logging
+import os
+import threading
+from typing import Optional
+
+import psycopg2
+
+from db.connection import DBConnection
+from sql.combinedQueries import Queries
+
+logger = logging.getLogger(__name__)
+
+# Seconds between partition maintenance rounds; 0 disables the in-process job (e.g. when cron runs it)
+MAINTENANCE_SECONDS = float(os.getenv("ENGAGEMENT_MAINTENANCE_SECONDS", "3600"))
+# Months of raw blog_views/blog_shares rows kept after rollup; 0 keeps them forever
+RETENTION_MONTHS = int(os.getenv("ENGAGEMENT_RETENTION_MONTHS", "0"))
+
+_stop = threading.Event()
+_worker: Optional[threading.Thread] = None
+
+
+def maintain_once() -> Optional[dict]:
+    """One maintenance round on a fresh connection; None when another worker holds the lock"""
+    with DBConnection.get_db_connection() as conn:
+        return Queries(conn).maintain_engagement_partitions(retention_months=RETENTION_MONTHS)
+
+
+def _maintenance_loop():
+    # First round right away, so next month's partition exists before any insert needs it
+    while True:
+        try:
+            done = maintain_once()
+            for parent, rows in (done or {}).get("defaulted", {}).items():
+                logger.warning("%s rows landed in %s_default: a monthly partition was missing; moved them", rows, parent)
+            if done and (done["rolled_up"] or done["dropped"]):
+                logger.info("Engagement partitions rolled up %s, dropped %s", done["rolled_up"], done["dropped"])
+        except psycopg2.Error as e:
+            logger.warning("Engagement partition maintenance failed: %s", e)
+        except Exception:
+            logger.exception("Engagement partition maintenance failed")
+        if _stop.wait(MAINTENANCE_SECONDS):
+            return
+
+
+def start_maintenance():
+    """Start the periodic maintenance in this worker; workers that lose the advisory lock skip the round"""
+    global _worker
+    if MAINTENANCE_SECONDS <= 0 or (_worker and _worker.is_alive()):
+        return
+    _stop.clear()
+    _worker = threading.Thread(target=_maintenance_loop, name="engagement-partitions", daemon=True)
+    _worker.start()
+
+
+def stop_maintenance():
+    _stop.set()
@@ -53,7 +53,7 @@ def google_login_or_signup(token: str, role: str = None):
     else:
         info_submitted = bool(db.is_writer_registered(user["id"]))
 
-    access_token = create_access_token({"sub": str(user["id"])})
+    access_token = create_access_token({"sub": str(user["id"]), "role": role})
     refresh_token = create_refresh_token({"sub": str(user["id"])})
 
     return {
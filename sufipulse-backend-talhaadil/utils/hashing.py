@@ -1,4 +1,8 @@
+import hashlib
+import hmac
+import os
 from passlib.context import CryptContext
+from utils.metrics import track_password_hash
 
 pwd_context = CryptContext(
     schemes=["argon2"],  # Using argon2 as the primary scheme to avoid bcrypt issues
@@ -6,7 +10,15 @@ pwd_context = CryptContext(
 )
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    with track_password_hash("hash"):
+        return pwd_context.hash(password)
 
 def verify_password(password: str, hashed: str) -> bool:
-    return pwd_context.verify(password, hashed)
+    with track_password_hash("verify"):
+        return pwd_context.verify(password, hashed)
+
+def hash_otp(email: str, purpose: str, code: str) -> str:
+    """HMAC of a one-time code, keyed so a leaked auth_challenges table can't be brute-forced offline"""
+    secret = os.getenv("OTP_HASH_SECRET") or os.getenv("JWT_SECRET", "your_default")
+    message = f"{purpose}:{email}:{code.strip()}".encode("utf-8")
+    return hmac.new(secret.encode("utf-8"), message, hashlib.sha256).hexdigest()
@@ -0,0 +1,64 @@
+import hashlib
+import math
+from typing import Iterable, Optional, Tuple
+
+# 2^11 one-byte registers: 2 KB per sketch, ~2.3% standard error (1.04 / sqrt(m))
+PRECISION = 11
+REGISTERS = 1 << PRECISION
+_VALUE_BITS = 64 - PRECISION
+_ALPHA = 0.7213 / (1 + 1.079 / REGISTERS)
+
+
+def hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def position(value: str) -> Tuple[int, int]:
+    """
+    (register index, rank) for a value. Adding the value to a sketch is
+    registers[index] = max(registers[index], rank), which the database can
+    apply in place with get_byte/set_byte.
+    """
+    hashed = hash64(value)
+    index = hashed >> _VALUE_BITS
+    remainder = hashed & ((1 << _VALUE_BITS) - 1)
+    rank = _VALUE_BITS - remainder.bit_length() + 1
+    return index, rank
+
+
+class HyperLogLog:
+    """Dense HyperLogLog over 64-bit hashes; serialized as REGISTERS bytes (bytea)"""
+
+    def __init__(self, registers: Optional[bytes] = None):
+        if registers is not None and len(registers) != REGISTERS:
+            raise ValueError(f"Expected {REGISTERS} registers, got {len(registers)}")
+        self.registers = bytearray(registers) if registers is not None else bytearray(REGISTERS)
+
+    @classmethod
+    def union(cls, sketches: Iterable[bytes]) -> "HyperLogLog":
+        merged = cls()
+        for registers in sketches:
+            merged.merge(cls(bytes(registers)))
+        return merged
+
+    def add(self, value: str) -> bool:
+        """True if the sketch changed"""
+        index, rank = position(value)
+        if self.registers[index] >= rank:
+            return False
+        self.registers[index] = rank
+        return True
+
+    def merge(self, other: "HyperLogLog"):
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> int:
+        raw = _ALPHA * REGISTERS * REGISTERS / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * REGISTERS and zeros:
+            # Small-range correction (linear counting)
+            return round(REGISTERS * math.log(REGISTERS / zeros))
+        return round(raw)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
@@ -0,0 +1,222 @@
+import threading
+import time
+import weakref
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from psycopg2.extensions import connection, cursor as base_cursor
+
+from utils.metrics import db_connections_open, db_connections_opened_total, observe_request
+from utils.n_plus_one import NPLUS1_DETECT, NPlusOneDetector, _active_detector, record_statement
+from utils.slow_queries import SLOW_QUERY_MS, report_slow_query
+
+# Samples kept per route for the rolling percentiles
+LATENCY_WINDOW = 1024
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+@dataclass
+class RequestDBStats:
+    """Database work done while serving one request"""
+    statements: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+    scope: Optional[dict] = None
+
+
+_request_db_stats: ContextVar[Optional[RequestDBStats]] = ContextVar("request_db_stats", default=None)
+
+
+def current_db_stats() -> Optional[RequestDBStats]:
+    return _request_db_stats.get()
+
+
+# ==================== DB CURSOR TIMING ====================
+
+@lru_cache(maxsize=None)
+def _timed_cursor_class(factory):
+    """Subclass of a cursor factory (cursor, DictCursor, RealDictCursor...) that reports to the request stats"""
+
+    class TimedCursor(factory):
+        def execute(self, query, vars=None):
+            return self._timed(super().execute, query, vars)
+
+        def executemany(self, query, vars_list):
+            return self._timed(super().executemany, query, vars_list)
+
+        def _timed(self, run, query, params):
+            record_statement(query)
+            start = time.perf_counter()
+            result = run(query, params)
+            elapsed = time.perf_counter() - start
+
+            stats = _request_db_stats.get()
+            if stats is not None:
+                stats.seconds += elapsed
+                stats.statements += 1
+                if self.rowcount > 0:
+                    stats.rows += self.rowcount
+
+            if elapsed * 1000 >= SLOW_QUERY_MS:
+                route = route_template(stats.scope) if stats is not None and stats.scope else None
+                report_slow_query(query, params, self.query, elapsed, route)
+            return result
+
+    TimedCursor.__name__ = f"Timed{factory.__name__}"
+    return TimedCursor
+
+
+class InstrumentedConnection(connection):
+    """
+    psycopg2 connection whose cursors, whatever their factory, are timed per request.
+    Also tracks open connections; the gauge is released on close() or, for handlers
+    that never close, when the connection is garbage collected.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        db_connections_opened_total.inc()
+        db_connections_open.inc()
+        self._release_gauge = weakref.finalize(self, db_connections_open.dec)
+
+    def close(self):
+        super().close()
+        self._release_gauge()
+
+    def cursor(self, *args, cursor_factory=None, **kwargs):
+        factory = cursor_factory or self.cursor_factory or base_cursor
+        return super().cursor(*args, cursor_factory=_timed_cursor_class(factory), **kwargs)
+
+
+# ==================== ROUTE LATENCY ====================
+
+def _percentile(sorted_samples, fraction: float) -> float:
+    index = min(len(sorted_samples) - 1, max(0, round(fraction * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+class RouteLatencyStats:
+    """Rolling wall-time and DB-time samples per (method, route template)"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._window = window
+        self._lock = threading.Lock()
+        self._wall = defaultdict(lambda: deque(maxlen=self._window))
+        self._db = defaultdict(lambda: deque(maxlen=self._window))
+        self._statements = defaultdict(lambda: deque(maxlen=self._window))
+        self._counts = defaultdict(int)
+
+    def record(self, method: str, route: str, wall_seconds: float, db: RequestDBStats):
+        key = (method, route)
+        with self._lock:
+            self._wall[key].append(wall_seconds * 1000)
+            self._db[key].append(db.seconds * 1000)
+            self._statements[key].append(db.statements)
+            self._counts[key] += 1
+
+    def snapshot(self) -> list:
+        """Per-route percentiles (ms) over the rolling window, slowest p95 first"""
+        with self._lock:
+            items = [
+                (key, list(self._wall[key]), list(self._db[key]), list(self._statements[key]), self._counts[key])
+                for key in self._wall
+            ]
+
+        routes = []
+        for (method, route), wall, db, statements, count in items:
+            wall.sort()
+            db.sort()
+            routes.append({
+                "method": method,
+                "route": route,
+                "count": count,
+                "window": len(wall),
+                "p50_ms": round(_percentile(wall, 0.50), 2),
+                "p95_ms": round(_percentile(wall, 0.95), 2),
+                "p99_ms": round(_percentile(wall, 0.99), 2),
+                "db_p50_ms": round(_percentile(db, 0.50), 2),
+                "db_p95_ms": round(_percentile(db, 0.95), 2),
+                "avg_statements": round(sum(statements) / len(statements), 1),
+            })
+        routes.sort(key=lambda r: r["p95_ms"], reverse=True)
+        return routes
+
+    def reset(self):
+        with self._lock:
+            self._wall.clear()
+            self._db.clear()
+            self._statements.clear()
+            self._counts.clear()
+
+
+route_latency = RouteLatencyStats()
+
+
+def route_template(scope: dict) -> str:
+    """The matched route's path template, so /kalams/12 and /kalams/13 share one series"""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path:
+        return path
+    # Mounted apps (StaticFiles) only leave their mount point behind
+    if scope.get("root_path"):
+        return scope["root_path"] + "/{path}"
+    return UNMATCHED_ROUTE
+
+
+# ==================== MIDDLEWARE ====================
+
+class TimingMiddleware:
+    """
+    Pure ASGI middleware: times every HTTP request, collects the DB time of the
+    cursors used while serving it, adds a Server-Timing header and feeds
+    route_latency and the Prometheus metrics. Streaming responses are not buffered.
+    With NPLUS1_DETECT set, repeated statement shapes are reported once the request ends.
+    """
+
+    def __init__(self, app, stats: RouteLatencyStats = route_latency):
+        self.app = app
+        self.stats = stats
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        db_stats = RequestDBStats(scope=scope)
+        token = _request_db_stats.set(db_stats)
+        detector = NPlusOneDetector() if NPLUS1_DETECT else None
+        detector_token = _active_detector.set(detector) if detector else None
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                server_timing = (
+                    f'app;dur={elapsed_ms:.1f}, '
+                    f'db;dur={db_stats.seconds * 1000:.1f};desc="{db_stats.statements} queries, {db_stats.rows} rows"'
+                )
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            wall_seconds = time.perf_counter() - start
+            route = route_template(scope)
+            self.stats.record(scope["method"], route, wall_seconds, db_stats)
+            observe_request(scope["method"], route, status, wall_seconds, db_stats.seconds, db_stats.statements)
+            _request_db_stats.reset(token)
+            if detector_token is not None:
+                _active_detector.reset(detector_token)
+        if detector is not None:
+            detector.report(f"{scope['method']} {route_template(scope)}")
@@ -1,12 +1,15 @@
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
 import os
+import logging
 from dotenv import load_dotenv
 from datetime import timezone
 from fastapi import Depends, HTTPException, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 security = HTTPBearer()
 
+logger = logging.getLogger(__name__)
+
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '..', '.env.local'))
 
 SECRET_KEY = os.getenv('JWT_SECRET', 'your_default')
@@ -35,17 +38,30 @@ def verify_token(token: str) -> dict:
 
 from fastapi import Depends, HTTPException, status
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
-    token = credentials.credentials
-    payload = verify_token(token)
+def _require_payload(credentials: HTTPAuthorizationCredentials) -> dict:
+    payload = verify_token(credentials.credentials)
     if not payload:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
 
-    user_id = payload.get("sub")
-    if not user_id:
+    if not payload.get("sub"):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
 
-    return user_id
+    return payload
+
+
+def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    return _require_payload(credentials)["sub"]
+
+
+def get_current_user_with_role(credentials: HTTPAuthorizationCredentials = Depends(security)) -> tuple:
+    """
+    (user_id, role) from the access token, saving a users lookup on hot paths.
+    role is None for tokens issued before it was added to the claims; callers
+    fall back to the database for those. Use the database for authorization
+    decisions: the claim can lag a role change by one token lifetime.
+    """
+    payload = _require_payload(credentials)
+    return payload["sub"], payload.get("role")
 
 
 def get_current_user_optional(authorization: str | None = Header(None)) -> int | None:
@@ -63,19 +79,13 @@ def get_current_user_optional(authorization: str | None = Header(None)) -> int |
         if authorization.startswith("Bearer "):
             token = authorization.split(" ")[1]
         
-        print(f"Extracting token: {token[:20]}...")
         payload = verify_token(token)
-        print(f"Token payload: {payload}")
         
         if payload:
             user_id = payload.get("sub")
             if user_id:
-                print(f"User ID extracted: {user_id}")
                 return int(user_id)
     except Exception as e:
-        print(f"Error in get_current_user_optional: {e}")
-        import traceback
-        traceback.print_exc()
-        pass
+        logger.debug("Ignoring unusable optional token: %s", e)
     
     return None
@@ -0,0 +1,192 @@
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import anyio
+from starlette.responses import Response
+
+from utils.metrics import cache_requests_total
+
+# Chunk size used when the server cannot do zero-copy sends
+CHUNK_SIZE = 256 * 1024
+
+AUDIO_MEDIA_TYPES = {
+    "mp3": "audio/mpeg",
+    "wav": "audio/wav",
+}
+
+# Names written by upload_reference_file: {uuid4}_{kalam_id}.{ext}
+# The uuid makes the name unique, so the bytes behind it never change.
+CONTENT_ADDRESSED_NAME = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}_\d+\.[A-Za-z0-9]+$"
+)
+
+# A byte position in a Range header: ASCII digits only (str.isdigit also accepts "²")
+_RANGE_POSITION = re.compile(r"[0-9]*")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_CACHE_CONTROL = "public, max-age=300"
+
+
+@dataclass(frozen=True)
+class MediaFileInfo:
+    path: str
+    size: int
+    mtime_ns: int
+    etag: str
+    media_type: str
+    immutable: bool
+
+
+_metadata_cache: dict = {}
+_metadata_lock = threading.Lock()
+
+
+def _build_info(path: str, st: os.stat_result) -> MediaFileInfo:
+    filename = os.path.basename(path)
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    immutable = bool(CONTENT_ADDRESSED_NAME.match(filename))
+    if immutable:
+        etag = f'"{filename.split("_", 1)[0]}-{st.st_size:x}"'
+    else:
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+    return MediaFileInfo(
+        path=path,
+        size=st.st_size,
+        mtime_ns=st.st_mtime_ns,
+        etag=etag,
+        media_type=AUDIO_MEDIA_TYPES.get(extension, "application/octet-stream"),
+        immutable=immutable,
+    )
+
+
+def get_media_file_info(path: str) -> Optional[MediaFileInfo]:
+    """
+    Return cached size/ETag metadata for a media file, or None if it does not exist.
+    A single stat() validates the cache entry; the ETag is only rebuilt when the file changed.
+    """
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+    cached = _metadata_cache.get(path)
+    if cached and cached.size == st.st_size and cached.mtime_ns == st.st_mtime_ns:
+        cache_requests_total.labels("media_metadata", "hit").inc()
+        return cached
+
+    cache_requests_total.labels("media_metadata", "miss").inc()
+    info = _build_info(path, st)
+    with _metadata_lock:
+        _metadata_cache[path] = info
+    return info
+
+
+def prime_media_file_info(path: str) -> Optional[MediaFileInfo]:
+    """Precompute metadata right after an upload so the first playback skips the work"""
+    with _metadata_lock:
+        _metadata_cache.pop(path, None)
+    return get_media_file_info(path)
+
+
+def parse_range_header(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=" range into an inclusive (start, end) pair.
+    Returns None when the whole file should be sent, including for malformed
+    headers (RFC 9110 says to ignore them); raises ValueError only when a
+    well-formed range is unsatisfiable.
+    Multi-range requests are answered with the full body, which RFC 9110 allows.
+    """
+    if not range_header:
+        return None
+
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    start_str, dash, end_str = spec.strip().partition("-")
+    if not dash or not _RANGE_POSITION.fullmatch(start_str) or not _RANGE_POSITION.fullmatch(end_str):
+        return None
+
+    if start_str == "":
+        # Suffix range: last N bytes
+        if end_str == "":
+            return None
+        length = int(end_str)
+        if length == 0 or size == 0:
+            raise ValueError("Range not satisfiable")
+        return max(size - length, 0), size - 1
+
+    start = int(start_str)
+    if end_str and int(end_str) < start:
+        return None
+    if start >= size:
+        raise ValueError("Range not satisfiable")
+    end = min(int(end_str), size - 1) if end_str else size - 1
+    return start, end
+
+
+class RangeFileResponse(Response):
+    """
+    Streams a byte range of a file.
+    Uses the ASGI "http.response.zerocopysend" extension (sendfile) when the server
+    advertises it, otherwise falls back to reading the file in CHUNK_SIZE blocks.
+    """
+
+    def __init__(
+        self,
+        info: MediaFileInfo,
+        status_code: int = 200,
+        byte_range: Optional[Tuple[int, int]] = None,
+        headers: Optional[dict] = None,
+        send_body: bool = True,
+    ):
+        super().__init__(content=None, status_code=status_code, headers=headers, media_type=info.media_type)
+        self.info = info
+        self.send_body = send_body
+        self.start, self.end = byte_range if byte_range else (0, info.size - 1)
+        self.headers["content-length"] = str(max(self.end - self.start + 1, 0))
+
+    async def __call__(self, scope, receive, send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+
+        count = self.end - self.start + 1
+        if not self.send_body or count <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            fd = os.open(self.info.path, os.O_RDONLY)
+            try:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": fd,
+                    "offset": self.start,
+                    "count": count,
+                    "more_body": False,
+                })
+            finally:
+                os.close(fd)
+            return
+
+        async with await anyio.open_file(self.info.path, mode="rb") as f:
+            await f.seek(self.start)
+            remaining = count
+            while remaining > 0:
+                chunk = await f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": remaining > 0,
+                })
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
@@ -0,0 +1,144 @@
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+# With several uvicorn/gunicorn workers every process writes its samples to
+# PROMETHEUS_MULTIPROC_DIR (set before the workers start, emptied on deploy) and
+# /metrics merges them, so any worker can answer the scrape. Live gauges of a
+# worker that died are dropped once the directory is cleared on restart.
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# YouTube Data API cost per call (units against the daily quota)
+YOUTUBE_QUOTA_COST = {
+    "search": 100,
+    "videos": 1,
+}
+
+# ==================== HTTP ====================
+
+http_requests_total = Counter(
+    "sufipulse_http_requests_total", "HTTP requests served", ["method", "route", "status"]
+)
+http_request_duration_seconds = Histogram(
+    "sufipulse_http_request_duration_seconds", "Wall time per request", ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+http_request_db_seconds = Histogram(
+    "sufipulse_http_request_db_seconds", "Database time per request", ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+db_statements_total = Counter(
+    "sufipulse_db_statements_total", "SQL statements executed while serving requests", ["route"]
+)
+
+# ==================== DATABASE CONNECTIONS ====================
+
+db_connections_opened_total = Counter(
+    "sufipulse_db_connections_opened_total", "Database connections opened"
+)
+db_connections_open = Gauge(
+    "sufipulse_db_connections_open", "Database connections currently open", multiprocess_mode="livesum"
+)
+
+# ==================== CACHES ====================
+
+cache_requests_total = Counter(
+    "sufipulse_cache_requests_total", "In-process cache lookups", ["cache", "result"]
+)
+
+# ==================== ENGAGEMENT INGESTION ====================
+
+engagement_events_total = Counter(
+    "sufipulse_engagement_events_total", "Blog views and shares by ingestion filter outcome", ["kind", "result"]
+)
+
+rate_limited_total = Counter(
+    "sufipulse_rate_limited_total", "Requests answered 429 by the rate limiter", ["policy"]
+)
+
+# ==================== EMAIL ====================
+
+email_queue_depth = Gauge(
+    "sufipulse_email_queue_depth", "Emails queued for background sending", multiprocess_mode="livesum"
+)
+emails_sent_total = Counter(
+    "sufipulse_emails_sent_total", "Emails handed to the provider", ["result"]
+)
+
+# ==================== UPLOADS ====================
+
+upload_bytes_total = Counter(
+    "sufipulse_upload_bytes_total", "Bytes accepted by upload endpoints", ["kind"]
+)
+
+# ==================== YOUTUBE ====================
+
+youtube_sync_duration_seconds = Histogram(
+    "sufipulse_youtube_sync_duration_seconds", "Duration of a full channel sync",
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600),
+)
+youtube_api_requests_total = Counter(
+    "sufipulse_youtube_api_requests_total", "YouTube Data API calls", ["endpoint", "status"]
+)
+youtube_quota_units_total = Counter(
+    "sufipulse_youtube_quota_units_total", "YouTube Data API quota units consumed"
+)
+
+# ==================== PASSWORD HASHING ====================
+
+password_hash_in_flight = Gauge(
+    "sufipulse_password_hash_in_flight", "Argon2 hash/verify calls currently running", multiprocess_mode="livesum"
+)
+password_hash_duration_seconds = Histogram(
+    "sufipulse_password_hash_duration_seconds", "Argon2 hash/verify duration", ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+
+def observe_request(method: str, route: str, status: int, wall_seconds: float,
+                    db_seconds: float, db_statements: int):
+    http_requests_total.labels(method, route, str(status)).inc()
+    http_request_duration_seconds.labels(method, route).observe(wall_seconds)
+    http_request_db_seconds.labels(method, route).observe(db_seconds)
+    if db_statements:
+        db_statements_total.labels(route).inc(db_statements)
+
+
+def observe_youtube_call(endpoint: str, status: int):
+    youtube_api_requests_total.labels(endpoint, str(status)).inc()
+    youtube_quota_units_total.inc(YOUTUBE_QUOTA_COST.get(endpoint, 1))
+
+
+@contextmanager
+def track_password_hash(operation: str):
+    password_hash_in_flight.inc()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        password_hash_duration_seconds.labels(operation).observe(time.perf_counter() - start)
+        password_hash_in_flight.dec()
+
+
+def render_metrics() -> tuple:
+    """Return (body, content type) for the scrape, merged across workers when running multiprocess"""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
@@ -0,0 +1,110 @@
+import logging
+import os
+import traceback
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from utils.slow_queries import normalize_sql
+
+logger = logging.getLogger(__name__)
+
+# Debug/test switch: track statement shapes per request and report repeats
+NPLUS1_DETECT = os.getenv("NPLUS1_DETECT", "").lower() in ("1", "true", "yes")
+# The same statement shape this many times in one request is reported
+NPLUS1_THRESHOLD = int(os.getenv("NPLUS1_THRESHOLD", "5"))
+# Raise NPlusOneError at the end of the request instead of only logging (CI / test runs)
+NPLUS1_RAISE = os.getenv("NPLUS1_RAISE", "").lower() in ("1", "true", "yes")
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_IGNORED_FILES = (
+    os.path.join("utils", "instrumentation.py"),
+    os.path.join("utils", "n_plus_one.py"),
+)
+
+
+class NPlusOneError(AssertionError):
+    """Raised when a request (or a detect_n_plus_one block) repeats a statement shape too often"""
+
+
+class NPlusOneDetector:
+    """Counts statement shapes and keeps the application stack of the first repeat that crosses the threshold"""
+
+    def __init__(self, threshold: int = NPLUS1_THRESHOLD):
+        self.threshold = threshold
+        self.counts = {}
+        self.stacks = {}
+
+    def record(self, query):
+        shape = normalize_sql(query)
+        count = self.counts.get(shape, 0) + 1
+        self.counts[shape] = count
+        if count == self.threshold:
+            self.stacks[shape] = _application_stack()
+
+    def violations(self) -> list:
+        return [
+            {"sql": shape, "count": count, "stack": self.stacks.get(shape, [])}
+            for shape, count in self.counts.items()
+            if count >= self.threshold
+        ]
+
+    def report(self, label: str, raise_error: Optional[bool] = None):
+        violations = self.violations()
+        if not violations:
+            return
+        message = format_violations(label, violations)
+        if raise_error if raise_error is not None else NPLUS1_RAISE:
+            raise NPlusOneError(message)
+        logger.warning(message)
+
+
+_active_detector: ContextVar[Optional[NPlusOneDetector]] = ContextVar("n_plus_one_detector", default=None)
+
+
+def record_statement(query):
+    """Called by the timed cursor for every statement; a no-op unless a detector is active"""
+    detector = _active_detector.get()
+    if detector is not None:
+        detector.record(query)
+
+
+def _application_stack() -> list:
+    """Frames from this project only (no site-packages, no instrumentation), outermost first"""
+    frames = []
+    for frame in traceback.extract_stack():
+        filename = os.path.abspath(frame.filename)
+        if not filename.startswith(_PROJECT_ROOT) or "site-packages" in filename:
+            continue
+        if filename.endswith(_IGNORED_FILES):
+            continue
+        frames.append(f"{os.path.relpath(filename, _PROJECT_ROOT)}:{frame.lineno} in {frame.name}")
+    return frames
+
+
+def format_violations(label: str, violations: list) -> str:
+    lines = [f"N+1 queries in {label}:"]
+    for violation in violations:
+        lines.append(f"  {violation['count']}x {violation['sql'][:300]}")
+        for frame in violation["stack"]:
+            lines.append(f"      {frame}")
+    return "\n".join(lines)
+
+
+@contextmanager
+def detect_n_plus_one(label: str = "block", threshold: int = NPLUS1_THRESHOLD, raise_error: bool = True):
+    """
+    Track statements issued inside the block, e.g. in a test or a sync script:
+
+        with detect_n_plus_one("blog comments"):
+            db.get_blog_comments(blog_id)
+
+    Raises NPlusOneError on exit if any statement shape repeats threshold times.
+    """
+    detector = NPlusOneDetector(threshold)
+    token = _active_detector.set(detector)
+    try:
+        yield detector
+    finally:
+        _active_detector.reset(token)
+    detector.report(label, raise_error)
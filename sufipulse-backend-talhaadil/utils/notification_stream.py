@@ -0,0 +1,193 @@
+import asyncio
+import json
+import logging
+import os
+import select
+import threading
+import time
+from typing import Optional
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+logger = logging.getLogger(__name__)
+
+# Postgres channel the notifications insert trigger publishes to (payload: notification id)
+CHANNEL = "notifications"
+# Seconds between SSE heartbeats, so proxies keep idle streams open
+HEARTBEAT_SECONDS = float(os.getenv("NOTIFICATION_STREAM_HEARTBEAT", "15"))
+# Undelivered events buffered per subscriber before it falls back to replaying from the database
+SUBSCRIBER_BUFFER = int(os.getenv("NOTIFICATION_STREAM_BUFFER", "100"))
+# Upper bound for the delay between LISTEN reconnect attempts
+MAX_RECONNECT_DELAY = 30
+# Ids are handed out before commit, so a lower id can commit after a higher one:
+# replays reach this many ids below the newest one a stream delivered
+REPLAY_OVERLAP_IDS = int(os.getenv("NOTIFICATION_STREAM_REPLAY_OVERLAP", "500"))
+
+_NOTIFICATION_COLUMNS = "id, title, message, target_type, target_user_ids, created_at"
+
+# Put in a subscriber's queue when it missed events and must catch up from the database
+RESYNC = object()
+
+
+class Subscriber:
+    """One open stream: receives the notifications addressed to its user, in order"""
+
+    def __init__(self, user_id: int, audience: str, loop: asyncio.AbstractEventLoop):
+        self.user_id = user_id
+        self.audience = audience
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_BUFFER)
+        self.lagging = False
+
+    def wants(self, notification: dict) -> bool:
+        target_type = notification["target_type"]
+        if target_type == "specific":
+            return self.user_id in (notification["target_user_ids"] or [])
+        return target_type in ("all", self.audience)
+
+    def deliver(self, item):
+        """Runs on the event loop. A full buffer drops events and asks for a replay instead"""
+        if self.lagging:
+            return
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.lagging = True
+
+
+class DeliveredWindow:
+    """
+    What one stream has sent. Instead of a strict high-water mark, the ids
+    delivered within REPLAY_OVERLAP_IDS of the newest are remembered, so a
+    notification that commits out of id order is still sent (live or on replay)
+    and nothing in the window is sent twice.
+    """
+
+    def __init__(self, after_id: int):
+        # Ids up to the resume point are the client's already
+        self.floor = after_id
+        self.last_id = after_id
+        self._ids: set = set()
+
+    def replay_after(self) -> int:
+        """Id to replay from after missed events"""
+        return max(self.floor, self.last_id - REPLAY_OVERLAP_IDS)
+
+    def add(self, notification_id: int) -> bool:
+        """False if the id was already delivered"""
+        if notification_id in self._ids:
+            return False
+        self._ids.add(notification_id)
+        if notification_id > self.last_id:
+            self.last_id = notification_id
+            cutoff = self.replay_after()
+            self._ids = {delivered for delivered in self._ids if delivered > cutoff}
+        return True
+
+
+class NotificationBroker:
+    """
+    One LISTEN connection per worker process, shared by every open stream.
+    New notifications are announced by a trigger (pg_notify with the row id),
+    so every writer is covered; the broker loads each row once and hands it
+    to the subscribers it is addressed to. Each time LISTEN starts (first
+    connect and reconnects) every subscriber is told to resync, since NOTIFY
+    is not delivered before then.
+    """
+
+    def __init__(self):
+        self._subscribers: set = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, user_id: int, audience: str) -> Subscriber:
+        subscriber = Subscriber(user_id, audience, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.add(subscriber)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._listen_forever, name="notification-listener", daemon=True)
+                self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def _dispatch(self, item, notification: Optional[dict] = None):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            if notification is None or subscriber.wants(notification):
+                try:
+                    subscriber.loop.call_soon_threadsafe(subscriber.deliver, item)
+                except RuntimeError:
+                    # Event loop already closed (worker shutting down)
+                    self.unsubscribe(subscriber)
+
+    def _listen_forever(self):
+        delay = 1
+        while True:
+            conn = None
+            try:
+                conn = psycopg2.connect(os.getenv("DATABASE_URL"))
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {CHANNEL};")
+                # Streams opened before LISTEN took effect (or while reconnecting)
+                # missed the NOTIFYs of that gap: every subscriber catches up
+                self._dispatch(RESYNC)
+                delay = 1
+                logger.info("Listening for notifications on channel %s", CHANNEL)
+                self._poll(conn)
+            except psycopg2.Error as e:
+                logger.warning("Notification listener lost its connection (%s); retrying in %ss", e, delay)
+            finally:
+                if conn is not None:
+                    conn.close()
+            time.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    def _poll(self, conn):
+        while True:
+            if select.select([conn], [], [], HEARTBEAT_SECONDS) == ([], [], []):
+                # Idle: make sure the connection is still alive
+                with conn.cursor() as cur:
+                    cur.execute("SELECT 1")
+                continue
+            conn.poll()
+            ids = []
+            while conn.notifies:
+                payload = conn.notifies.pop(0).payload
+                if payload.isdigit():
+                    ids.append(int(payload))
+            if ids:
+                self._publish(conn, ids)
+
+    def _publish(self, conn, ids):
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            cur.execute(f"SELECT {_NOTIFICATION_COLUMNS} FROM notifications WHERE id = ANY(%s) ORDER BY id", (ids,))
+            rows = cur.fetchall()
+        for row in rows:
+            notification = notification_event(row)
+            self._dispatch(notification, notification)
+
+
+def notification_event(row) -> dict:
+    """Wire format shared by live events and replays"""
+    return {
+        "id": row["id"],
+        "title": row["title"],
+        "message": row["message"],
+        "target_type": row["target_type"],
+        "target_user_ids": row["target_user_ids"],
+        "created_at": row["created_at"].isoformat() if row["created_at"] else None,
+    }
+
+
+def format_sse(data: dict, event: str = "notification", event_id: Optional[int] = None) -> str:
+    """event_id (the SSE id a reconnect resumes after) defaults to the notification id"""
+    return f"id: {data['id'] if event_id is None else event_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+broker = NotificationBroker()
@@ -1,8 +1,12 @@
-import random
+import logging
+import secrets
 import resend
 from datetime import datetime, timedelta, timezone
 import os
 from dotenv import load_dotenv
+from utils.metrics import email_queue_depth, emails_sent_total
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables from the main .env file
 load_dotenv()
@@ -12,7 +16,7 @@ resend.api_key = os.getenv('RESEND_API_KEY')
 from_email = os.getenv('FROM_EMAIL', 'onboarding@resend.dev')  # Default to Resend's test domain
 
 def generate_otp() -> str:
-    return str(random.randint(100000, 999999))
+    return str(secrets.randbelow(900000) + 100000)
 
 def send_otp_email(to_email: str, otp: str):
     try:
@@ -187,3 +191,77 @@ def send_studio_visit_request_email(to_email: str):
         subject="Studio Visit Request Submitted"
     )
 
+
+# Resend accepts at most this many messages per batch call
+EMAIL_BATCH_SIZE = 100
+
+RECORDING_STATUS_SUBJECTS = {
+    'approved': 'Your Recording Request Has Been Approved',
+    'rejected': 'Update on Your Recording Request',
+    'completed': 'Your Recording Request Is Complete',
+}
+
+def build_recording_request_status_email(email: str, request_type: str, status: str, title: str, name: str = None) -> dict:
+    """Build the Resend params for a recording request status update"""
+    subject = RECORDING_STATUS_SUBJECTS.get(status, 'Recording Request Status Update')
+    label = 'studio' if request_type == 'studio' else 'remote'
+    html_content = f"""
+    <html>
+      <body style="font-family: Arial, sans-serif; background-color: #f9f9f9; padding: 20px;">
+        <div style="max-width: 500px; margin: auto; background: #ffffff; border-radius: 12px;
+                    padding: 30px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
+          <div style="text-align: center; margin-bottom: 20px;">
+            <h2 style="color: #065f46; margin: 0;">Sufi Pulse</h2>
+          </div>
+
+          <p style="color: #333; font-size: 15px;">
+            Dear {name or 'Vocalist'},<br><br>
+            Your {label} recording request for <strong>{title}</strong> is now <strong>{status.replace('_', ' ')}</strong>.
+          </p>
+
+          <p style="color: #999; font-size: 12px; margin-top: 30px; text-align: center;">
+            © {datetime.now().year} Sufi Pulse. All rights reserved.
+          </p>
+        </div>
+      </body>
+    </html>
+    """
+    return {
+        "from": from_email,
+        "to": [email],
+        "subject": subject,
+        "html": html_content,
+        "text": f"Your {label} recording request for {title} is now {status.replace('_', ' ')}."
+    }
+
+def send_recording_request_status_email(email: str, request_type: str, status: str, title: str, name: str = None):
+    """Send a single recording request status update"""
+    if not email:
+        return None
+    email_response = resend.Emails.send(build_recording_request_status_email(email, request_type, status, title, name))
+    logger.info("Status email sent with ID %s", email_response['id'])
+    return email_response
+
+def send_email_batch(messages: list):
+    """
+    Send prebuilt Resend params in chunks of EMAIL_BATCH_SIZE.
+    Meant to run as a background task; a failed chunk is logged and the rest still go out.
+    """
+    for start in range(0, len(messages), EMAIL_BATCH_SIZE):
+        chunk = messages[start:start + EMAIL_BATCH_SIZE]
+        try:
+            resend.Batch.send(chunk)
+            emails_sent_total.labels("sent").inc(len(chunk))
+            logger.info("Batch of %s emails sent", len(chunk))
+        except Exception as e:
+            emails_sent_total.labels("failed").inc(len(chunk))
+            logger.error("Error sending email batch: %s", e)
+        finally:
+            email_queue_depth.dec(len(chunk))
+
+def queue_email_batch(background_tasks, messages: list):
+    """Schedule send_email_batch after the response and count the messages as queued"""
+    if not messages:
+        return
+    email_queue_depth.inc(len(messages))
+    background_tasks.add_task(send_email_batch, messages)
@@ -0,0 +1,273 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import psycopg2
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from utils.engagement_filter import client_ip
+from utils.jwt_handler import verify_token
+from utils.metrics import rate_limited_total
+
+logger = logging.getLogger(__name__)
+
+# "memory" counts per worker process; "postgres" shares the counters between replicas
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+# Counter keys kept by the memory backend; the least recently used are evicted past this
+MEMORY_MAX_KEYS = int(os.getenv("RATE_LIMIT_MEMORY_KEYS", "50000"))
+# Seconds between deletions of expired rows in rate_limit_counters
+PURGE_SECONDS = 300
+# Request bodies read to find the email key; larger bodies are only limited by IP/user
+MAX_BODY_BYTES = 64 * 1024
+EMAIL_FIELDS = ("email", "commenter_email")
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """At most `limit` requests per sliding `window` seconds for each value of `key` (ip, email or user)"""
+    name: str
+    key: str
+    limit: int
+    window: int
+
+
+# (method, path pattern) -> policies; a request must pass all of them
+ROUTE_POLICIES: List[Tuple[str, re.Pattern, Tuple[RateLimitPolicy, ...]]] = [
+    ("POST", re.compile(r"^/auth/login/?$"), (
+        RateLimitPolicy("login-ip", "ip", 20, 60),
+        RateLimitPolicy("login-email", "email", 10, 900),
+    )),
+    ("POST", re.compile(r"^/auth/signup/?$"), (
+        RateLimitPolicy("signup-ip", "ip", 10, 3600),
+        RateLimitPolicy("signup-email", "email", 3, 600),
+    )),
+    ("POST", re.compile(r"^/auth/resend-otp/?$"), (
+        RateLimitPolicy("resend-otp-ip", "ip", 10, 600),
+        RateLimitPolicy("resend-otp-email", "email", 3, 600),
+    )),
+    ("POST", re.compile(r"^/auth/forgot-password/?$"), (
+        RateLimitPolicy("forgot-password-ip", "ip", 10, 600),
+        RateLimitPolicy("forgot-password-email", "email", 3, 900),
+    )),
+    ("POST", re.compile(r"^/public/contact/?$"), (
+        RateLimitPolicy("contact-ip", "ip", 5, 600),
+    )),
+    ("POST", re.compile(r"^/public/?$"), (
+        RateLimitPolicy("partnership-ip", "ip", 5, 3600),
+    )),
+    ("POST", re.compile(r"^/public/blogs/\d+/comment/?$"), (
+        RateLimitPolicy("comment-ip", "ip", 10, 600),
+        RateLimitPolicy("comment-user", "user", 10, 600),
+        RateLimitPolicy("comment-email", "email", 10, 600),
+    )),
+]
+
+
+def match_policies(method: str, path: str) -> Tuple[RateLimitPolicy, ...]:
+    for route_method, pattern, policies in ROUTE_POLICIES:
+        if method == route_method and pattern.match(path):
+            return policies
+    return ()
+
+
+def sliding_window(current: int, previous: int, window: int, now: float, limit: int) -> Tuple[bool, int]:
+    """
+    Sliding-window counter: the previous fixed window's hits weighted by how
+    much of it still overlaps the sliding window, plus the current window's.
+    Returns (allowed, seconds until a retry would be allowed).
+    """
+    elapsed = (now % window) / window
+    if previous * (1 - elapsed) + current <= limit:
+        return True, 0
+    if current > limit:
+        wait = (1 - elapsed) * window
+    else:
+        # When the previous window's remaining weight fits under the limit
+        wait = (1 - (limit - current) / previous - elapsed) * window
+    return False, max(1, math.ceil(wait))
+
+
+class MemoryBackend:
+    """Counters in this process only: each worker enforces the limits on its own share of traffic"""
+
+    blocking = False
+
+    def __init__(self, max_keys: int = MEMORY_MAX_KEYS):
+        self.max_keys = max_keys
+        self._counters: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, window_start: int, window: int) -> Tuple[int, int]:
+        """Count one request; returns (current window hits, previous window hits)"""
+        with self._lock:
+            start, current, previous = self._counters.pop(key, (window_start, 0, 0))
+            if start != window_start:
+                previous = current if start == window_start - window else 0
+                current = 0
+            current += 1
+            self._counters[key] = (window_start, current, previous)
+            if len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+            return current, previous
+
+
+class PostgresBackend:
+    """
+    Counters in the rate_limit_counters table (migrations/0015), shared by
+    every worker and replica. One upsert per check, on a connection kept open
+    by this worker.
+    """
+
+    HIT_SQL = """
+        INSERT INTO rate_limit_counters AS c (key, window_start, hits, expires_at)
+        VALUES (%(key)s, %(window_start)s, 1, CURRENT_TIMESTAMP + make_interval(secs => %(ttl)s))
+        ON CONFLICT (key, window_start) DO UPDATE SET hits = c.hits + 1
+        RETURNING hits, (
+            SELECT hits FROM rate_limit_counters WHERE key = %(key)s AND window_start = %(previous)s
+        )
+    """
+
+    blocking = True
+
+    def __init__(self):
+        self._conn = None
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+
+    def _connection(self):
+        if self._conn is None or self._conn.closed:
+            self._conn = psycopg2.connect(os.getenv("DATABASE_URL"))
+            self._conn.autocommit = True
+        return self._conn
+
+    def hit(self, key: str, window_start: int, window: int) -> Tuple[int, int]:
+        with self._lock:
+            try:
+                with self._connection().cursor() as cur:
+                    cur.execute(self.HIT_SQL, {
+                        "key": key, "window_start": window_start, "previous": window_start - window, "ttl": 2 * window,
+                    })
+                    current, previous = cur.fetchone()
+                    if time.monotonic() - self._last_purge > PURGE_SECONDS:
+                        self._last_purge = time.monotonic()
+                        cur.execute("DELETE FROM rate_limit_counters WHERE expires_at < CURRENT_TIMESTAMP")
+                return current, previous or 0
+            except psycopg2.Error:
+                if self._conn is not None:
+                    self._conn.close()
+                self._conn = None
+                raise
+
+
+def _key_value(policy: RateLimitPolicy, request: Request, body: Optional[dict]) -> Optional[str]:
+    if policy.key == "ip":
+        return client_ip(request)
+    if policy.key == "user":
+        authorization = request.headers.get("authorization", "")
+        payload = verify_token(authorization.removeprefix("Bearer ").strip()) if authorization else None
+        return str(payload["sub"]) if payload and payload.get("sub") else None
+    if policy.key == "email" and body:
+        for field in EMAIL_FIELDS:
+            if isinstance(body.get(field), str) and body[field].strip():
+                # Emails are stored hashed: the counters table is not a list of addresses
+                return hashlib.sha256(body[field].strip().lower().encode("utf-8")).hexdigest()[:32]
+    return None
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware: applies ROUTE_POLICIES to matching requests and
+    answers 429 with Retry-After once any of their keys is over its limit.
+    Requests to other routes pass straight through. A backend failure lets
+    the request through (logged), so the limiter never takes the API down.
+    """
+
+    def __init__(self, app, backend=None):
+        self.app = app
+        self.backend = backend or (PostgresBackend() if RATE_LIMIT_BACKEND == "postgres" else MemoryBackend())
+
+    async def __call__(self, scope, receive, send):
+        policies = match_policies(scope.get("method", ""), scope.get("path", "")) \
+            if scope["type"] == "http" and RATE_LIMIT_ENABLED else ()
+        if not policies:
+            await self.app(scope, receive, send)
+            return
+
+        body = None
+        if any(policy.key == "email" for policy in policies):
+            receive, body = await self._buffer_body(receive)
+
+        request = Request(scope)
+        retry_after = 0
+        for policy in policies:
+            value = _key_value(policy, request, body)
+            if value is None:
+                continue
+            now = time.time()
+            window_start = int(now // policy.window) * policy.window
+            try:
+                key = f"{policy.name}:{value}"
+                if self.backend.blocking:
+                    current, previous = await run_in_threadpool(self.backend.hit, key, window_start, policy.window)
+                else:
+                    current, previous = self.backend.hit(key, window_start, policy.window)
+            except Exception as e:
+                logger.warning("Rate limit check %s failed, allowing the request: %s", policy.name, e)
+                continue
+            allowed, wait = sliding_window(current, previous, policy.window, now, policy.limit)
+            if not allowed:
+                rate_limited_total.labels(policy.name).inc()
+                retry_after = max(retry_after, wait)
+
+        if retry_after:
+            response = JSONResponse(
+                {"detail": f"Too many requests. Try again in {retry_after} seconds."},
+                status_code=429,
+                headers={"Retry-After": str(retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    async def _buffer_body(receive):
+        """Read the request body once and hand the app a receive that replays it"""
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] != "http.request":
+                break
+            chunks.append(message.get("body", b""))
+            size += len(chunks[-1])
+            more_body = message.get("more_body", False)
+        raw = b"".join(chunks)
+        replayed = False
+
+        async def replay():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return {"type": "http.request", "body": raw, "more_body": False}
+            return await receive()
+
+        body = None
+        if size <= MAX_BODY_BYTES:
+            try:
+                parsed = json.loads(raw)
+                body = parsed if isinstance(parsed, dict) else None
+            except ValueError:
+                body = None
+        return replay, body
@@ -0,0 +1,179 @@
+import hashlib
+import json
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import psycopg2
+
+logger = logging.getLogger(__name__)
+
+# Statements slower than this are logged
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# Fraction of slow read-only statements re-run under EXPLAIN (ANALYZE, BUFFERS); 0 disables
+SLOW_QUERY_EXPLAIN_RATE = float(os.getenv("SLOW_QUERY_EXPLAIN_RATE", "0"))
+# The same statement shape is explained at most once per cooldown
+EXPLAIN_COOLDOWN_SECONDS = 600
+
+_QUERIES_DIR = os.path.join("sql", "queries")
+_WHITESPACE = re.compile(r"\s+")
+# Only plain reads are safe to execute a second time
+_READ_ONLY = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+_WRITES = re.compile(r"\b(INSERT|UPDATE|DELETE|TRUNCATE|FOR\s+UPDATE|FOR\s+SHARE)\b", re.IGNORECASE)
+
+_explain_queue: "queue.Queue" = queue.Queue(maxsize=100)
+# query hash -> last capture time, oldest first; entries past the cooldown are pruned
+_last_explained: OrderedDict = OrderedDict()
+_last_explained_lock = threading.Lock()
+_worker_lock = threading.Lock()
+_worker: Optional[threading.Thread] = None
+
+
+def normalize_sql(query) -> str:
+    """Collapse whitespace of the parameterized SQL (placeholders stay as %s)"""
+    if isinstance(query, bytes):
+        query = query.decode("utf-8", "replace")
+    return _WHITESPACE.sub(" ", str(query)).strip()
+
+
+def params_shape(params) -> Optional[str]:
+    """Describe the parameters without their values, e.g. (int, str, list[3])"""
+    if params is None:
+        return None
+
+    def describe(value):
+        if isinstance(value, (list, tuple)):
+            return f"{type(value).__name__}[{len(value)}]"
+        return type(value).__name__
+
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{key}: {describe(value)}" for key, value in params.items()) + "}"
+    return "(" + ", ".join(describe(value) for value in params) + ")"
+
+
+def find_caller() -> Optional[str]:
+    """The Queries method (sql/queries/*.py) that issued the statement, e.g. KalamQueries.fetch_posted_kalams"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if _QUERIES_DIR in filename:
+            owner = frame.f_locals.get("self")
+            class_name = os.path.splitext(os.path.basename(filename))[0]
+            if owner is not None:
+                for cls in type(owner).__mro__:
+                    if frame.f_code.co_name in cls.__dict__:
+                        class_name = cls.__name__
+                        break
+            return f"{class_name}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def report_slow_query(query, params, bound_query: Optional[bytes], duration_seconds: float,
+                      route: Optional[str] = None):
+    """Log a slow statement and, when sampled, queue it for EXPLAIN capture"""
+    normalized = normalize_sql(query)
+    caller = find_caller()
+    shape = params_shape(params)
+    duration_ms = duration_seconds * 1000
+
+    logger.warning(
+        "slow query %.1f ms caller=%s route=%s params=%s sql=%s",
+        duration_ms, caller, route, shape, normalized[:2000],
+    )
+
+    if not SLOW_QUERY_EXPLAIN_RATE or bound_query is None or random.random() >= SLOW_QUERY_EXPLAIN_RATE:
+        return
+    if not _READ_ONLY.match(normalized) or _WRITES.search(normalized):
+        return
+
+    query_hash = hashlib.sha1(normalized.encode()).hexdigest()
+    if not _claim_explain(query_hash):
+        return
+
+    _ensure_worker()
+    try:
+        _explain_queue.put_nowait({
+            "query_hash": query_hash,
+            "normalized_sql": normalized,
+            "bound_query": bound_query.decode("utf-8", "replace") if isinstance(bound_query, bytes) else bound_query,
+            "caller": caller,
+            "route": route,
+            "params_shape": shape,
+            "duration_ms": duration_ms,
+        })
+    except queue.Full:
+        pass
+
+
+def _claim_explain(query_hash: str) -> bool:
+    """False if this statement shape was explained within the cooldown"""
+    now = time.monotonic()
+    with _last_explained_lock:
+        while _last_explained:
+            oldest_hash, explained_at = next(iter(_last_explained.items()))
+            if now - explained_at < EXPLAIN_COOLDOWN_SECONDS:
+                break
+            del _last_explained[oldest_hash]
+        if query_hash in _last_explained:
+            return False
+        _last_explained[query_hash] = now
+        return True
+
+
+def _ensure_worker():
+    global _worker
+    if _worker is not None:
+        return
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_explain_worker, name="slow-query-explain", daemon=True)
+            _worker.start()
+
+
+def _explain_worker():
+    """
+    Re-run sampled statements under EXPLAIN on a separate, plain (uninstrumented)
+    connection so the request never waits and the capture cannot re-trigger itself.
+    The statement runs in a READ ONLY transaction that is always rolled back, so
+    SELECTs with side effects (create_monthly_partition, pg_notify, setval) fail
+    instead of writing. Plans are stored in slow_query_plans.
+    """
+    conn = None
+    while True:
+        item = _explain_queue.get()
+        try:
+            if conn is None or conn.closed:
+                conn = psycopg2.connect(os.getenv("DATABASE_URL"))
+                conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute("BEGIN READ ONLY")
+                try:
+                    cur.execute("SET LOCAL statement_timeout = '30s'")
+                    cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + item["bound_query"])
+                    plan = cur.fetchone()[0]
+                finally:
+                    cur.execute("ROLLBACK")
+                cur.execute(
+                    """
+                    INSERT INTO slow_query_plans
+                        (query_hash, normalized_sql, caller, route, params_shape, duration_ms, plan)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s);
+                    """,
+                    (item["query_hash"], item["normalized_sql"], item["caller"], item["route"],
+                     item["params_shape"], item["duration_ms"], json.dumps(plan)),
+                )
+        except Exception as e:
+            logger.warning("EXPLAIN capture failed for %s: %s", item["caller"], e)
+            if conn is not None and not conn.closed:
+                conn.close()
+            conn = None
+        finally:
+            _explain_queue.task_done()